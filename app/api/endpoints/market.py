@@ -1,14 +1,84 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.schemas import ScoringConfig, ScoringFeatures
 from app.services.market_service import market_service
+from app.services.scoring_service import scoring_service
+from app.services.backtest_service import backtest_service
+from app.services.correlation_service import correlation_service
 
 router = APIRouter()
 
+class ScoreRequest(BaseModel):
+    rows: List[ScoringFeatures]
+    config: Optional[ScoringConfig] = None
+
+class BacktestRequest(BaseModel):
+    tickers: List[str]
+    period: str = "2y"
+    horizon: int = Field(5, ge=1, le=60)
+    allow_short: bool = False
+    cost_bps: float = Field(0.0, ge=0)
+    config: Optional[ScoringConfig] = None
+
+class CorrelationRequest(BaseModel):
+    tickers: Optional[List[str]] = None
+    period: str = "1y"
+    shrinkage: bool = True
+    annualize: bool = True
+    min_coverage: float = Field(0.9, ge=0, le=1)
+
+@router.post("/backtest")
+async def backtest_recommendations(request: BacktestRequest):
+    """
+    Replays price history and stored news/social sentiment through the
+    recommendation rules for all tickers and dates at once.
+    Returns hit rate, returns, max drawdown and turnover (plus per-ticker stats).
+    Runs offline against local snapshots with MARKET_DATA_PROVIDER=file.
+    """
+    if not request.tickers:
+        raise HTTPException(status_code=400, detail="At least one ticker is required")
+    result = await run_in_threadpool(
+        backtest_service.run, request.tickers, request.period, request.horizon,
+        request.allow_short, request.cost_bps, request.config
+    )
+    if "error" in result:
+        raise HTTPException(status_code=404, detail=result["error"])
+    return result
+
+@router.post("/score")
+async def score_universe(request: ScoreRequest):
+    """
+    Scores many tickers at once from their features (RSI, news and social
+    balance, MACD, sentiment index) with configurable weights and thresholds.
+    Returns BUY/SELL/HOLD with a per-rule score breakdown, in input order.
+    """
+    if not request.rows:
+        raise HTTPException(status_code=400, detail="At least one feature row is required")
+    return await run_in_threadpool(scoring_service.score_rows, request.rows, request.config)
+
+@router.post("/correlation")
+async def correlate_tickers(request: CorrelationRequest):
+    """
+    Daily return correlation and covariance matrices (rows/columns in `tickers`
+    order) over `period`, with optional Ledoit-Wolf shrinkage.
+    Defaults to the portfolio tickers when none are given.
+    """
+    result = await run_in_threadpool(
+        correlation_service.compute_for, request.tickers, period=request.period,
+        shrinkage=request.shrinkage, annualize=request.annualize, min_coverage=request.min_coverage
+    )
+    if "error" in result:
+        raise HTTPException(status_code=404, detail=result["error"])
+    return result
+
 @router.get("/{ticker}")
 async def get_market_data(ticker: str):
     """
     Get real-time price and technical indicators for a ticker.
     """
-    data = market_service.get_ticker_data(ticker)
+    data = await run_in_threadpool(market_service.get_ticker_data, ticker)
     if "error" in data:
         raise HTTPException(status_code=404, detail=data["error"])
     return data
@@ -1,104 +1,128 @@
-from fastapi import APIRouter, HTTPException
-from app.schemas import InvestmentMemo, MarketData, SocialPost
-from app.services.market_service import market_service
-from app.services.social_service import social_service
-from app.services.nlp_service import nlp_service
-from app.services.news_service import news_service
+from fastapi import APIRouter, HTTPException, Response, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.schemas import InvestmentMemo
+from app.services.memo_service import memo_service, TickerNotFoundError
+from app.services.memo_cache_service import memo_cache_service
+from app.services.batch_memo_service import batch_memo_service
 from app.services.database_service import database_service
-from datetime import datetime
-import random
 
+import os
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-def _generate_recommendation(market: dict, sentiment: dict, social: dict) -> str:
-    """Simple logic to generate a BUY/SELL/HOLD signal."""
-    score = 0
-    
-    # 1. Market Logic (RSI)
-    rsi = market.get("indicators", {}).get("rsi", 50)
-    if rsi < 30: score += 1.5 # Oversold (Buy Weight)
-    elif rsi > 70: score -= 1.5 # Overbought (Sell Weight)
-    
-    # 2. News Logic (Aggregated)
-    news_items = sentiment.get("items", [])
-    if news_items:
-        avg_score = sum([n["sentiment"]["score"] for n in news_items]) / len(news_items)
-        pos_count = len([n for n in news_items if n["sentiment"]["label"] == "positive"])
-        neg_count = len([n for n in news_items if n["sentiment"]["label"] == "negative"])
-        
-        if pos_count > neg_count and avg_score > 0.6: score += 1
-        elif neg_count > pos_count and avg_score > 0.6: score -= 1
-    
-    # 3. Social Logic (Aggregated)
-    social_posts = social.get("data", [])
-    if social_posts:
-        pos_posts = len([p for p in social_posts if p.get("sentiment_label") == "positive"])
-        neg_posts = len([p for p in social_posts if p.get("sentiment_label") == "negative"])
-        if pos_posts > neg_posts: score += 0.5
-        elif neg_posts > pos_posts: score -= 0.5
-    
-    # Result Synthesis
-    if score >= 1: return "BUY"
-    if score <= -1: return "SELL"
-    return "HOLD"
+DEBUG_TIMINGS = os.getenv("MEMO_DEBUG_TIMINGS", "false").lower() in ("1", "true", "yes")
+
+class MemoBatchRequest(BaseModel):
+    tickers: List[str]
+    concurrency: int = Field(8, ge=1, le=32)
+    persist: bool = True
+
+@router.post("/batch")
+async def generate_memo_batch(request: MemoBatchRequest):
+    """
+    Generates memos for a watchlist in one job.
+    Streams one NDJSON line per ticker as soon as its memo is ready:
+    {"ticker", "status": "ok", "memo"} or {"ticker", "status": "error", "detail"}.
+    """
+    if not request.tickers:
+        raise HTTPException(status_code=400, detail="At least one ticker is required")
+
+    def lines():
+        for result in batch_memo_service.run(request.tickers, request.concurrency, request.persist):
+            if "memo" in result:
+                result = {**result, "memo": result["memo"].model_dump()}
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.get("/history")
+async def get_memo_history(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    ticker: Optional[str] = None
+):
+    """
+    Lists stored memos newest first, summary columns only (id, ticker,
+    generated_at, recommendation, analysis_summary).
+    Use `next_cursor` from the response to page through older memos;
+    fetch a full memo with `/history/{memo_id}`.
+    """
+    try:
+        return await run_in_threadpool(database_service.get_memo_history, limit, cursor, ticker)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/history/{memo_id}")
+async def get_stored_memo(memo_id: int):
+    """
+    Retrieves one stored memo with its full market, social and news payloads.
+    """
+    memo = await run_in_threadpool(database_service.get_memo_by_id, memo_id)
+    if memo is None:
+        raise HTTPException(status_code=404, detail=f"Memo {memo_id} not found")
+    return memo
+
+@router.get("/{ticker}/stream")
+async def stream_investment_memo(ticker: str, debug: bool = Query(False)):
+    """
+    Streams a memo section by section as NDJSON:
+    {"section": "market" | "news" | "social", "data": ...}, then
+    {"section": "memo", "data": InvestmentMemo, "cache": "fresh" | "stale" | "miss"}.
+    A cached memo (fresh, or stale and refreshing in the background) is streamed
+    at once; otherwise a new one is built and sections arrive as they complete.
+    A missing ticker ends the stream with {"section": "error", "status": 404, "detail": ...}.
+    """
+    def line(section, data, **extra):
+        return json.dumps({"section": section, "data": jsonable_encoder(data), **extra}) + "\n"
+
+    def cached_lines(memo, age, status):
+        for name, data in (("market", memo.market_data), ("news", memo.news_context), ("social", memo.social_context)):
+            if data is not None:
+                yield line(name, data)
+        timings = memo.timings if (debug or DEBUG_TIMINGS) else None
+        memo = memo.model_copy(update={"cache_age_seconds": round(age, 3), "timings": timings})
+        yield line("memo", memo.model_dump(), cache=status)
+
+    def lines():
+        try:
+            for name, value in memo_service.iter_sections(ticker):
+                if name == "memo":
+                    memo_cache_service.put(ticker, value)
+                    if not (debug or DEBUG_TIMINGS):
+                        value = value.model_copy(update={"timings": None})
+                    yield line(name, value.model_dump(), cache="miss")
+                else:
+                    yield line(name, value)
+        except TickerNotFoundError as e:
+            yield json.dumps({"section": "error", "status": 404, "detail": str(e)}) + "\n"
+
+    cached = await run_in_threadpool(memo_cache_service.peek, ticker)
+    body = cached_lines(*cached) if cached is not None else lines()
+    return StreamingResponse(body, media_type="application/x-ndjson")
 
 @router.get("/{ticker}", response_model=InvestmentMemo)
-async def get_investment_memo(ticker: str):
+async def get_investment_memo(ticker: str, response: Response, debug: bool = Query(False)):
     """
     Generates a full Investment Memo for a given ticker.
     Aggregates Market Data, Social Signals, and NLP analysis.
+    Served from a TTL cache: stale memos are returned immediately and refreshed
+    in the background. `cache_age_seconds` / the `Age` header report memo age.
+    With `debug=true` (or MEMO_DEBUG_TIMINGS) the per-stage `timings` of the build are included.
     """
-    # 1. Fetch Market Data
-    market_data = market_service.get_ticker_data(ticker)
-    if "error" in market_data:
-        # If real data fails, we might mock it or raise error. 
-        # For this demo, let's raise error to show we tried real data.
-        raise HTTPException(status_code=404, detail=f"Ticker {ticker} not found: {market_data['error']}")
-    
-    # 2. Fetch Social Context (Live Reddit Data)
-    social_data = social_service.get_social_feed(ticker=ticker, limit=3)
-    
-    # 3. Fetch Live News Data
-    news_data = news_service.get_ticker_news(ticker=ticker, count=5)
-    
-    # Calculate Overall News Sentiment for Context
-    if news_data:
-        avg_news_score = sum([n["sentiment"]["score"] for n in news_data]) / len(news_data)
-        pos_news = len([n for n in news_data if n["sentiment"]["label"] == "positive"])
-        neg_news = len([n for n in news_data if n["sentiment"]["label"] == "negative"])
-        overall_news_sent = "positive" if pos_news > neg_news else ("negative" if neg_news > pos_news else "neutral")
-    else:
-        avg_news_score = 0.5
-        overall_news_sent = "neutral"
-
-    news_context = {
-        "items": news_data,
-        "overall_sentiment": overall_news_sent,
-        "average_score": avg_news_score
-    }
-    
-    # 4. Generate Recommendation
-    rec = _generate_recommendation(market_data, news_context, social_data)
-    
-    # 5. Build Response Object
-    memo = InvestmentMemo(
-        ticker=ticker.upper(),
-        generated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        market_data=market_data,
-        social_context=social_data,
-        news_context=news_context,
-        recommendation=rec,
-        analysis_summary=f"Analysis suggests {rec}. Market: RSI {market_data['indicators']['rsi']}. News: {overall_news_sent.upper()}. Social: {social_data['summary']}"
-    )
-
-    # 6. Async Persistence (Best effort)
     try:
-        database_service.save_memo(memo)
-    except Exception as e:
-        logger.error(f"Persistence failed: {e}")
+        memo, age, status = await run_in_threadpool(memo_cache_service.get, ticker)
+    except TickerNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-    return memo
+    response.headers["Age"] = str(int(age))
+    response.headers["X-Memo-Cache"] = status
+    timings = memo.timings if (debug or DEBUG_TIMINGS) else None
+    return memo.model_copy(update={"cache_age_seconds": round(age, 3), "timings": timings})
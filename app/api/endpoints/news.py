@@ -0,0 +1,38 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from typing import List, Optional
+from app.services.news_service import news_service
+from app.services.news_sentiment_index_service import news_sentiment_index_service
+
+router = APIRouter()
+
+class NewsBatchRequest(BaseModel):
+    tickers: List[str]
+    count: int = 5
+
+@router.get("/sentiment-index")
+async def get_sentiment_index(tickers: Optional[str] = None):
+    """
+    Time-decayed, signed news sentiment index for screening.
+    `tickers` is a comma-separated list; omit it to get every tracked ticker.
+    """
+    wanted = [t.strip() for t in tickers.split(",") if t.strip()] if tickers else None
+    return news_sentiment_index_service.compute(wanted)
+
+@router.get("/{ticker}")
+async def get_ticker_news(ticker: str, count: int = 5):
+    """
+    Get the latest scored headlines for a ticker.
+    """
+    return await run_in_threadpool(news_service.get_ticker_news, ticker, count)
+
+@router.post("/batch")
+async def get_news_batch(request: NewsBatchRequest):
+    """
+    Get scored headlines for many tickers at once.
+    Articles shared between tickers are fetched and scored only once.
+    """
+    if not request.tickers:
+        raise HTTPException(status_code=400, detail="At least one ticker is required")
+    return await run_in_threadpool(news_service.get_news_batch, request.tickers, request.count)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from app.services.nlp_service import nlp_service
 
@@ -15,7 +16,7 @@ async def analyze_text(request: SentimentRequest):
     """
     Analyze financial text sentiment.
     """
-    result = nlp_service.analyze_sentiment(request.text)
+    result = await run_in_threadpool(nlp_service.analyze_sentiment, request.text)
     return result
 
 @router.post("/summarize-url")
@@ -23,7 +24,7 @@ async def summarize_url(request: URLRequest):
     """
     Scrape and summarize an article from a URL.
     """
-    result = nlp_service.summarize_article(request.url)
+    result = await run_in_threadpool(nlp_service.summarize_article, request.url)
     if result["status"] == "error":
         raise HTTPException(status_code=400, detail=result["message"])
     return result
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from app.schemas import PortfolioItem
 from app.services.database_service import database_service
-from app.services.market_service import market_service
+from app.services.market_service import market_service, TRADING_DAYS
+from app.services.portfolio_analytics_service import portfolio_analytics_service
+from app.services.risk_service import risk_service
 from typing import List
 from datetime import datetime
+import numpy as np
 
 router = APIRouter()
 
@@ -11,32 +15,64 @@ router = APIRouter()
 async def get_portfolio():
     """
     Retrieves the virtual portfolio with real-time P/L calculations.
+    Last prices for all positions come from one bulk, short-TTL cached quote request.
     """
-    raw_portfolio = database_service.get_portfolio()
-    items = []
-    
-    for row in raw_portfolio:
-        ticker = row["ticker"]
-        # Fetch current price for P/L calc
-        try:
-            market_data = market_service.get_ticker_data(ticker, period="1d")
-            current_price = market_data.get("price", row["entry_price"])
-        except:
-            current_price = row["entry_price"]
-            
-        p_l = ((current_price - row["entry_price"]) / row["entry_price"]) * 100
-        
-        items.append(PortfolioItem(
+    raw_portfolio = await run_in_threadpool(database_service.get_portfolio)
+    if not raw_portfolio:
+        return []
+
+    tickers = [row["ticker"].upper() for row in raw_portfolio]
+    quotes = await run_in_threadpool(market_service.get_quotes, tickers)
+
+    # Positions without a quote are valued at their entry price
+    entry = np.array([float(row["entry_price"]) for row in raw_portfolio])
+    current = np.array([quotes.get(t, e) for t, e in zip(tickers, entry)], dtype=float)
+    p_l = np.round(np.divide(current - entry, entry, out=np.zeros_like(entry), where=entry != 0) * 100, 2)
+
+    return [
+        PortfolioItem(
             id=str(row.get("id")),
             ticker=ticker,
             entry_price=row["entry_price"],
             entry_date=row["entry_date"],
             recommendation=row["recommendation"],
-            current_price=current_price,
-            p_l_percent=round(p_l, 2)
-        ))
-        
-    return items
+            current_price=float(current[i]),
+            p_l_percent=float(p_l[i])
+        )
+        for i, (ticker, row) in enumerate(zip(tickers, raw_portfolio))
+    ]
+
+@router.get("/analytics")
+async def get_portfolio_analytics(risk_free_rate: float = 0.0, include_curve: bool = True):
+    """
+    Portfolio analytics since each position's entry date: daily equity curve,
+    max drawdown, annualized volatility, Sharpe/Sortino and sector exposure.
+    `risk_free_rate` is annual (e.g. 0.04).
+    """
+    result = await run_in_threadpool(portfolio_analytics_service.get_analytics, risk_free_rate, include_curve)
+    if "error" in result:
+        raise HTTPException(status_code=404, detail=result["error"])
+    return result
+
+@router.get("/risk")
+async def get_portfolio_risk(
+    horizon_days: int = Query(1, ge=1, le=TRADING_DAYS),
+    confidence: float = Query(0.95, gt=0.5, lt=1.0),
+    paths: int = Query(10000, ge=100, le=1_000_000),
+    seed: int = 42,
+    period: str = "1y",
+):
+    """
+    Monte Carlo VaR/CVaR of the virtual portfolio over `horizon_days`, from
+    `paths` correlated scenarios fitted to `period` of daily history.
+    """
+    result = await run_in_threadpool(
+        risk_service.get_portfolio_var,
+        horizon_days=horizon_days, confidence=confidence, paths=paths, seed=seed, period=period,
+    )
+    if "error" in result:
+        raise HTTPException(status_code=404, detail=result["error"])
+    return result
 
 @router.post("/add")
 async def add_to_portfolio(item: PortfolioItem):
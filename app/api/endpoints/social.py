@@ -1,11 +1,45 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
 from app.services.social_service import social_service
+from app.services.trending_service import trending_service
+from app.services.sentiment_series_service import sentiment_series_service
 
 router = APIRouter()
 
 @router.get("/feed")
-async def get_social_feed():
+async def get_social_feed(
+    ticker: Optional[str] = None,
+    limit: int = Query(5, ge=1, le=100),
+    cursor: Optional[str] = None
+):
     """
-    Get the latest 'Smart Money' social feed.
+    Get the latest social feed for a ticker, newest first.
+    Use `next_cursor` from the response to page through older posts.
+    Without a ticker, the 'Smart Money' mock feed is returned.
     """
-    return social_service.get_social_feed()
+    if not ticker:
+        return social_service.get_social_feed(limit=limit)
+    try:
+        # Run in the threadpool so concurrent requests can share one upstream poll
+        return await run_in_threadpool(social_service.get_feed_page, ticker, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/trending")
+async def get_trending(limit: int = 10, min_mentions: int = 2):
+    """
+    Get cashtags that are spiking across Reddit and Stocktwits right now.
+    """
+    return {
+        "bucket_seconds": trending_service.bucket_seconds,
+        "window_buckets": trending_service.n_buckets,
+        "data": trending_service.get_trending(limit=limit, min_mentions=min_mentions)
+    }
+
+@router.get("/sentiment/{ticker}")
+async def get_sentiment_series(ticker: str, buckets: int = Query(24, ge=1, le=sentiment_series_service.capacity)):
+    """
+    Get the rolling social sentiment time series (per-interval counts, mean score, volume).
+    """
+    return sentiment_series_service.get_series(ticker, limit=buckets)
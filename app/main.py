@@ -18,6 +18,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("shutdown")
+def shutdown_workers():
+    from app.services.news_enrichment_service import news_enrichment_service
+    news_enrichment_service.shutdown()
+    from app.services.sentiment_series_service import sentiment_series_service
+    sentiment_series_service.flush()
+    from app.services.database_service import database_service
+    database_service.shutdown()
+
 @app.get("/health")
 def health_check():
     return {"status": "ok", "service": "InvestAI API"}
@@ -27,7 +36,7 @@ def root():
     return {"message": "InvestAI API is running"}
 
 # specialized routers
-from app.api.endpoints import market, vision, nlp, social, memo, portfolio
+from app.api.endpoints import market, vision, nlp, social, memo, portfolio, news
 
 app.include_router(market.router, prefix="/api/market", tags=["Market"])
 app.include_router(vision.router, prefix="/api/vision", tags=["Vision"])
@@ -35,3 +44,4 @@ app.include_router(nlp.router, prefix="/api/nlp", tags=["NLP"])
 app.include_router(social.router, prefix="/api/social", tags=["Social"])
 app.include_router(memo.router, prefix="/api/memo", tags=["Memo"])
 app.include_router(portfolio.router, prefix="/api/portfolio", tags=["Portfolio"])
+app.include_router(news.router, prefix="/api/news", tags=["News"])
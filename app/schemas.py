@@ -20,6 +20,7 @@ class SocialPost(BaseModel):
     sentiment_label: str
     sentiment_score: float # Added in Phase 2
     source: str # Added in Phase 2
+    epoch: Optional[int] = None # Normalized UTC epoch seconds
 
 class SocialContext(BaseModel):
     source: str
@@ -33,11 +34,13 @@ class NewsItem(BaseModel):
     timestamp: int
     sentiment: Dict[str, Any]
     summary: str
+    full_summary: Optional[str] = None # Scraped + summarized in the background
 
 class NewsContext(BaseModel):
     items: List[NewsItem]
     overall_sentiment: str
     average_score: float
+    sentiment_index: Optional[Dict[str, Dict[str, float]]] = None # Time-decayed signed polarity per window
 
 class InvestmentMemo(BaseModel):
     """
@@ -51,6 +54,8 @@ class InvestmentMemo(BaseModel):
     vision_context: Optional[Dict[str, Any]] = None # New PDF/Image context
     recommendation: str = "HOLD" # AI-generated recommendation
     analysis_summary: str
+    cache_age_seconds: Optional[float] = None # Set when served from the memo cache
+    timings: Optional[Dict[str, float]] = None # Per-stage milliseconds, returned in debug mode
 
 class PortfolioItem(BaseModel):
     """
@@ -63,3 +68,36 @@ class PortfolioItem(BaseModel):
     recommendation: str
     current_price: Optional[float] = None
     p_l_percent: Optional[float] = None
+
+class ScoringConfig(BaseModel):
+    """
+    Weights and thresholds of the recommendation rules.
+    The defaults reproduce the per-memo recommendation logic exactly.
+    """
+    rsi_oversold: float = 30.0
+    rsi_overbought: float = 70.0
+    rsi_weight: float = 1.5
+    news_min_confidence: float = 0.6 # Average headline confidence needed for the news vote
+    news_weight: float = 1.0
+    social_weight: float = 0.5
+    macd_weight: float = 0.0 # +w when MACD > 0, -w when < 0
+    sentiment_index_weight: float = 0.0 # Multiplies the time-decayed news sentiment index
+    social_momentum_weight: float = 0.0 # Multiplies the social sentiment momentum (-2..2)
+    buy_threshold: float = 1.0
+    sell_threshold: float = -1.0
+
+class ScoringFeatures(BaseModel):
+    """
+    One ticker's inputs to the scoring engine.
+    """
+    ticker: str
+    rsi: float = 50.0
+    news_count: int = 0
+    news_positive: int = 0
+    news_negative: int = 0
+    news_avg_score: float = 0.0
+    social_positive: int = 0
+    social_negative: int = 0
+    macd: float = 0.0
+    sentiment_index: float = 0.0
+    social_momentum: float = 0.0
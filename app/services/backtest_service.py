@@ -0,0 +1,216 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.schemas import ScoringConfig
+from app.services.market_service import market_service, TRADING_DAYS
+from app.services.scoring_service import scoring_service
+from app.services.news_sentiment_index_service import news_sentiment_index_service
+from app.services.sentiment_series_service import sentiment_series_service
+
+logger = logging.getLogger(__name__)
+
+
+def _daily_matrix(events: pd.DataFrame, columns: List[str], dates: pd.DatetimeIndex,
+                  tickers: List[str], agg: str = "sum") -> Dict[str, np.ndarray]:
+    """
+    Long-format events (ticker, epoch, <columns>) -> one (date x ticker) array per
+    column, aggregated per UTC day and aligned to the price matrix (0 where absent).
+    """
+    shape = (len(dates), len(tickers))
+    if events is None or events.empty:
+        return {c: np.zeros(shape) for c in columns}
+    day = pd.to_datetime(events["epoch"], unit="s", utc=True).dt.normalize()
+    grouped = events.assign(date=day).groupby(["date", "ticker"])[columns].agg(agg)
+    out = {}
+    for c in columns:
+        matrix = grouped[c].unstack("ticker").reindex(index=dates, columns=tickers)
+        out[c] = matrix.fillna(0.0).to_numpy(dtype=float)
+    return out
+
+
+def news_events_from_index() -> pd.DataFrame:
+    """
+    Scored headlines retained by the news sentiment index as (ticker, epoch, label, score).
+    Only the signed polarity is stored, so the label is its sign and the score its magnitude.
+    """
+    data = news_sentiment_index_service.export()
+    polarity = data["polarity"]
+    return pd.DataFrame({
+        "ticker": data["ticker"],
+        "epoch": data["published"],
+        "label": np.where(polarity > 0, "positive", np.where(polarity < 0, "negative", "neutral")),
+        "score": np.abs(polarity),
+    })
+
+
+def social_counts_from_series(tickers: List[str]) -> pd.DataFrame:
+    """Stored social sentiment buckets as (ticker, epoch, positive, negative, neutral)."""
+    frames = []
+    for ticker in tickers:
+        rows = sentiment_series_service.get_buckets(ticker)
+        if len(rows):
+            frames.append(pd.DataFrame({"ticker": ticker, "epoch": rows["start"],
+                                        "positive": rows["positive"], "negative": rows["negative"],
+                                        "neutral": rows["neutral"]}))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+class BacktestService:
+    """
+    Replays price history and stored sentiment through the recommendation rules
+    for every (date, ticker) at once.
+
+    Per day and ticker the same features as a memo are built (RSI-14, MACD, the
+    day's headline and social label counts, and social momentum as the day's net
+    polarity minus the previous day's) and scored by the vectorized scoring
+    engine. A BUY (or, with `allow_short`, a SELL) signal at the close of day t
+    is held over day t+1; the portfolio is equal-weighted across open positions.
+    Headline features use all headlines published that day rather than the
+    latest five a memo sees.
+    """
+    def compute_features(self, close: pd.DataFrame, news: Optional[pd.DataFrame] = None,
+                         social: Optional[pd.DataFrame] = None) -> Dict[str, np.ndarray]:
+        """(date x ticker) feature arrays, named as ScoringFeatures fields."""
+        tickers = list(close.columns)
+
+        # Same definitions as MarketService.build_market_data, for all columns at once
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        rsi = 100 - (100 / (1 + gain / loss))
+        macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+
+        features = {"rsi": rsi.to_numpy(dtype=float), "macd": macd.to_numpy(dtype=float)}
+
+        if news is not None and not news.empty:
+            news = news.assign(
+                positive=(news["label"] == "positive").astype(float),
+                negative=(news["label"] == "negative").astype(float),
+                n=1.0,
+            )
+        counts = _daily_matrix(news, ["n", "positive", "negative", "score"], close.index, tickers)
+        features["news_count"] = counts["n"]
+        features["news_positive"] = counts["positive"]
+        features["news_negative"] = counts["negative"]
+        features["news_avg_score"] = np.divide(counts["score"], counts["n"],
+                                               out=np.zeros_like(counts["n"]), where=counts["n"] > 0)
+
+        if social is not None and not social.empty and "neutral" not in social:
+            social = social.assign(neutral=0)
+        social_counts = _daily_matrix(social, ["positive", "negative", "neutral"], close.index, tickers)
+        features["social_positive"] = social_counts["positive"]
+        features["social_negative"] = social_counts["negative"]
+        # Same net polarity as the sentiment series, compared day over day
+        volume = social_counts["positive"] + social_counts["negative"] + social_counts["neutral"]
+        polarity = (social_counts["positive"] - social_counts["negative"]) / np.maximum(volume, 1)
+        features["social_momentum"] = np.diff(polarity, axis=0, prepend=polarity[:1])
+        return features
+
+    def signals(self, close: pd.DataFrame, features: Dict[str, np.ndarray],
+                config: Optional[ScoringConfig] = None) -> np.ndarray:
+        """(date x ticker) signals: 1 BUY, -1 SELL, 0 HOLD or not enough history."""
+        shape = close.shape
+        flat = {name: values.ravel() for name, values in features.items()}
+        result = scoring_service.score(flat, config)
+        labels = result["recommendation"].reshape(shape)
+        signal = np.where(labels == "BUY", 1, np.where(labels == "SELL", -1, 0))
+        valid = ~np.isnan(features["rsi"]) & ~np.isnan(close.to_numpy(dtype=float))
+        return np.where(valid, signal, 0)
+
+    def evaluate(self, close: pd.DataFrame, signal: np.ndarray, horizon: int = 5,
+                 allow_short: bool = False, cost_bps: float = 0.0) -> Dict[str, Any]:
+        """Hit rate, returns, drawdown and turnover of a (date x ticker) signal matrix."""
+        prices = close.to_numpy(dtype=float)
+        tickers = list(close.columns)
+        n_days = prices.shape[0]
+
+        # Signal quality: direction vs. the forward `horizon`-day return
+        forward = np.full_like(prices, np.nan)
+        if n_days > horizon:
+            forward[:-horizon] = prices[horizon:] / prices[:-horizon] - 1
+        scored = (signal != 0) & ~np.isnan(forward)
+        hits = scored & (np.sign(forward) == signal)
+        buys, sells = scored & (signal > 0), scored & (signal < 0)
+
+        # Strategy: position from the close of t held over t+1, equal weight across open positions
+        position = np.where(signal > 0, 1.0, np.where((signal < 0) & allow_short, -1.0, 0.0))
+        daily = np.zeros_like(prices)
+        daily[1:] = prices[1:] / prices[:-1] - 1
+        daily = np.nan_to_num(daily, nan=0.0)
+        held = np.zeros_like(position)
+        held[1:] = position[:-1]
+        open_positions = np.abs(held).sum(axis=1)
+        gross = (held * daily).sum(axis=1)
+        changes = np.abs(np.diff(position, axis=0, prepend=0.0))
+        # Trades executed at the close of t-1 are paid for in day t's return
+        cost = np.zeros(n_days)
+        cost[1:] = changes[:-1].sum(axis=1) * cost_bps / 10000.0
+        returns = np.divide(gross - cost, open_positions, out=np.zeros(n_days), where=open_positions > 0)
+
+        equity = np.cumprod(1 + returns)
+        drawdown = equity / np.maximum.accumulate(equity) - 1 if n_days else np.zeros(0)
+        total_return = float(equity[-1] - 1) if n_days else 0.0
+        ticker_returns = np.prod(1 + held * daily, axis=0) - 1
+
+        ratio = lambda num, den: float(num / den) if den else 0.0
+        return {
+            "tickers": tickers,
+            "start": close.index[0].strftime("%Y-%m-%d") if n_days else None,
+            "end": close.index[-1].strftime("%Y-%m-%d") if n_days else None,
+            "days": int(n_days),
+            "horizon_days": horizon,
+            "signals": {
+                "BUY": int((signal > 0).sum()),
+                "SELL": int((signal < 0).sum()),
+                "HOLD": int((signal == 0).sum()),
+            },
+            "hit_rate": ratio(hits.sum(), scored.sum()),
+            "hit_rate_buy": ratio((hits & buys).sum(), buys.sum()),
+            "hit_rate_sell": ratio((hits & sells).sum(), sells.sum()),
+            "avg_forward_return_buy": float(forward[buys].mean()) if buys.any() else 0.0,
+            "avg_forward_return_sell": float(forward[sells].mean()) if sells.any() else 0.0,
+            "total_return": total_return,
+            "annualized_return": float((1 + total_return) ** (TRADING_DAYS / n_days) - 1) if n_days else 0.0,
+            "max_drawdown": float(drawdown.min()) if n_days else 0.0,
+            "turnover": float(changes.sum() / (n_days * len(tickers))) if n_days and tickers else 0.0,
+            "trades": int((changes > 0).sum()),
+            "exposure": float((open_positions > 0).mean()) if n_days else 0.0,
+            "per_ticker": {
+                ticker: {
+                    "signals": int((signal[:, j] != 0).sum()),
+                    "hit_rate": ratio(hits[:, j].sum(), scored[:, j].sum()),
+                    "return": float(ticker_returns[j]),
+                }
+                for j, ticker in enumerate(tickers)
+            },
+        }
+
+    def run(self, tickers: List[str], period: str = "2y", horizon: int = 5, allow_short: bool = False,
+            cost_bps: float = 0.0, config: Optional[ScoringConfig] = None,
+            news: Optional[pd.DataFrame] = None, social: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """
+        Backtests the rules over `period` of history from the market data provider
+        (offline with MARKET_DATA_PROVIDER=file). Sentiment defaults to the stored
+        news index and social series; pass `news` (ticker, epoch, label, score) or
+        `social` (ticker, epoch, positive, negative) frames to replay other history.
+        """
+        close = market_service.get_price_matrix(tickers, period=period)
+        if close.empty:
+            return {"error": "No price history found for the requested tickers"}
+        if news is None:
+            news = news_events_from_index()
+        if social is None:
+            social = social_counts_from_series(list(close.columns))
+
+        features = self.compute_features(close, news, social)
+        signal = self.signals(close, features, config)
+        result = self.evaluate(close, signal, horizon=horizon, allow_short=allow_short, cost_bps=cost_bps)
+        logger.info(f"Backtested {len(close.columns)} tickers over {len(close)} days: "
+                    f"hit rate {result['hit_rate']:.2%}, return {result['total_return']:.2%}.")
+        return result
+
+
+backtest_service = BacktestService()
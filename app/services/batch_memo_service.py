@@ -0,0 +1,90 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List
+from app.schemas import InvestmentMemo
+from app.services.market_service import market_service
+from app.services.social_service import social_service
+from app.services.news_service import news_service
+from app.services.database_service import database_service
+from app.services.news_enrichment_service import news_enrichment_service
+from app.services.memo_service import memo_service, build_news_context
+from app.services.memo_cache_service import memo_cache_service
+
+logger = logging.getLogger(__name__)
+
+
+class BatchMemoService:
+    """
+    Generates memos for a whole watchlist, sharing upstream work across tickers:
+
+    - price history: one bulk download per chunk (provider.get_history_batch)
+    - news: fetched concurrently, deduplicated across tickers, scored in one
+      batched sentiment call (news_service.get_news_batch)
+    - fundamentals: through the shared, TTL-bounded info cache
+    - social: per ticker, with bounded parallelism
+
+    Memos are yielded as soon as they are built and persisted in bulk.
+    """
+    def __init__(self, chunk_size: int = 50, persist_batch_size: int = 25):
+        self.chunk_size = chunk_size
+        self.persist_batch_size = persist_batch_size
+
+    def _build_one(self, ticker: str, history, news_items: List[Dict[str, Any]]) -> InvestmentMemo:
+        market_data = market_service.build_market_data(ticker, history, market_service.get_info(ticker))
+        if "error" in market_data:
+            raise LookupError(f"Ticker {ticker} not found: {market_data['error']}")
+        social_data = social_service.get_feed_page(ticker=ticker, limit=3)
+        news_items = news_enrichment_service.attach(ticker, news_items)
+        return memo_service.assemble(ticker, market_data, build_news_context(ticker, news_items), social_data)
+
+    def _persist(self, memos: List[InvestmentMemo]) -> None:
+        # Best effort, like MemoService.persist
+        try:
+            database_service.save_memos(memos)
+        except Exception as e:
+            logger.error(f"Bulk persistence failed: {e}")
+
+    def run(self, tickers: List[str], concurrency: int = 8, persist: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Yields {"ticker", "status": "ok", "memo"} or {"ticker", "status": "error", "detail"}
+        per ticker, in completion order.
+        """
+        tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+        pending: List[InvestmentMemo] = []
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="memo-batch") as pool:
+            for i in range(0, len(tickers), self.chunk_size):
+                chunk = tickers[i:i + self.chunk_size]
+                try:
+                    histories = market_service.provider.get_history_batch(chunk, period="1y")
+                except Exception as e:
+                    logger.error(f"Bulk history download failed: {e}")
+                    histories = {}
+                news = news_service.get_news_batch(chunk, count=5)
+
+                futures = {
+                    pool.submit(self._build_one, t, histories.get(t), news.get(t, [])): t
+                    for t in chunk
+                }
+                for future in as_completed(futures):
+                    ticker = futures[future]
+                    try:
+                        memo = future.result()
+                    except Exception as e:
+                        logger.warning(f"Batch memo failed for {ticker}: {e}")
+                        yield {"ticker": ticker, "status": "error", "detail": str(e)}
+                        continue
+
+                    memo_cache_service.put(ticker, memo)
+                    if persist:
+                        pending.append(memo)
+                        if len(pending) >= self.persist_batch_size:
+                            self._persist(pending)
+                            pending = []
+                    yield {"ticker": ticker, "status": "ok", "memo": memo}
+
+        if pending:
+            self._persist(pending)
+
+
+batch_memo_service = BatchMemoService()
@@ -0,0 +1,81 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sklearn.covariance import LedoitWolf
+
+from app.services.market_service import market_service, TRADING_DAYS
+from app.services.database_service import database_service
+
+logger = logging.getLogger(__name__)
+
+
+class CorrelationService:
+    """
+    Return correlation/covariance matrices for a ticker set.
+
+    Daily log returns come from the aligned, cached price matrix. Tickers with too
+    little history (shorter than `min_coverage` of the window, e.g. recent
+    listings) are reported as missing instead of shortening everyone's sample;
+    the rest use the dates where all of them trade. With `shrinkage`, the sample
+    covariance is replaced by the Ledoit-Wolf estimate, which stays well
+    conditioned when the number of names approaches the number of days.
+    """
+    def compute(self, tickers: List[str], period: str = "1y", shrinkage: bool = True,
+                annualize: bool = True, min_coverage: float = 0.9,
+                min_observations: int = 20) -> Dict[str, Any]:
+        tickers = sorted({t.upper() for t in tickers})
+        prices = market_service.get_price_matrix(tickers, period=period)
+        if prices.empty:
+            return {"error": "No price history found for the requested tickers"}
+
+        returns = np.log(prices.ffill()).diff().iloc[1:]
+        counts = returns.count()
+        usable = counts[counts >= max(min_observations, min_coverage * len(returns))].index
+        returns = returns[usable].dropna()
+        missing = sorted(set(tickers) - set(returns.columns))
+        if len(returns.columns) < 2 or len(returns) < min_observations:
+            return {"missing": missing, "error": "Not enough overlapping price history to correlate"}
+
+        values = returns.to_numpy(dtype=float)
+        shrinkage_intensity = None
+        if shrinkage:
+            estimator = LedoitWolf().fit(values)
+            cov = estimator.covariance_
+            shrinkage_intensity = float(estimator.shrinkage_)
+        else:
+            cov = np.cov(values, rowvar=False)
+
+        stdev = np.sqrt(np.diag(cov))
+        denom = np.outer(stdev, stdev)
+        corr = np.divide(cov, denom, out=np.zeros_like(cov), where=denom > 0)
+        np.fill_diagonal(corr, 1.0)
+        if annualize:
+            cov = cov * TRADING_DAYS
+
+        n = corr.shape[0]
+        off_diagonal = corr[~np.eye(n, dtype=bool)]
+        logger.info(f"Correlated {n} tickers over {len(returns)} days (shrinkage={shrinkage_intensity}).")
+        return {
+            "tickers": list(returns.columns),
+            "missing": missing,
+            "start": returns.index[0].strftime("%Y-%m-%d"),
+            "end": returns.index[-1].strftime("%Y-%m-%d"),
+            "observations": int(len(returns)),
+            "shrinkage": shrinkage_intensity,
+            "annualized": annualize,
+            "average_correlation": round(float(off_diagonal.mean()), 4),
+            "correlation": np.round(corr, 4).tolist(),
+            "covariance": np.round(cov, 8).tolist(),
+        }
+
+    def compute_for(self, tickers: Optional[List[str]] = None, **kwargs) -> Dict[str, Any]:
+        """`compute` for the given tickers, or the virtual portfolio's when none are given."""
+        if not tickers:
+            tickers = [row["ticker"] for row in database_service.get_portfolio()]
+            if not tickers:
+                return {"error": "No tickers given and the portfolio is empty"}
+        return self.compute(tickers, **kwargs)
+
+
+correlation_service = CorrelationService()
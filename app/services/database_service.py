@@ -1,103 +1,233 @@
 import os
+import json
+import base64
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from supabase import create_client, Client
 from app.schemas import InvestmentMemo, PortfolioItem
+from app.services.write_behind import WriteBehindQueue
+from app.services.storage_backend import StorageBackend, SupabaseBackend, SQLiteBackend
+from app.services.tracing import traced
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class DatabaseService:
+    """
+    Memo and portfolio persistence on a pluggable storage backend, selected by
+    DATABASE_BACKEND: `supabase` (default, hosted) or `sqlite` (embedded file at
+    SQLITE_DB_PATH). Without a usable backend, persistence is disabled.
+    """
     def __init__(self):
         self.url = os.getenv("SUPABASE_URL")
         self.key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
         self.client: Optional[Client] = None
-        
-        if self.url and self.key and self.url != "https://your-project.supabase.co":
+        self._backend: Optional[StorageBackend] = None
+
+        kind = os.getenv("DATABASE_BACKEND", "supabase").lower()
+        if kind not in ("supabase", "sqlite"):
+            logger.warning(f"Unknown DATABASE_BACKEND '{kind}', falling back to supabase.")
+        if kind == "sqlite":
+            path = os.getenv("SQLITE_DB_PATH", "data/ainvest.db")
+            try:
+                self._backend = SQLiteBackend(path)
+                logger.info(f"SQLite database initialized at {path}.")
+            except Exception as e:
+                logger.error(f"Failed to initialize SQLite database: {e}")
+        elif self.url and self.key and self.url != "https://your-project.supabase.co":
             try:
                 self.client = create_client(self.url, self.key)
+                self._backend = SupabaseBackend(self.client)
                 logger.info("Supabase client initialized successfully.")
             except Exception as e:
                 logger.error(f"Failed to initialize Supabase client: {e}")
         else:
             logger.warning("Supabase credentials missing or default. Persistence disabled.")
 
+        # Write-behind buffer for memos: batched multi-row inserts off the request path
+        self.memo_queue = WriteBehindQueue(
+            self.save_memos,
+            batch_size=int(os.getenv("DB_WRITE_BATCH_SIZE", "50")),
+            interval=float(os.getenv("DB_WRITE_FLUSH_SECONDS", "2")),
+            name="memo-writer"
+        )
+
+    @property
+    def backend(self) -> Optional[StorageBackend]:
+        """Active storage backend, or None when persistence is disabled."""
+        return self._backend
+
     def save_memo(self, memo: InvestmentMemo) -> bool:
         """
-        Saves an InvestmentMemo to the Supabase 'memos' table.
+        Saves an InvestmentMemo to the 'memos' table.
         """
-        if not self.client:
+        backend = self.backend
+        if not backend:
             logger.warning("Database client not available. Skipping save.")
             return False
 
         try:
-            # Convert memo to dict and handle nested objects for JSONB columns
-            memo_data = memo.model_dump()
-            
-            # Prepare row for Supabase
-            row = {
-                "ticker": memo_data["ticker"],
-                "generated_at": memo_data["generated_at"],
-                "market_data": memo_data["market_data"],
-                "social_context": memo_data["social_context"],
-                "news_context": memo_data["news_context"],
-                "recommendation": memo_data["recommendation"],
-                "analysis_summary": memo_data["analysis_summary"]
-            }
-            
-            # Insert into 'memos' table
-            self.client.table("memos").insert(row).execute()
+            backend.insert_memos([self._memo_row(memo)])
             logger.info(f"Saved memo for {memo.ticker} to database.")
             return True
         except Exception as e:
             logger.error(f"Failed to save memo: {e}")
             return False
 
+    @traced("db.insert_memos")
+    def save_memos(self, memos: List[InvestmentMemo]) -> bool:
+        """
+        Saves many InvestmentMemos with a single multi-row insert.
+        """
+        if not memos:
+            return True
+        backend = self.backend
+        if not backend:
+            logger.warning("Database client not available. Skipping bulk save.")
+            return False
+
+        try:
+            backend.insert_memos([self._memo_row(m) for m in memos])
+            logger.info(f"Saved {len(memos)} memos to database.")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save {len(memos)} memos: {e}")
+            return False
+
+    def enqueue_memo(self, memo: InvestmentMemo) -> bool:
+        """
+        Queues a memo for a batched background insert and returns immediately.
+        """
+        if not self.backend:
+            logger.warning("Database client not available. Skipping save.")
+            return False
+        self.memo_queue.put(memo)
+        return True
+
+    def backlog_size(self) -> int:
+        """Number of memos queued but not yet written."""
+        return self.memo_queue.backlog_size()
+
+    def shutdown(self) -> None:
+        """Flushes pending memo writes."""
+        self.memo_queue.shutdown()
+
+    @staticmethod
+    def _memo_row(memo: InvestmentMemo) -> Dict[str, Any]:
+        # Convert memo to dict and handle nested objects for JSONB columns
+        memo_data = memo.model_dump()
+        
+        # Prepare row for the memos table
+        return {
+            "ticker": memo_data["ticker"],
+            "generated_at": memo_data["generated_at"],
+            "market_data": memo_data["market_data"],
+            "social_context": memo_data["social_context"],
+            "news_context": memo_data["news_context"],
+            "recommendation": memo_data["recommendation"],
+            "analysis_summary": memo_data["analysis_summary"]
+        }
+
     def get_all_memos(self, limit: int = 20) -> List[Dict[str, Any]]:
         """
         Retrieves recent investment memos.
         """
-        if not self.client:
+        backend = self.backend
+        if not backend:
             return []
 
         try:
-            response = self.client.table("memos").select("*").order("generated_at", desc=True).limit(limit).execute()
-            return response.data
+            return backend.list_memos(limit)
         except Exception as e:
             logger.error(f"Failed to fetch memos: {e}")
             return []
 
+    @staticmethod
+    def _portfolio_row(item: PortfolioItem) -> Dict[str, Any]:
+        return {
+            "ticker": item.ticker.upper(),
+            "entry_price": item.entry_price,
+            "entry_date": item.entry_date,
+            "recommendation": item.recommendation
+        }
+
+    def get_memo_history(self, limit: int = 20, cursor: Optional[str] = None,
+                         ticker: Optional[str] = None) -> Dict[str, Any]:
+        """
+        One page of memo summaries (id, ticker, generated_at, recommendation,
+        analysis_summary), newest first, optionally for one ticker. Pass the
+        returned `next_cursor` to fetch the following (older) page; full memos
+        are loaded with `get_memo_by_id`.
+        """
+        after = _decode_cursor(cursor) if cursor else None
+        backend = self.backend
+        if not backend:
+            return {"data": [], "next_cursor": None}
+
+        try:
+            rows = backend.list_memo_summaries(limit + 1, after, ticker.upper() if ticker else None)
+        except Exception as e:
+            logger.error(f"Failed to fetch memo history: {e}")
+            return {"data": [], "next_cursor": None}
+        page = rows[:limit]
+        return {"data": page, "next_cursor": _encode_cursor(page[-1]) if len(rows) > limit else None}
+
+    def get_memo_by_id(self, memo_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves one stored memo with its full market/social/news payloads.
+        """
+        backend = self.backend
+        if not backend:
+            return None
+        try:
+            return backend.get_memo(memo_id)
+        except Exception as e:
+            logger.error(f"Failed to fetch memo {memo_id}: {e}")
+            return None
+
     def save_to_portfolio(self, item: PortfolioItem) -> bool:
         """
         Saves a ticker to the 'portfolio' table.
         """
-        if not self.client:
+        backend = self.backend
+        if not backend:
             return False
         try:
-            row = {
-                "ticker": item.ticker.upper(),
-                "entry_price": item.entry_price,
-                "entry_date": item.entry_date,
-                "recommendation": item.recommendation
-            }
             # UPSERT to allow updating existing positions
-            self.client.table("portfolio").upsert(row, on_conflict="ticker").execute()
+            backend.upsert_portfolio([self._portfolio_row(item)])
             logger.info(f"Ticker {item.ticker} saved to portfolio.")
             return True
         except Exception as e:
             logger.error(f"Failed to save to portfolio: {e}")
             return False
 
+    def save_portfolio_items(self, items: List[PortfolioItem]) -> bool:
+        """
+        Upserts many positions in one statement.
+        """
+        if not items:
+            return True
+        backend = self.backend
+        if not backend:
+            return False
+        try:
+            backend.upsert_portfolio([self._portfolio_row(item) for item in items])
+            logger.info(f"Saved {len(items)} positions to portfolio.")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save {len(items)} positions to portfolio: {e}")
+            return False
+
     def get_portfolio(self) -> List[Dict[str, Any]]:
         """
         Retrieves all items from the virtual portfolio.
         """
-        if not self.client:
+        backend = self.backend
+        if not backend:
             return []
         try:
-            response = self.client.table("portfolio").select("*").execute()
-            return response.data
+            return backend.list_portfolio()
         except Exception as e:
             logger.error(f"Failed to fetch portfolio: {e}")
             return []
@@ -106,14 +236,34 @@ class DatabaseService:
         """
         Removes a ticker from the virtual portfolio.
         """
-        if not self.client:
+        return self.remove_portfolio_items([ticker])
+
+    def remove_portfolio_items(self, tickers: List[str]) -> bool:
+        """
+        Removes many tickers from the virtual portfolio in one statement.
+        """
+        if not tickers:
+            return True
+        backend = self.backend
+        if not backend:
             return False
         try:
-            self.client.table("portfolio").delete().eq("ticker", ticker.upper()).execute()
-            logger.info(f"Ticker {ticker} removed from portfolio.")
+            backend.delete_portfolio([t.upper() for t in tickers])
+            logger.info(f"Tickers {', '.join(tickers)} removed from portfolio.")
             return True
         except Exception as e:
             logger.error(f"Failed to remove from portfolio: {e}")
             return False
 
+def _encode_cursor(row: Dict[str, Any]) -> str:
+    raw = json.dumps([row["generated_at"], row["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        generated_at, memo_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(generated_at), int(memo_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
 database_service = DatabaseService()
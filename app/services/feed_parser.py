@@ -0,0 +1,58 @@
+import xml.etree.ElementTree as ET
+import logging
+from typing import Iterator, Dict, Optional, BinaryIO
+
+logger = logging.getLogger(__name__)
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+_ENTRY = f"{ATOM_NS}entry"
+_AUTHOR = f"{ATOM_NS}author"
+_FIELDS = {
+    f"{ATOM_NS}id": "id",
+    f"{ATOM_NS}title": "title",
+    f"{ATOM_NS}updated": "updated",
+}
+_AUTHOR_NAME = f"{ATOM_NS}name"
+
+
+def iter_atom_entries(stream: BinaryIO, limit: Optional[int] = None) -> Iterator[Dict[str, Optional[str]]]:
+    """
+    Incrementally parses an Atom feed from a file-like byte stream.
+
+    Only the fields the social pipeline needs are extracted (id, title, author, updated).
+    Parsing stops as soon as `limit` entries have been yielded (or the consumer stops
+    iterating), so the rest of the document is never read from the stream.
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    count = 0
+    entry: Optional[Dict[str, Optional[str]]] = None
+    in_author = False
+
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == _ENTRY:
+                entry = {"id": None, "title": None, "author": None, "updated": None}
+            elif tag == _AUTHOR and entry is not None:
+                in_author = True
+            continue
+
+        # 'end' events: text content is complete here
+        if entry is None:
+            continue
+        if tag in _FIELDS:
+            entry[_FIELDS[tag]] = elem.text
+        elif tag == _AUTHOR_NAME and in_author:
+            entry["author"] = elem.text
+        elif tag == _AUTHOR:
+            in_author = False
+        elif tag == _ENTRY:
+            yield entry
+            entry = None
+            # Release the parsed subtree (content/html blobs can be large)
+            elem.clear()
+            count += 1
+            if limit is not None and count >= limit:
+                return
@@ -0,0 +1,186 @@
+import os
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+
+import pandas as pd
+import yfinance as yf
+
+logger = logging.getLogger(__name__)
+
+_PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1), "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1), "3mo": pd.DateOffset(months=3), "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1), "2y": pd.DateOffset(years=2), "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+
+class MarketDataProvider(ABC):
+    """
+    Source of price history, quotes, fundamentals and news.
+    History frames follow the yfinance layout: DatetimeIndex + Open/High/Low/Close/Volume.
+    """
+    name = "base"
+
+    @abstractmethod
+    def get_history(self, ticker: str, period: str = "1y") -> pd.DataFrame:
+        ...
+
+    @abstractmethod
+    def get_info(self, ticker: str) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def get_news(self, ticker: str) -> List[Dict[str, Any]]:
+        ...
+
+    def get_history_batch(self, tickers: List[str], period: str = "1y") -> Dict[str, pd.DataFrame]:
+        return {t: self.get_history(t, period) for t in tickers}
+
+    def get_quotes(self, tickers: List[str]) -> Dict[str, float]:
+        """Last available close per ticker; tickers without data are omitted."""
+        quotes = {}
+        for ticker, df in self.get_history_batch(tickers, period="5d").items():
+            close = df["Close"].dropna() if not df.empty else df
+            if len(close):
+                quotes[ticker] = float(close.iloc[-1])
+        return quotes
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Live data from Yahoo Finance."""
+    name = "yfinance"
+
+    def get_history(self, ticker: str, period: str = "1y") -> pd.DataFrame:
+        return yf.Ticker(ticker).history(period=period)
+
+    def get_info(self, ticker: str) -> Dict[str, Any]:
+        return yf.Ticker(ticker).info or {}
+
+    def get_news(self, ticker: str) -> List[Dict[str, Any]]:
+        return yf.Ticker(ticker).news or []
+
+    def get_history_batch(self, tickers: List[str], period: str = "1y") -> Dict[str, pd.DataFrame]:
+        """
+        One bulk download for all tickers instead of one request each.
+        auto_adjust matches Ticker.history(), so closes are comparable.
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        if not tickers:
+            return {}
+        data = yf.download(tickers, period=period, group_by="ticker", progress=False, threads=True, auto_adjust=True)
+        frames = {}
+        for ticker in tickers:
+            try:
+                df = data[ticker] if isinstance(data.columns, pd.MultiIndex) else data
+                frames[ticker] = df.dropna(how="all")
+            except KeyError:
+                frames[ticker] = pd.DataFrame()
+        return frames
+
+
+class FileProvider(MarketDataProvider):
+    """
+    Offline provider backed by local snapshots:
+
+        <root>/history/<TICKER>.parquet | .csv   (Date column/index + OHLCV)
+        <root>/info/<TICKER>.json
+        <root>/news/<TICKER>.json
+
+    Periods are resolved relative to the last bar of each snapshot, so results
+    are deterministic regardless of the current date.
+    """
+    name = "file"
+
+    def __init__(self, root: str):
+        self.root = root
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def _load_history(self, ticker: str) -> pd.DataFrame:
+        ticker = ticker.upper()
+        with self._lock:
+            cached = self._frames.get(ticker)
+        if cached is not None:
+            return cached
+
+        base = os.path.join(self.root, "history", ticker)
+        if os.path.exists(f"{base}.parquet"):
+            df = pd.read_parquet(f"{base}.parquet")
+        elif os.path.exists(f"{base}.csv"):
+            df = pd.read_csv(f"{base}.csv")
+        else:
+            return pd.DataFrame()
+
+        if not isinstance(df.index, pd.DatetimeIndex):
+            date_col = next((c for c in df.columns if c.lower() in ("date", "datetime")), df.columns[0])
+            df = df.set_index(pd.to_datetime(df.pop(date_col), utc=True))
+        df = df.sort_index()
+        with self._lock:
+            self._frames[ticker] = df
+        return df
+
+    def _read_json(self, kind: str, ticker: str, default: Any) -> Any:
+        path = os.path.join(self.root, kind, f"{ticker.upper()}.json")
+        if not os.path.exists(path):
+            return default
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def get_history(self, ticker: str, period: str = "1y") -> pd.DataFrame:
+        df = self._load_history(ticker)
+        if df.empty or period in ("max", None):
+            return df
+        end = df.index[-1]
+        if period == "ytd":
+            start = end.replace(month=1, day=1, hour=0, minute=0, second=0)
+        elif period in _PERIOD_OFFSETS:
+            start = end - _PERIOD_OFFSETS[period]
+        else:
+            raise ValueError(f"Unsupported period: {period}")
+        return df[df.index > start]
+
+    def get_info(self, ticker: str) -> Dict[str, Any]:
+        return self._read_json("info", ticker, {})
+
+    def get_news(self, ticker: str) -> List[Dict[str, Any]]:
+        return self._read_json("news", ticker, [])
+
+    @staticmethod
+    def write_snapshot(root: str, ticker: str, history: pd.DataFrame,
+                       info: Optional[Dict[str, Any]] = None, news: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Stores one ticker's data in the layout read by FileProvider (history as CSV)."""
+        ticker = ticker.upper()
+        for kind in ("history", "info", "news"):
+            os.makedirs(os.path.join(root, kind), exist_ok=True)
+        history.rename_axis("Date").to_csv(os.path.join(root, "history", f"{ticker}.csv"))
+        with open(os.path.join(root, "info", f"{ticker}.json"), "w", encoding="utf-8") as f:
+            json.dump(info or {}, f)
+        with open(os.path.join(root, "news", f"{ticker}.json"), "w", encoding="utf-8") as f:
+            json.dump(news or [], f)
+
+
+def snapshot_tickers(tickers: List[str], root: str, period: str = "2y",
+                     source: Optional[MarketDataProvider] = None) -> None:
+    """Captures live data for offline use (benchmarks, load tests, backtests)."""
+    source = source or YFinanceProvider()
+    for ticker in tickers:
+        try:
+            FileProvider.write_snapshot(root, ticker, source.get_history(ticker, period),
+                                        source.get_info(ticker), source.get_news(ticker))
+            logger.info(f"Snapshot saved for {ticker}.")
+        except Exception as e:
+            logger.error(f"Snapshot failed for {ticker}: {e}")
+
+
+def get_default_provider() -> MarketDataProvider:
+    """Selects the provider from MARKET_DATA_PROVIDER (yfinance | file) and MARKET_DATA_DIR."""
+    kind = os.getenv("MARKET_DATA_PROVIDER", "yfinance").lower()
+    if kind == "file":
+        return FileProvider(os.getenv("MARKET_DATA_DIR", "data/market"))
+    if kind != "yfinance":
+        logger.warning(f"Unknown MARKET_DATA_PROVIDER '{kind}', falling back to yfinance.")
+    return YFinanceProvider()
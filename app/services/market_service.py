@@ -1,25 +1,158 @@
-import yfinance as yf
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Set
+from app.services.market_data_provider import MarketDataProvider, get_default_provider
+from app.services.single_flight import single_flight
+from app.services.tracing import span
+from app.services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Trading sessions per year, for annualizing daily figures
+TRADING_DAYS = 252
 
 class MarketService:
-    def __init__(self):
-        pass
+    def __init__(self, provider: Optional[MarketDataProvider] = None):
+        self.provider = provider or get_default_provider()
+        # Last prices per ticker, shared by portfolio views
+        self.quote_cache = TTLCache(ttl=float(os.getenv("QUOTE_CACHE_TTL_SECONDS", "15")), max_entries=4096)
+        # Aligned daily price matrices, shared by analytics/backtests
+        self.matrix_cache = TTLCache(ttl=float(os.getenv("PRICE_MATRIX_TTL_SECONDS", "300")), max_entries=64)
+        # Fundamentals (sector etc.) change rarely
+        self.info_cache = TTLCache(ttl=float(os.getenv("INFO_CACHE_TTL_SECONDS", "21600")), max_entries=4096)
+        self._info_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="market-info")
+        self._warming: Set[str] = set()
+        self._warming_lock = threading.Lock()
+
+    def get_quotes(self, tickers: List[str]) -> Dict[str, float]:
+        """
+        Last prices for many tickers. Cached quotes are served from a short-TTL cache;
+        all missing tickers are fetched in one bulk provider request.
+        Tickers without a price are omitted.
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers if t))
+        quotes: Dict[str, float] = {}
+        missing = []
+        for ticker in tickers:
+            price = self.quote_cache.get(ticker)
+            if price is None:
+                missing.append(ticker)
+            else:
+                quotes[ticker] = price
+        if missing:
+            try:
+                with span("market.quotes"):
+                    fetched = self.provider.get_quotes(missing)
+            except Exception as e:
+                fetched = {}
+                logger.error(f"Bulk quote request failed: {e}")
+            for ticker, price in fetched.items():
+                self.quote_cache.set(ticker.upper(), price)
+                quotes[ticker.upper()] = price
+        return quotes
 
+    @single_flight.coalesce("market.get_ticker_data")
     def get_ticker_data(self, ticker: str, period: str = "1y") -> Dict[str, Any]:
         """
         Fetches historical data and calculates technical indicators using pandas.
         """
         try:
             # Fetch data
-            stock = yf.Ticker(ticker)
-            df = stock.history(period=period)
-            
-            if df.empty:
+            df = self.get_history(ticker, period=period)
+            return self.build_market_data(ticker, df)
+        except Exception as e:
+            return {"error": str(e)}
+
+    @single_flight.coalesce("market.get_history")
+    def get_history(self, ticker: str, period: str = "1y") -> pd.DataFrame:
+        """Raw OHLCV history from the provider. Shared between callers: do not mutate."""
+        with span("market.history"):
+            return self.provider.get_history(ticker, period=period)
+
+    def get_info(self, ticker: str) -> Dict[str, Any]:
+        """
+        Company fundamentals, cached for INFO_CACHE_TTL_SECONDS.
+        Concurrent callers for the same ticker share one provider lookup.
+        """
+        ticker = ticker.upper()
+        return self.info_cache.get_or_load(ticker, lambda: self._load_info(ticker))
+
+    def _load_info(self, ticker: str) -> Dict[str, Any]:
+        with span("market.info"):
+            return self.provider.get_info(ticker) or {}
+
+    def get_sectors(self, tickers: List[str]) -> Dict[str, str]:
+        """
+        Sector per ticker from cached fundamentals, without waiting on the provider:
+        uncached tickers report "Unknown" and are looked up in the background.
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers if t))
+        infos = {t: self.info_cache.get(t) for t in tickers}
+        self.warm_info([t for t, info in infos.items() if info is None])
+        return {t: (infos[t] or {}).get("sector") or "Unknown" for t in tickers}
+
+    def warm_info(self, tickers: List[str]) -> None:
+        """Loads fundamentals for `tickers` into the info cache on background threads."""
+        with self._warming_lock:
+            new = [t.upper() for t in tickers if t.upper() not in self._warming]
+            self._warming.update(new)
+        for ticker in new:
+            self._info_pool.submit(self._warm_one, ticker)
+
+    def _warm_one(self, ticker: str) -> None:
+        try:
+            self.get_info(ticker)
+        except Exception as e:
+            logger.warning(f"Info lookup failed for {ticker}: {e}")
+        finally:
+            with self._warming_lock:
+                self._warming.discard(ticker)
+
+    def get_price_matrix(self, tickers: List[str], period: str = "1y", field: str = "Close") -> pd.DataFrame:
+        """
+        Aligned (date x ticker) matrix of one OHLCV field from a single bulk download.
+        Dates are normalized to UTC midnight; tickers without data are dropped.
+        Cached for PRICE_MATRIX_TTL_SECONDS and shared between callers: do not mutate.
+        """
+        tickers = tuple(sorted(set(t.upper() for t in tickers if t)))
+        return self.matrix_cache.get_or_load((tickers, period, field),
+                                             lambda: self._load_price_matrix(list(tickers), period, field))
+
+    def _load_price_matrix(self, tickers: List[str], period: str, field: str) -> pd.DataFrame:
+        with span("market.history_batch"):
+            frames = self.provider.get_history_batch(tickers, period=period)
+        columns = {}
+        for ticker in tickers:
+            df = frames.get(ticker)
+            if df is None or df.empty or field not in df:
+                continue
+            series = df[field].dropna()
+            index = pd.DatetimeIndex(series.index)
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            series.index = index.normalize().tz_localize("UTC")
+            columns[ticker] = series.groupby(level=0).last()
+        if not columns:
+            return pd.DataFrame()
+        return pd.DataFrame(columns).sort_index()
+
+    def build_market_data(self, ticker: str, df: pd.DataFrame, info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Calculates technical indicators on an already-fetched history frame.
+        `info` (fundamentals) is read through the info cache when not supplied.
+        """
+        try:
+            if df is None or df.empty:
                 return {"error": f"No data found for ticker {ticker}"}
             
+            # Work on a copy: history frames may be shared (bulk downloads, file snapshots)
+            df = df.copy()
+
             # Close prices
             close = df['Close']
 
@@ -45,7 +178,8 @@ class MarketService:
             prev = df.iloc[-2]
             
             # Basic Info
-            info = stock.info
+            if info is None:
+                info = self.get_info(ticker)
             
             return {
                 "ticker": ticker.upper(),
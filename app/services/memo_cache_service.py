@@ -0,0 +1,109 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+from app.schemas import InvestmentMemo
+from app.services.single_flight import SingleFlight
+from app.services.memo_service import memo_service
+
+logger = logging.getLogger(__name__)
+
+
+class MemoCacheService:
+    """
+    Per-ticker memo cache with stale-while-revalidate.
+
+    - age <= ttl: served as is ("fresh")
+    - ttl < age <= max_stale: served immediately ("stale") while one background
+      refresh rebuilds it
+    - older or missing: rebuilt inline ("miss"); concurrent misses share one build
+    """
+    def __init__(self, builder: Callable[[str], InvestmentMemo], ttl: Optional[float] = None,
+                 max_stale: Optional[float] = None, max_entries: int = 512, refresh_workers: int = 4):
+        self.builder = builder
+        self.ttl = ttl if ttl is not None else float(os.getenv("MEMO_CACHE_TTL_SECONDS", "300"))
+        self.max_stale = max_stale if max_stale is not None else float(os.getenv("MEMO_CACHE_MAX_STALE_SECONDS", "3600"))
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, InvestmentMemo]]" = OrderedDict()
+        self._flight = SingleFlight()
+        self._refreshing = set()
+        self._refresh_pool = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="memo-refresh")
+        self._lock = threading.Lock()
+
+    def _store(self, ticker: str, memo: InvestmentMemo) -> None:
+        with self._lock:
+            self._entries[ticker] = (time.monotonic(), memo)
+            self._entries.move_to_end(ticker)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _build(self, ticker: str) -> InvestmentMemo:
+        memo = self.builder(ticker)
+        self._store(ticker, memo)
+        return memo
+
+    def _refresh(self, ticker: str) -> None:
+        try:
+            self._flight.do(ticker, self._build, ticker)
+        except Exception as e:
+            logger.error(f"Background memo refresh failed for {ticker}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(ticker)
+
+    def _schedule_refresh(self, ticker: str) -> None:
+        with self._lock:
+            if ticker in self._refreshing:
+                return
+            self._refreshing.add(ticker)
+        self._refresh_pool.submit(self._refresh, ticker)
+
+    def peek(self, ticker: str) -> Optional[Tuple[InvestmentMemo, float, str]]:
+        """
+        Returns (memo, age in seconds, "fresh" | "stale") without building, or None
+        when there is no servable entry. Stale entries are refreshed in the background.
+        """
+        ticker = ticker.upper()
+        with self._lock:
+            entry = self._entries.get(ticker)
+        if entry is None:
+            return None
+        built_at, memo = entry
+        age = time.monotonic() - built_at
+        if age <= self.ttl:
+            return memo, age, "fresh"
+        if age <= self.max_stale:
+            self._schedule_refresh(ticker)
+            return memo, age, "stale"
+        return None
+
+    def get(self, ticker: str) -> Tuple[InvestmentMemo, float, str]:
+        """Returns (memo, age in seconds, "fresh" | "stale" | "miss")."""
+        ticker = ticker.upper()
+        cached = self.peek(ticker)
+        if cached is not None:
+            return cached
+
+        memo = self._flight.do(ticker, self._build, ticker)
+        return memo, 0.0, "miss"
+
+    def put(self, ticker: str, memo: InvestmentMemo) -> None:
+        """Seeds the cache with a memo built elsewhere (e.g. the batch job)."""
+        self._store(ticker.upper(), memo)
+
+    def invalidate(self, ticker: Optional[str] = None) -> None:
+        with self._lock:
+            if ticker is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(ticker.upper(), None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "refreshing": len(self._refreshing)}
+
+
+memo_cache_service = MemoCacheService(memo_service.build_memo)
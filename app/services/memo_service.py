@@ -0,0 +1,243 @@
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from app.schemas import InvestmentMemo
+from app.services.market_service import market_service
+from app.services.social_service import social_service
+from app.services.news_service import news_service
+from app.services.database_service import database_service
+from app.services.news_sentiment_index_service import news_sentiment_index_service
+from app.services.news_enrichment_service import news_enrichment_service
+from app.services.tracing import Trace, span, traced, run_in_trace
+
+logger = logging.getLogger(__name__)
+
+
+class TickerNotFoundError(LookupError):
+    """Raised when no market data can be found for a ticker."""
+
+
+def _generate_recommendation(market: dict, sentiment: dict, social: dict) -> str:
+    """Simple logic to generate a BUY/SELL/HOLD signal."""
+    score = 0
+
+    # 1. Market Logic (RSI)
+    rsi = market.get("indicators", {}).get("rsi", 50)
+    if rsi < 30: score += 1.5 # Oversold (Buy Weight)
+    elif rsi > 70: score -= 1.5 # Overbought (Sell Weight)
+
+    # 2. News Logic (Aggregated)
+    news_items = sentiment.get("items", [])
+    if news_items:
+        avg_score = sum([n["sentiment"]["score"] for n in news_items]) / len(news_items)
+        pos_count = len([n for n in news_items if n["sentiment"]["label"] == "positive"])
+        neg_count = len([n for n in news_items if n["sentiment"]["label"] == "negative"])
+
+        if pos_count > neg_count and avg_score > 0.6: score += 1
+        elif neg_count > pos_count and avg_score > 0.6: score -= 1
+
+    # 3. Social Logic (Aggregated)
+    social_posts = social.get("data", [])
+    if social_posts:
+        pos_posts = len([p for p in social_posts if p.get("sentiment_label") == "positive"])
+        neg_posts = len([p for p in social_posts if p.get("sentiment_label") == "negative"])
+        if pos_posts > neg_posts: score += 0.5
+        elif neg_posts > pos_posts: score -= 0.5
+
+    # Result Synthesis
+    if score >= 1: return "BUY"
+    if score <= -1: return "SELL"
+    return "HOLD"
+
+
+def build_news_context(ticker: str, news_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregates scored headlines into the memo's news section."""
+    # Calculate Overall News Sentiment for Context
+    if news_data:
+        avg_news_score = sum([n["sentiment"]["score"] for n in news_data]) / len(news_data)
+        pos_news = len([n for n in news_data if n["sentiment"]["label"] == "positive"])
+        neg_news = len([n for n in news_data if n["sentiment"]["label"] == "negative"])
+        overall_news_sent = "positive" if pos_news > neg_news else ("negative" if neg_news > pos_news else "neutral")
+    else:
+        avg_news_score = 0.5
+        overall_news_sent = "neutral"
+
+    return {
+        "items": news_data,
+        "overall_sentiment": overall_news_sent,
+        "average_score": avg_news_score,
+        "sentiment_index": news_sentiment_index_service.compute([ticker])[ticker.upper()]
+    }
+
+
+def _market_fingerprint(df) -> str:
+    # Latest bar timestamp plus its close/volume: the last bar keeps moving intraday
+    if df is None or df.empty:
+        return ""
+    last = df.iloc[-1]
+    return f"{df.index[-1].isoformat()}|{last['Close']}|{last['Volume']}"
+
+
+def _news_fingerprint(raw_news: List[Dict[str, Any]], count: int) -> str:
+    return "|".join(str(item.get("uuid") or item.get("link") or item.get("title", "")) for item in raw_news[:count])
+
+
+def _social_fingerprint(social_data: Dict[str, Any]) -> str:
+    # Taken from the page itself, so it always describes the posts it labels
+    return "|".join(f"{p.get('source')}:{p.get('id')}" for p in social_data.get("data", []))
+
+
+class MemoService:
+    """
+    Builds Investment Memos: fetches the market, social and news sections
+    concurrently, then synthesizes the recommendation.
+
+    Rebuilds are incremental. Each section remembers a fingerprint of its inputs
+    (latest bar, news ids, social post ids) and is reused when it is unchanged:
+    an unchanged market section skips indicators and the fundamentals lookup,
+    unchanged news skips sentiment scoring, and the recommendation is only
+    recomputed when one of its inputs changed. The social section is always
+    served from the feed's own TTL snapshot.
+    """
+    def __init__(self, max_workers: int = 16, max_tracked: int = 512):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="memo")
+        self.max_tracked = max_tracked
+        self._inputs: "OrderedDict[str, Dict[str, Tuple[str, Any]]]" = OrderedDict()
+        self._inputs_lock = threading.Lock()
+
+    def _previous(self, ticker: str, section: str) -> Optional[Tuple[str, Any]]:
+        with self._inputs_lock:
+            return self._inputs.get(ticker.upper(), {}).get(section)
+
+    def _remember(self, ticker: str, section: str, fingerprint: str, value: Any) -> None:
+        ticker = ticker.upper()
+        with self._inputs_lock:
+            self._inputs.setdefault(ticker, {})[section] = (fingerprint, value)
+            self._inputs.move_to_end(ticker)
+            while len(self._inputs) > self.max_tracked:
+                self._inputs.popitem(last=False)
+
+    def _reusable(self, ticker: str, section: str, fingerprint: str) -> Optional[Any]:
+        previous = self._previous(ticker, section)
+        if previous is not None and previous[0] == fingerprint:
+            logger.debug(f"Reusing unchanged {section} section for {ticker}.")
+            return previous[1]
+        return None
+
+    def forget(self, ticker: Optional[str] = None) -> None:
+        """Drops remembered sections so the next build recomputes everything."""
+        with self._inputs_lock:
+            if ticker is None:
+                self._inputs.clear()
+            else:
+                self._inputs.pop(ticker.upper(), None)
+
+    @traced("memo.market")
+    def fetch_market(self, ticker: str) -> Dict[str, Any]:
+        try:
+            df = market_service.get_history(ticker)
+        except Exception as e:
+            raise TickerNotFoundError(f"Ticker {ticker} not found: {e}")
+
+        fingerprint = _market_fingerprint(df)
+        market_data = self._reusable(ticker, "market", fingerprint)
+        if market_data is None:
+            # Fundamentals come from the TTL-bounded info cache
+            market_data = market_service.build_market_data(ticker, df)
+            if "error" in market_data:
+                raise TickerNotFoundError(f"Ticker {ticker} not found: {market_data['error']}")
+            self._remember(ticker, "market", fingerprint, market_data)
+        return market_data
+
+    @traced("memo.social")
+    def fetch_social(self, ticker: str) -> Dict[str, Any]:
+        # Short-TTL cached per ticker; the fingerprint only feeds the recommendation reuse
+        social_data = social_service.get_feed_page(ticker=ticker, limit=3)
+        self._remember(ticker, "social", _social_fingerprint(social_data), social_data)
+        return social_data
+
+    @traced("memo.news")
+    def fetch_news(self, ticker: str, count: int = 5) -> Dict[str, Any]:
+        raw_news = news_service.fetch_raw_news(ticker)
+        fingerprint = _news_fingerprint(raw_news, count)
+        news_data = self._reusable(ticker, "news", fingerprint)
+        if news_data is None:
+            news_data = news_service.score_news(ticker, raw_news, count)
+            self._remember(ticker, "news", fingerprint, news_data)
+        # Full news summaries come from the background enrichment cache
+        news_data = news_enrichment_service.attach(ticker, news_data)
+        return build_news_context(ticker, news_data)
+
+    def assemble(self, ticker: str, market_data: Dict[str, Any], news_context: Dict[str, Any],
+                 social_data: Dict[str, Any], recommendation: Optional[str] = None) -> InvestmentMemo:
+        rec = recommendation or _generate_recommendation(market_data, news_context, social_data)
+        return InvestmentMemo(
+            ticker=ticker.upper(),
+            generated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            market_data=market_data,
+            social_context=social_data,
+            news_context=news_context,
+            recommendation=rec,
+            analysis_summary=f"Analysis suggests {rec}. Market: RSI {market_data['indicators']['rsi']}. News: {news_context['overall_sentiment'].upper()}. Social: {social_data['summary']}"
+        )
+
+    def persist(self, memo: InvestmentMemo) -> None:
+        # Best effort and non-blocking: written by the database write-behind queue
+        try:
+            database_service.enqueue_memo(memo)
+        except Exception as e:
+            logger.error(f"Persistence failed: {e}")
+
+    def _finish(self, ticker: str, sections: Dict[str, Any], persist: bool) -> InvestmentMemo:
+        inputs = [self._previous(ticker, name) for name in ("market", "news", "social")]
+        fingerprint = "||".join(i[0] for i in inputs) if all(inputs) else None
+        with span("memo.assemble"):
+            rec = self._reusable(ticker, "recommendation", fingerprint) if fingerprint is not None else None
+            memo = self.assemble(ticker, sections["market"], sections["news"], sections["social"], rec)
+        if fingerprint is not None:
+            self._remember(ticker, "recommendation", fingerprint, memo.recommendation)
+        if persist:
+            with span("db.enqueue"):
+                self.persist(memo)
+        return memo
+
+    def iter_sections(self, ticker: str, persist: bool = True) -> Iterator[Tuple[str, Any]]:
+        """
+        Fetches the market, social and news sections concurrently and yields
+        ("market" | "news" | "social", data) as each one completes, then
+        ("memo", InvestmentMemo) with per-stage timings attached as `memo.timings`.
+        Raises TickerNotFoundError when market data is unavailable.
+        """
+        # The trace is passed explicitly: a generator may be resumed from different contexts
+        trace = Trace("memo", ticker=ticker.upper())
+        futures = {
+            self._pool.submit(run_in_trace, trace, self.fetch_market, ticker): "market",
+            self._pool.submit(run_in_trace, trace, self.fetch_social, ticker): "social",
+            self._pool.submit(run_in_trace, trace, self.fetch_news, ticker): "news",
+        }
+        sections: Dict[str, Any] = {}
+        try:
+            for future in as_completed(futures):
+                name = futures[future]
+                sections[name] = future.result()
+                yield name, sections[name]
+
+            memo = run_in_trace(trace, self._finish, ticker, sections, persist)
+            memo.timings = trace.timings()
+            yield "memo", memo
+        finally:
+            trace.finish()
+
+    def build_memo(self, ticker: str, persist: bool = True) -> InvestmentMemo:
+        """
+        Generates a full Investment Memo for a ticker.
+        Raises TickerNotFoundError when market data is unavailable.
+        """
+        for name, value in self.iter_sections(ticker, persist):
+            if name == "memo":
+                return value
+
+memo_service = MemoService()
@@ -0,0 +1,152 @@
+import os
+import time
+import queue
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+from app.services.news_scraper_service import news_scraper_service
+from app.services.nlp_service import nlp_service
+
+logger = logging.getLogger(__name__)
+
+
+class NewsEnrichmentService:
+    """
+    Scrapes and summarizes news articles for tracked tickers in background threads,
+    so memo requests can attach full summaries without paying for them inline.
+
+    ENRICHMENT_TICKERS are always tracked. Tickers tracked on access (memo requests)
+    expire `track_ttl` seconds after their last access, and at most `max_tracked`
+    of them are kept (least recently used dropped first).
+    """
+    def __init__(self, workers: int = 2, max_queue: int = 500, max_cache: int = 1000,
+                 max_tracked: int = 256, track_ttl: float = 86400.0):
+        self.workers = workers
+        self.max_cache = max_cache
+        self.max_tracked = max_tracked
+        self.track_ttl = track_ttl
+        self._queue: "queue.Queue[Tuple[str, str]]" = queue.Queue(maxsize=max_queue)
+        # link -> summary (None when scraping/summarizing failed, so it is not retried)
+        self._summaries: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._pending = set()
+        self._pinned = {t.strip().upper() for t in os.getenv("ENRICHMENT_TICKERS", "").split(",") if t.strip()}
+        # ticker -> last access (monotonic)
+        self._tracked: "OrderedDict[str, float]" = OrderedDict()
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def track(self, ticker: str) -> None:
+        ticker = ticker.upper()
+        with self._lock:
+            if ticker in self._pinned:
+                return
+            self._tracked[ticker] = time.monotonic()
+            self._tracked.move_to_end(ticker)
+            while len(self._tracked) > self.max_tracked:
+                self._tracked.popitem(last=False)
+
+    def is_tracked(self, ticker: str) -> bool:
+        ticker = ticker.upper()
+        with self._lock:
+            if ticker in self._pinned:
+                return True
+            last_access = self._tracked.get(ticker)
+            if last_access is None:
+                return False
+            if time.monotonic() - last_access > self.track_ttl:
+                del self._tracked[ticker]
+                return False
+            return True
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads or self._closed:
+                return
+            self._stop.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"news-enrichment-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stops the workers for good: later `enqueue` calls are no-ops."""
+        with self._lock:
+            self._closed = True
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def get_summary(self, link: str) -> Optional[str]:
+        with self._lock:
+            return self._summaries.get(link)
+
+    def enqueue(self, ticker: str, items: List[Dict[str, Any]]) -> int:
+        """Queues unsummarized articles of a tracked ticker. Returns how many were queued."""
+        if self._closed or not self.is_tracked(ticker):
+            return 0
+        queued = 0
+        for item in items:
+            link = item.get("link")
+            with self._lock:
+                if not link or link in self._summaries or link in self._pending:
+                    continue
+                self._pending.add(link)
+            try:
+                self._queue.put_nowait((ticker.upper(), link))
+                queued += 1
+            except queue.Full:
+                with self._lock:
+                    self._pending.discard(link)
+                logger.warning("News enrichment queue full; dropping remaining articles.")
+                break
+        if queued:
+            self.start()
+        return queued
+
+    def attach(self, ticker: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Returns copies of `items` with `full_summary` set from the cache, tracking the
+        ticker and queueing whatever has not been summarized yet.
+        """
+        self.track(ticker)
+        self.enqueue(ticker, items)
+        return [{**item, "full_summary": self.get_summary(item.get("link", ""))} for item in items]
+
+    def process(self, link: str) -> Optional[str]:
+        """Scrapes and summarizes one article, caching the result."""
+        summary = None
+        try:
+            text = news_scraper_service.scrape_article(link)
+            if text:
+                summary = nlp_service.summarize(text)
+        except Exception as e:
+            logger.error(f"Enrichment failed for {link}: {e}")
+        with self._lock:
+            self._summaries[link] = summary
+            self._summaries.move_to_end(link)
+            while len(self._summaries) > self.max_cache:
+                self._summaries.popitem(last=False)
+            self._pending.discard(link)
+        return summary
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                ticker, link = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                logger.info(f"Enriching {ticker} article: {link}")
+                self.process(link)
+            finally:
+                self._queue.task_done()
+
+    def wait_idle(self) -> None:
+        """Blocks until every queued article has been processed."""
+        self._queue.join()
+
+news_enrichment_service = NewsEnrichmentService()
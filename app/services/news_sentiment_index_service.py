@@ -0,0 +1,156 @@
+import time
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# name -> (lookback seconds, decay half-life seconds)
+DEFAULT_WINDOWS: Dict[str, Tuple[int, int]] = {
+    "1d": (86400, 6 * 3600),
+    "7d": (7 * 86400, 2 * 86400),
+    "30d": (30 * 86400, 7 * 86400),
+}
+
+def signed_polarity(sentiment: Dict[str, Any]) -> float:
+    """
+    FinBERT `score` is the confidence of the winning label, not a polarity.
+    Map it to [-1, 1]: positive -> +score, negative -> -score, neutral -> 0.
+    """
+    label = (sentiment or {}).get("label", "neutral")
+    score = float((sentiment or {}).get("score", 0.0))
+    if label == "positive":
+        return score
+    if label == "negative":
+        return -score
+    return 0.0
+
+
+class NewsSentimentIndexService:
+    """
+    Stores scored headlines per ticker (with their publish time) in flat columns and
+    computes an exponentially time-decayed, signed sentiment index for many tickers
+    and windows in one vectorized pass.
+    """
+    def __init__(self, windows: Optional[Dict[str, Tuple[int, int]]] = None,
+                 max_age_seconds: Optional[int] = None):
+        self.windows = dict(windows or DEFAULT_WINDOWS)
+        self.max_age_seconds = max_age_seconds or max(lookback for lookback, _ in self.windows.values())
+        self._ticker_ids: Dict[str, int] = {}
+        self._tickers: List[str] = []
+        self._seen: Dict[Tuple[str, str], int] = {} # (ticker, link) -> publish time
+        self._ticker_col: List[int] = []
+        self._time_col: List[int] = []
+        self._polarity_col: List[float] = []
+        self._lock = threading.Lock()
+
+    def _ticker_id(self, ticker: str) -> int:
+        tid = self._ticker_ids.get(ticker)
+        if tid is None:
+            tid = self._ticker_ids[ticker] = len(self._tickers)
+            self._tickers.append(ticker)
+        return tid
+
+    def record(self, ticker: str, items: List[Dict[str, Any]]) -> int:
+        """
+        Stores processed news items (as returned by NewsService) for a ticker.
+        Headlines already recorded for the ticker are ignored. Returns how many were added.
+        """
+        if not items:
+            return 0
+        ticker = ticker.upper()
+        added = 0
+        with self._lock:
+            for item in items:
+                key = (ticker, item.get("link") or item.get("title"))
+                if key in self._seen or not item.get("timestamp"):
+                    continue
+                # Only tickers with stored headlines get an id (and a bincount column)
+                tid = self._ticker_id(ticker)
+                self._seen[key] = int(item["timestamp"])
+                self._ticker_col.append(tid)
+                self._time_col.append(int(item["timestamp"]))
+                self._polarity_col.append(signed_polarity(item.get("sentiment")))
+                added += 1
+        return added
+
+    def _compact(self, now: int) -> None:
+        """
+        Drops headlines older than the longest window, and tickers left without
+        headlines, renumbering the remaining ticker ids (caller holds the lock).
+        """
+        cutoff = now - self.max_age_seconds
+        if not self._time_col or min(self._time_col) >= cutoff:
+            return
+        keep = [i for i, t in enumerate(self._time_col) if t >= cutoff]
+        surviving = sorted({self._ticker_col[i] for i in keep})
+        remap = {old: new for new, old in enumerate(surviving)}
+        self._tickers = [self._tickers[old] for old in surviving]
+        self._ticker_ids = {ticker: tid for tid, ticker in enumerate(self._tickers)}
+        self._ticker_col = [remap[self._ticker_col[i]] for i in keep]
+        self._time_col = [self._time_col[i] for i in keep]
+        self._polarity_col = [self._polarity_col[i] for i in keep]
+        self._seen = {key: t for key, t in self._seen.items() if t >= cutoff}
+
+    def compute(self, tickers: Optional[List[str]] = None, now: Optional[float] = None,
+                windows: Optional[Dict[str, Tuple[int, int]]] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Returns {ticker: {window: {"index": polarity in [-1, 1], "count": n}}}.
+        Each headline is weighted by 2^(-age / half_life) within its window's lookback.
+        """
+        windows = windows or self.windows
+        now = int(now if now is not None else time.time())
+        with self._lock:
+            self._compact(now)
+            ticker_idx = np.asarray(self._ticker_col, dtype=np.int64)
+            published = np.asarray(self._time_col, dtype=np.int64)
+            polarity = np.asarray(self._polarity_col, dtype=np.float64)
+            names = list(self._tickers)
+            ticker_ids = dict(self._ticker_ids)
+
+        n_tickers = len(names)
+        names_w = list(windows)
+        lookback = np.array([windows[w][0] for w in names_w], dtype=np.float64)[:, None]
+        half_life = np.array([windows[w][1] for w in names_w], dtype=np.float64)[:, None]
+
+        # (windows x headlines) weights, then per-(window, ticker) sums via one bincount
+        age = np.maximum(now - published, 0)[None, :].astype(np.float64)
+        in_window = age <= lookback
+        weights = np.where(in_window, np.exp2(-age / half_life), 0.0)
+        flat_idx = (ticker_idx[None, :] + np.arange(len(names_w))[:, None] * n_tickers).ravel()
+        size = len(names_w) * n_tickers
+        num = np.bincount(flat_idx, weights=(weights * polarity[None, :]).ravel(), minlength=size)
+        den = np.bincount(flat_idx, weights=weights.ravel(), minlength=size)
+        cnt = np.bincount(flat_idx, weights=in_window.ravel().astype(np.float64), minlength=size)
+        index = np.divide(num, den, out=np.zeros(size), where=den > 0)
+
+        index = index.reshape(len(names_w), n_tickers)
+        cnt = cnt.reshape(len(names_w), n_tickers)
+
+        wanted = [t.upper() for t in tickers] if tickers else names
+        result = {}
+        for ticker in wanted:
+            tid = ticker_ids.get(ticker)
+            result[ticker] = {
+                w: {
+                    "index": round(float(index[i, tid]), 4) if tid is not None else 0.0,
+                    "count": int(cnt[i, tid]) if tid is not None else 0
+                }
+                for i, w in enumerate(names_w)
+            }
+        return result
+
+    def export(self) -> Dict[str, np.ndarray]:
+        """Retained headlines as columns: ticker, published (epoch seconds), polarity."""
+        with self._lock:
+            names = np.asarray(self._tickers, dtype=object)
+            ticker_idx = np.asarray(self._ticker_col, dtype=np.int64)
+            return {
+                "ticker": names[ticker_idx] if len(names) else np.empty(0, dtype=object),
+                "published": np.asarray(self._time_col, dtype=np.int64),
+                "polarity": np.asarray(self._polarity_col, dtype=np.float64),
+            }
+
+news_sentiment_index_service = NewsSentimentIndexService()
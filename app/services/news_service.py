@@ -1,49 +1,151 @@
-import yfinance as yf
 import logging
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from app.services.nlp_service import nlp_service
+from app.services.market_data_provider import MarketDataProvider, get_default_provider
+from app.services.single_flight import single_flight
+from app.services.tracing import span
+from app.services.news_sentiment_index_service import news_sentiment_index_service
+from app.services.news_enrichment_service import news_enrichment_service
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SENTIMENT = {"label": "neutral", "score": 0.5}
+
+# Query parameters that only track the click; anything else may identify the article (?id=, ?p=)
+TRACKING_PARAMS = {"guccounter", "guce_referrer", "guce_referrer_sig", "fbclid", "gclid",
+                   "mc_cid", "mc_eid", "ncid", "cmpid", ".tsrc", "soc_src", "soc_trk"}
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name.startswith("utm") or name in TRACKING_PARAMS
+
+def _canonical_link(link: str) -> str:
+    """
+    Normalizes an article URL for dedup: scheme/host case, trailing slash and
+    fragment are dropped, tracking parameters removed and the rest sorted.
+    """
+    if not link:
+        return ""
+    parts = urlsplit(link.strip())
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if not _is_tracking_param(k)))
+    return urlunsplit((parts.scheme.lower() or "https", parts.netloc.lower(), path, query, ""))
+
+def _article_aliases(item: Dict[str, Any]) -> List[str]:
+    aliases = []
+    if item.get("uuid"):
+        aliases.append(f"uuid:{item['uuid']}")
+    link = _canonical_link(item.get("link", ""))
+    if link:
+        aliases.append(f"link:{link}")
+    return aliases
+
+def _format_item(item: Dict[str, Any], sentiment: Dict[str, Any]) -> Dict[str, Any]:
+    headline = item.get("title", "")
+    return {
+        "title": headline,
+        "link": item.get("link", ""),
+        "publisher": item.get("publisher", "Unknown"),
+        "timestamp": item.get("providerPublishTime", 0),
+        "sentiment": sentiment,
+        "summary": item.get("summary", headline) # yfinance news often has a 'summary' field
+    }
+
 class NewsService:
-    def __init__(self):
-        pass
+    def __init__(self, provider: Optional[MarketDataProvider] = None, max_workers: int = 8):
+        self.provider = provider or get_default_provider()
+        self.max_workers = max_workers
 
+    @single_flight.coalesce("news.get_ticker_news")
     def get_ticker_news(self, ticker: str, count: int = 5) -> List[Dict[str, Any]]:
         """
-        Fetches live headlines for a ticker from yfinance and analyzes sentiment.
+        Fetches live headlines for a ticker from the market data provider and analyzes sentiment.
         """
         try:
-            stock = yf.Ticker(ticker)
-            news_data = stock.news
-            
-            if not news_data:
-                logger.warning(f"No news found for ticker {ticker}")
-                return []
-
-            processed_news = []
-            for item in news_data[:count]:
-                headline = item.get("title", "")
-                link = item.get("link", "")
-                publisher = item.get("publisher", "Unknown")
-                provider_publish_time = item.get("providerPublishTime", 0)
-
-                # Analyze sentiment of the headline
-                sentiment_result = nlp_service.analyze_sentiment(headline)
-                
-                processed_news.append({
-                    "title": headline,
-                    "link": link,
-                    "publisher": publisher,
-                    "timestamp": provider_publish_time,
-                    "sentiment": sentiment_result.get("sentiment", {"label": "neutral", "score": 0.5}),
-                    "summary": item.get("summary", headline) # yfinance news often has a 'summary' field
-                })
-            
-            return processed_news
+            with span("news.fetch"):
+                news_data = self.provider.get_news(ticker)
+            return self.score_news(ticker, news_data, count)
 
         except Exception as e:
             logger.error(f"Error fetching news for {ticker}: {str(e)}")
             return []
 
+    def score_news(self, ticker: str, news_data: List[Dict[str, Any]], count: int = 5) -> List[Dict[str, Any]]:
+        """
+        Scores the first `count` raw provider headlines and records them for the
+        sentiment index and background enrichment.
+        """
+        if not news_data:
+            logger.warning(f"No news found for ticker {ticker}")
+            return []
+
+        processed_news = []
+        for item in news_data[:count]:
+            # Analyze sentiment of the headline
+            sentiment_result = nlp_service.analyze_sentiment(item.get("title", ""))
+            processed_news.append(_format_item(item, sentiment_result.get("sentiment", DEFAULT_SENTIMENT)))
+        
+        news_sentiment_index_service.record(ticker, processed_news)
+        news_enrichment_service.enqueue(ticker, processed_news)
+        return processed_news
+
+    @single_flight.coalesce("news.fetch_raw_news")
+    def fetch_raw_news(self, ticker: str) -> List[Dict[str, Any]]:
+        """Unscored provider headlines; errors are logged and yield an empty list."""
+        try:
+            with span("news.fetch"):
+                return self.provider.get_news(ticker)
+        except Exception as e:
+            logger.error(f"Error fetching news for {ticker}: {str(e)}")
+            return []
+
+    def get_news_batch(self, tickers: List[str], count: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetches news for many tickers concurrently, deduplicates articles across tickers
+        (by UUID or canonical link), scores each unique headline once and maps the
+        results back to every ticker that references the article.
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers if t))
+        if not tickers:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tickers))) as pool:
+            raw_by_ticker = dict(zip(tickers, pool.map(self.fetch_raw_news, tickers)))
+
+        # Assign every article a single id; an article matching an earlier one by
+        # either UUID or canonical link reuses that id.
+        alias_to_id: Dict[str, int] = {}
+        articles: List[Dict[str, Any]] = []
+        refs_by_ticker: Dict[str, List[int]] = {}
+        for ticker in tickers:
+            refs: List[int] = []
+            for item in raw_by_ticker[ticker][:count]:
+                aliases = _article_aliases(item)
+                article_id: Optional[int] = next((alias_to_id[a] for a in aliases if a in alias_to_id), None)
+                if article_id is None:
+                    article_id = len(articles)
+                    articles.append(item)
+                for alias in aliases:
+                    alias_to_id.setdefault(alias, article_id)
+                if article_id not in refs:
+                    refs.append(article_id)
+            refs_by_ticker[ticker] = refs
+
+        sentiments = nlp_service.analyze_sentiment_batch([a.get("title", "") for a in articles])
+        processed = [
+            _format_item(article, result.get("sentiment", DEFAULT_SENTIMENT))
+            for article, result in zip(articles, sentiments)
+        ]
+        logger.info(f"Scored {len(processed)} unique headlines for {len(tickers)} tickers.")
+
+        # Shallow copies so per-ticker consumers can annotate items independently
+        result = {ticker: [dict(processed[i]) for i in refs] for ticker, refs in refs_by_ticker.items()}
+        for ticker, items in result.items():
+            news_sentiment_index_service.record(ticker, items)
+            news_enrichment_service.enqueue(ticker, items)
+        return result
+
 news_service = NewsService()
@@ -2,6 +2,8 @@ from transformers import pipeline
 import logging
 from typing import Dict, Any, List, Optional
 from app.services.news_scraper_service import news_scraper_service
+from app.services.single_flight import single_flight
+from app.services.tracing import traced
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -103,6 +105,7 @@ class NLPService:
             logger.error(f"Summarization failed: {e}")
             return self._mock_summarize(text)
 
+    @single_flight.coalesce("nlp.summarize_article")
     def summarize_article(self, url: str) -> Dict[str, Any]:
         """
         Scrapes an article from a URL and returns a summary.
@@ -139,6 +142,8 @@ class NLPService:
         else:
             return {"label": "neutral", "score": 0.50}
 
+    @traced("nlp.sentiment")
+    @single_flight.coalesce("nlp.analyze_sentiment")
     def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """
         Analyzes text for financial sentiment (Positive, Negative, Neutral).
@@ -173,4 +178,34 @@ class NLPService:
                 "error_fallback": str(e)
             }
 
+    @traced("nlp.sentiment_batch")
+    def analyze_sentiment_batch(self, texts: List[str], batch_size: int = 16) -> List[Dict[str, Any]]:
+        """
+        Analyzes many texts in a single pipeline call.
+        Returns one result per input, in the same shape as `analyze_sentiment`.
+        """
+        results: List[Dict[str, Any]] = [{"error": "No text provided"} for _ in texts]
+        indexes = [i for i, text in enumerate(texts) if text]
+        if not indexes:
+            return results
+
+        if self.mock_mode or not self.classifier:
+            for i in indexes:
+                results[i] = self.analyze_sentiment(texts[i])
+            return results
+
+        try:
+            outputs = self.classifier([texts[i][:512] for i in indexes], batch_size=batch_size)
+            for i, top_result in zip(indexes, outputs):
+                results[i] = {
+                    "sentiment": top_result,
+                    "is_mock": False,
+                    "model": "ProsusAI/finbert"
+                }
+        except Exception as e:
+            logger.error(f"Batch inference failed: {e}")
+            for i in indexes:
+                results[i] = self.analyze_sentiment(texts[i])
+        return results
+
 nlp_service = NLPService()
@@ -0,0 +1,135 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.services.market_service import market_service, TRADING_DAYS
+from app.services.database_service import database_service
+
+logger = logging.getLogger(__name__)
+
+# Shortest provider period covering a lookback, in days
+_PERIODS = [(30, "1mo"), (90, "3mo"), (180, "6mo"), (365, "1y"), (730, "2y"), (1825, "5y"), (3650, "10y")]
+
+
+def period_for(start: pd.Timestamp, now: Optional[pd.Timestamp] = None) -> str:
+    now = now or pd.Timestamp.now(tz="UTC")
+    days = (now - start).days + 7 # Margin for weekends/holidays at the start
+    return next((period for limit, period in _PERIODS if days <= limit), "max")
+
+
+def positions_frame(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Portfolio rows -> (ticker, entry_price, entry_date) frame, dropping unusable rows."""
+    frame = pd.DataFrame(rows)
+    if frame.empty:
+        return frame
+    frame = frame.assign(
+        ticker=frame["ticker"].str.upper(),
+        entry_price=pd.to_numeric(frame["entry_price"], errors="coerce"),
+        entry_date=pd.to_datetime(frame["entry_date"], errors="coerce", utc=True).dt.normalize(),
+    )
+    frame = frame.dropna(subset=["entry_price", "entry_date"])
+    return frame[frame["entry_price"] > 0].reset_index(drop=True)
+
+
+class PortfolioAnalyticsService:
+    """
+    Portfolio-level analytics over an aligned (date x position) price matrix.
+
+    Every position is one unit of capital invested at `entry_price` on `entry_date`
+    and held since; the move from `entry_price` to the first close counts on the
+    entry day, so returns agree with the position P/L. Daily portfolio returns
+    are value-weighted across open positions (time-weighted, so later entries
+    do not count as gains).
+    """
+    def analyze(self, rows: List[Dict[str, Any]], risk_free_rate: float = 0.0,
+                include_curve: bool = True) -> Dict[str, Any]:
+        positions = positions_frame(rows)
+        if positions.empty:
+            return {"positions": 0, "error": "Portfolio is empty"}
+
+        tickers = sorted(positions["ticker"].unique())
+        prices = market_service.get_price_matrix(tickers, period=period_for(positions["entry_date"].min()))
+        priced = positions["ticker"].isin(prices.columns)
+        missing = sorted(positions.loc[~priced, "ticker"].unique())
+        positions = positions[priced].reset_index(drop=True)
+        if positions.empty:
+            return {"positions": 0, "missing": missing, "error": "No price history for portfolio tickers"}
+
+        # (dates x positions): one column per position, even when a ticker is held twice
+        prices = prices[prices.index >= positions["entry_date"].min()].ffill()
+        if prices.empty:
+            # Every position was entered after the last bar (e.g. added on a weekend)
+            return {
+                "positions": int(len(positions)), "missing": missing, "start": None, "end": None,
+                "invested": 0, "market_value": 0.0, "total_return": 0.0, "max_drawdown": 0.0,
+                "volatility": 0.0, "sharpe": 0.0, "sortino": 0.0, "sector_exposure": {},
+                **({"equity_curve": []} if include_curve else {}),
+            }
+        dates = prices.index
+        close = prices[positions["ticker"]].to_numpy(dtype=float)
+        entry_price = positions["entry_price"].to_numpy(dtype=float)
+        held = (dates.values[:, None] >= positions["entry_date"].values[None, :]) & ~np.isnan(close)
+
+        value = np.where(held, close / entry_price, 0.0) # Value of each unit of capital
+        daily = np.zeros_like(value)
+        daily[1:] = np.where(held[:-1] & held[1:], close[1:] / close[:-1] - 1, 0.0)
+        prev_value = np.zeros_like(value)
+        prev_value[1:] = value[:-1]
+        # First held day: the unit of capital moves from entry_price to that day's close
+        first = held.copy()
+        first[1:] &= ~held[:-1]
+        daily = np.where(first, close / entry_price - 1, daily)
+        prev_value = np.where(first, 1.0, prev_value)
+        capital = prev_value.sum(axis=1)
+        returns = np.divide((prev_value * daily).sum(axis=1), capital, out=np.zeros(len(dates)), where=capital > 0)
+
+        equity = np.cumprod(1 + returns)
+        drawdown = equity / np.maximum.accumulate(equity) - 1
+
+        # Risk figures over days with exposure
+        active = returns[capital > 0]
+        excess = active - risk_free_rate / TRADING_DAYS
+        vol = float(active.std(ddof=1)) if len(active) > 1 else 0.0
+        downside = float(np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2))) if len(active) else 0.0
+        sharpe = float(excess.mean() / vol * np.sqrt(TRADING_DAYS)) if vol > 0 else 0.0
+        sortino = float(excess.mean() / downside * np.sqrt(TRADING_DAYS)) if downside > 0 else 0.0
+
+        # Sector exposure: share of current value (uncached sectors report "Unknown" until looked up)
+        current = value[-1]
+        sectors = market_service.get_sectors(tickers)
+        codes, names = pd.factorize(positions["ticker"].map(sectors))
+        sector_value = np.bincount(codes, weights=current, minlength=len(names))
+        total_value = current.sum()
+
+        result = {
+            "positions": int(len(positions)),
+            "missing": missing,
+            "start": dates[0].strftime("%Y-%m-%d"),
+            "end": dates[-1].strftime("%Y-%m-%d"),
+            "invested": int(held[-1].sum()),
+            "market_value": round(float(total_value), 4),
+            "total_return": round(float(equity[-1] - 1), 6),
+            "max_drawdown": round(float(drawdown.min()), 6),
+            "volatility": round(vol * np.sqrt(TRADING_DAYS), 6),
+            "sharpe": round(sharpe, 4),
+            "sortino": round(sortino, 4),
+            "sector_exposure": {
+                str(name): round(float(v / total_value), 4) if total_value else 0.0
+                for name, v in zip(names, sector_value)
+            },
+        }
+        if include_curve:
+            result["equity_curve"] = [
+                {"date": d.strftime("%Y-%m-%d"), "equity": round(float(e), 6), "drawdown": round(float(dd), 6)}
+                for d, e, dd in zip(dates, equity, drawdown)
+            ]
+        return result
+
+    def get_analytics(self, risk_free_rate: float = 0.0, include_curve: bool = True) -> Dict[str, Any]:
+        """Analytics for the stored virtual portfolio."""
+        return self.analyze(database_service.get_portfolio(), risk_free_rate, include_curve)
+
+
+portfolio_analytics_service = PortfolioAnalyticsService()
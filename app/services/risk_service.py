@@ -0,0 +1,129 @@
+import os
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.market_service import market_service
+from app.services.database_service import database_service
+from app.services.portfolio_analytics_service import positions_frame
+from app.services.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+MIN_OBSERVATIONS = 20 # Daily returns needed before a ticker's covariance is trusted
+
+
+class RiskService:
+    """
+    Monte Carlo Value-at-Risk / Conditional VaR for the virtual portfolio.
+
+    Daily log returns of the held tickers are modelled as multivariate normal with
+    the mean and covariance of the lookback window. Correlated horizon returns are
+    drawn as `mu * h + sqrt(h) * Z @ L.T` (L the Cholesky factor of the covariance)
+    for `batch_size` paths at a time, so memory stays bounded for large runs and
+    results depend only on the seed, not on the batch size.
+
+    Like the analytics, every position is one unit of capital at its entry price,
+    so exposures are current value per unit invested.
+    """
+    def __init__(self, batch_size: Optional[int] = None):
+        self.batch_size = batch_size or int(os.getenv("VAR_BATCH_SIZE", "50000"))
+
+    @staticmethod
+    def cholesky(cov: np.ndarray) -> np.ndarray:
+        """
+        Lower-triangular L with L @ L.T == cov. Sample covariances of short or
+        collinear histories are often only semi-definite, so a small diagonal
+        jitter is tried first, then an eigenvalue-clipped square root.
+        """
+        n = cov.shape[0]
+        scale = float(np.mean(np.diag(cov))) or 1.0
+        for jitter in (0.0, 1e-10, 1e-8, 1e-6):
+            try:
+                return np.linalg.cholesky(cov + np.eye(n) * jitter * scale)
+            except np.linalg.LinAlgError:
+                continue
+        values, vectors = np.linalg.eigh(cov)
+        return vectors * np.sqrt(np.clip(values, 0.0, None))
+
+    @traced("risk.simulate")
+    def simulate_losses(self, mu: np.ndarray, cov: np.ndarray, exposure: np.ndarray,
+                        horizon_days: int = 1, paths: int = 10000, seed: Optional[int] = None) -> np.ndarray:
+        """Portfolio loss (positive = loss) for each simulated path over the horizon."""
+        rng = np.random.default_rng(seed)
+        scaled = self.cholesky(cov).T * np.sqrt(horizon_days)
+        drift = mu * horizon_days
+        losses = np.empty(paths)
+        for start in range(0, paths, self.batch_size):
+            n = min(self.batch_size, paths - start)
+            log_returns = rng.standard_normal((n, len(mu))) @ scaled + drift
+            losses[start:start + n] = -(np.expm1(log_returns) @ exposure)
+        return losses
+
+    @staticmethod
+    def var_cvar(losses: np.ndarray, confidence: float) -> Tuple[float, float]:
+        """VaR is the `confidence` quantile of the losses, CVaR the mean loss beyond it."""
+        var = float(np.quantile(losses, confidence))
+        tail = losses[losses >= var]
+        return var, float(tail.mean()) if len(tail) else var
+
+    def portfolio_var(self, rows: List[Dict[str, Any]], horizon_days: int = 1, confidence: float = 0.95,
+                      paths: int = 10000, seed: Optional[int] = 42, period: str = "1y") -> Dict[str, Any]:
+        positions = positions_frame(rows)
+        if positions.empty:
+            return {"positions": 0, "error": "Portfolio is empty"}
+
+        tickers = sorted(positions["ticker"].unique())
+        prices = market_service.get_price_matrix(tickers, period=period).ffill()
+        returns = np.log(prices).diff().iloc[1:]
+        usable = [t for t in prices.columns if returns[t].count() >= MIN_OBSERVATIONS]
+        priced = positions["ticker"].isin(usable)
+        missing = sorted(positions.loc[~priced, "ticker"].unique())
+        positions = positions[priced]
+        if positions.empty:
+            return {"positions": 0, "missing": missing, "error": "Not enough price history for portfolio tickers"}
+
+        # One exposure per ticker: positions in the same name are perfectly correlated
+        last = prices[usable].iloc[-1]
+        exposure = (last.reindex(positions["ticker"]).to_numpy() / positions["entry_price"].to_numpy())
+        exposure = pd.Series(exposure).groupby(positions["ticker"].to_numpy()).sum().reindex(usable).to_numpy()
+
+        # Pairwise-complete moments, so one recent listing does not shorten everyone's window
+        returns = returns[usable]
+        mu = returns.mean().to_numpy()
+        cov = returns.cov().to_numpy()
+
+        losses = self.simulate_losses(mu, cov, exposure, horizon_days, paths, seed)
+        var, cvar = self.var_cvar(losses, confidence)
+        value = float(exposure.sum())
+        var_pct = var / value if value else 0.0
+        cvar_pct = cvar / value if value else 0.0
+        logger.info(f"Simulated {paths} paths x {len(usable)} tickers: "
+                    f"{confidence:.0%} {horizon_days}d VaR {var_pct:.2%}, CVaR {cvar_pct:.2%}.")
+        return {
+            "positions": int(len(positions)),
+            "tickers": len(usable),
+            "missing": missing,
+            "start": returns.index[0].strftime("%Y-%m-%d"),
+            "end": returns.index[-1].strftime("%Y-%m-%d"),
+            "observations": int(len(returns)),
+            "horizon_days": horizon_days,
+            "confidence": confidence,
+            "paths": paths,
+            "seed": seed,
+            "market_value": round(value, 4),
+            "expected_pnl": round(float(-losses.mean()), 6),
+            "var": round(var, 6),
+            "cvar": round(cvar, 6),
+            "var_pct": round(var_pct, 6),
+            "cvar_pct": round(cvar_pct, 6),
+        }
+
+    def get_portfolio_var(self, **kwargs) -> Dict[str, Any]:
+        """VaR/CVaR for the stored virtual portfolio."""
+        return self.portfolio_var(database_service.get_portfolio(), **kwargs)
+
+
+risk_service = RiskService()
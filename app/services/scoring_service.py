@@ -0,0 +1,118 @@
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from app.schemas import ScoringConfig, ScoringFeatures
+
+logger = logging.getLogger(__name__)
+
+FEATURES = ("rsi", "news_count", "news_positive", "news_negative", "news_avg_score",
+            "social_positive", "social_negative", "macd", "sentiment_index", "social_momentum")
+COMPONENTS = ("rsi", "news", "social", "macd", "sentiment_index", "social_momentum")
+LABELS = np.array(["SELL", "HOLD", "BUY"])
+
+
+def features_from_sections(market: Dict[str, Any], news_context: Dict[str, Any],
+                           social: Dict[str, Any], social_momentum: float = 0.0) -> Dict[str, float]:
+    """
+    Extracts one feature row from memo sections (the inputs of `_generate_recommendation`).
+    `social_momentum` is the `momentum` of the ticker's social sentiment series.
+    """
+    indicators = market.get("indicators", {})
+    items = news_context.get("items", [])
+    posts = social.get("data", [])
+    index = (news_context.get("sentiment_index") or {}).get("7d", {})
+    return {
+        "rsi": indicators.get("rsi", 50),
+        "news_count": len(items),
+        "news_positive": sum(1 for n in items if n["sentiment"]["label"] == "positive"),
+        "news_negative": sum(1 for n in items if n["sentiment"]["label"] == "negative"),
+        "news_avg_score": sum(n["sentiment"]["score"] for n in items) / len(items) if items else 0.0,
+        "social_positive": sum(1 for p in posts if p.get("sentiment_label") == "positive"),
+        "social_negative": sum(1 for p in posts if p.get("sentiment_label") == "negative"),
+        "macd": indicators.get("macd", 0),
+        "sentiment_index": index.get("index", 0.0),
+        "social_momentum": social_momentum,
+    }
+
+
+class ScoringService:
+    """
+    Vectorized BUY/SELL/HOLD scoring over columnar features for a whole universe.
+
+    Each rule contributes a component score; the total is compared against the
+    buy/sell thresholds. With the default ScoringConfig the result equals the
+    per-memo `_generate_recommendation` for every input.
+    """
+    def __init__(self, config: Optional[ScoringConfig] = None):
+        self.config = config or ScoringConfig()
+
+    @staticmethod
+    def to_columns(rows: Sequence[Any]) -> Dict[str, np.ndarray]:
+        """Feature rows (dicts or ScoringFeatures) -> one float array per feature."""
+        rows = [r.model_dump() if isinstance(r, ScoringFeatures) else r for r in rows]
+        defaults = ScoringFeatures(ticker="").model_dump()
+        return {
+            name: np.fromiter((row.get(name, defaults[name]) for row in rows), dtype=float, count=len(rows))
+            for name in FEATURES
+        }
+
+    def score(self, columns: Dict[str, np.ndarray], config: Optional[ScoringConfig] = None) -> Dict[str, np.ndarray]:
+        """
+        Scores columnar features. Returns the component arrays, "score" and
+        "recommendation" (array of "BUY" / "SELL" / "HOLD").
+        """
+        cfg = config or self.config
+        rsi = np.asarray(columns["rsi"], dtype=float)
+        n = rsi.shape[0]
+        col = lambda name: np.asarray(columns.get(name, np.zeros(n)), dtype=float)
+
+        # 1. RSI: oversold buys, overbought sells
+        rsi_score = np.where(rsi < cfg.rsi_oversold, cfg.rsi_weight,
+                             np.where(rsi > cfg.rsi_overbought, -cfg.rsi_weight, 0.0))
+
+        # 2. News: majority label, only when the average confidence is high enough
+        pos, neg = col("news_positive"), col("news_negative")
+        confident = (col("news_count") > 0) & (col("news_avg_score") > cfg.news_min_confidence)
+        news_score = np.where(confident & (pos > neg), cfg.news_weight,
+                              np.where(confident & (neg > pos), -cfg.news_weight, 0.0))
+
+        # 3. Social: majority label
+        social_score = cfg.social_weight * np.sign(col("social_positive") - col("social_negative"))
+
+        # 4. Optional extras (zero-weighted by default)
+        macd_score = cfg.macd_weight * np.sign(col("macd"))
+        index_score = cfg.sentiment_index_weight * col("sentiment_index")
+        momentum_score = cfg.social_momentum_weight * col("social_momentum")
+
+        # Summed in the same order as the per-memo logic so totals are bit-identical
+        total = rsi_score + news_score + social_score + macd_score + index_score + momentum_score
+        decision = np.where(total >= cfg.buy_threshold, 2, np.where(total <= cfg.sell_threshold, 0, 1))
+        return {
+            "rsi": rsi_score,
+            "news": news_score,
+            "social": social_score,
+            "macd": macd_score,
+            "sentiment_index": index_score,
+            "social_momentum": momentum_score,
+            "score": total,
+            "recommendation": LABELS[decision],
+        }
+
+    def score_rows(self, rows: Sequence[Any], config: Optional[ScoringConfig] = None) -> List[Dict[str, Any]]:
+        """Scores feature rows; one {ticker, recommendation, score, breakdown} per row, input order."""
+        if not rows:
+            return []
+        tickers = [r.ticker if isinstance(r, ScoringFeatures) else r.get("ticker") for r in rows]
+        result = self.score(self.to_columns(rows), config)
+        return [
+            {
+                "ticker": ticker,
+                "recommendation": str(result["recommendation"][i]),
+                "score": float(result["score"][i]),
+                "breakdown": {name: float(result[name][i]) for name in COMPONENTS},
+            }
+            for i, ticker in enumerate(tickers)
+        ]
+
+
+scoring_service = ScoringService()
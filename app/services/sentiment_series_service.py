@@ -0,0 +1,205 @@
+import os
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Iterable, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# One row per time bucket; volume is positive + negative + neutral
+BUCKET_DTYPE = np.dtype([
+    ("start", "i8"),
+    ("positive", "i4"),
+    ("negative", "i4"),
+    ("neutral", "i4"),
+    ("score_sum", "f8"),
+])
+
+_LABEL_FIELDS = {"positive": "positive", "negative": "negative"}
+
+TICKER_PATTERN = re.compile(r"^[A-Z0-9.\-]{1,10}$")
+
+
+class SentimentRingBuffer:
+    """
+    Fixed-capacity, array-backed ring of sentiment buckets for one ticker.
+    Slot = (bucket index % capacity); a slot is reset when a newer bucket claims it.
+    """
+    def __init__(self, interval: int, capacity: int, data: Optional[np.ndarray] = None):
+        self.interval = interval
+        self.capacity = capacity
+        if data is not None and data.shape == (capacity,) and data.dtype == BUCKET_DTYPE:
+            self.data = data
+        else:
+            self.data = np.zeros(capacity, dtype=BUCKET_DTYPE)
+            self.data["start"] = -1
+
+    def add(self, epoch: int, label: str, score: float) -> bool:
+        start = (int(epoch) // self.interval) * self.interval
+        slot = (start // self.interval) % self.capacity
+        row = self.data[slot:slot + 1]
+        if row["start"][0] > start:
+            return False # Older than the retained window
+        if row["start"][0] != start:
+            row[0] = (start, 0, 0, 0, 0.0)
+        field = _LABEL_FIELDS.get(label, "neutral")
+        row[field] += 1
+        row["score_sum"] += score
+        return True
+
+    def buckets(self, limit: Optional[int] = None) -> np.ndarray:
+        """Populated buckets in chronological order (most recent `limit`)."""
+        populated = self.data[self.data["start"] >= 0]
+        populated = np.sort(populated, order="start")
+        return populated[-limit:] if limit else populated
+
+
+class SentimentSeriesService:
+    """
+    Aggregates scored social posts into fixed-interval sentiment buckets per ticker,
+    so momentum signals can be served without re-fetching posts.
+    Keeps at most `max_tickers` buffers in memory (least recently used evicted).
+    Optionally persists each ticker's ring buffer as a `.npy` file: changed buffers
+    are written at most every `flush_interval` seconds, on eviction and on `flush()`.
+    """
+    def __init__(self, interval: int = 3600, capacity: int = 168, persist_dir: Optional[str] = None,
+                 max_tickers: int = 1024, flush_interval: Optional[float] = None):
+        self.interval = interval
+        self.capacity = capacity
+        self.persist_dir = persist_dir if persist_dir is not None else os.getenv("SOCIAL_SERIES_DIR")
+        self.max_tickers = max_tickers
+        self.flush_interval = flush_interval if flush_interval is not None else float(os.getenv("SOCIAL_SERIES_FLUSH_SECONDS", "60"))
+        self._buffers: "OrderedDict[str, SentimentRingBuffer]" = OrderedDict()
+        self._dirty: Set[str] = set()
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def _path(self, ticker: str) -> Optional[str]:
+        # The ticker becomes a file name: only plain symbols, never path components
+        if not self.persist_dir or not TICKER_PATTERN.match(ticker):
+            return None
+        return os.path.join(self.persist_dir, f"{ticker}.npy")
+
+    def _buffer(self, ticker: str, create: bool = True) -> Optional[SentimentRingBuffer]:
+        """
+        Returns the ticker's buffer, loading it from disk if needed. With
+        `create=False`, tickers without recorded or persisted data return None.
+        Caller holds `_lock`.
+        """
+        buffer = self._buffers.get(ticker)
+        if buffer is not None:
+            self._buffers.move_to_end(ticker)
+            return buffer
+
+        path = self._path(ticker)
+        exists = bool(path) and os.path.exists(path)
+        if not exists and (not create or not TICKER_PATTERN.match(ticker)):
+            return None
+
+        data = None
+        if exists:
+            try:
+                data = np.load(path, allow_pickle=False)
+            except Exception as e:
+                logger.error(f"Failed to load sentiment series for {ticker}: {e}")
+        buffer = self._buffers[ticker] = SentimentRingBuffer(self.interval, self.capacity, data)
+        while len(self._buffers) > self.max_tickers:
+            evicted, evicted_buffer = self._buffers.popitem(last=False)
+            if evicted in self._dirty:
+                self._dirty.discard(evicted)
+                self._persist(evicted, evicted_buffer.data.copy())
+        return buffer
+
+    def _persist(self, ticker: str, data: np.ndarray) -> None:
+        path = self._path(ticker)
+        if not path:
+            return
+        try:
+            os.makedirs(self.persist_dir, exist_ok=True)
+            tmp_path = f"{path}.tmp.npy"
+            np.save(tmp_path, data, allow_pickle=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Failed to persist sentiment series for {ticker}: {e}")
+
+    def flush(self) -> int:
+        """Writes every changed buffer to disk. Returns how many were written."""
+        if not self.persist_dir:
+            return 0
+        with self._flush_lock:
+            with self._lock:
+                snapshot = [(t, self._buffers[t].data.copy()) for t in self._dirty if t in self._buffers]
+                self._dirty.clear()
+                self._last_flush = time.monotonic()
+            # Disk writes happen outside the lock so recording is never blocked on I/O
+            for ticker, data in snapshot:
+                self._persist(ticker, data)
+        return len(snapshot)
+
+    def record_many(self, ticker: str, posts: Iterable[Tuple[int, str, float]]) -> int:
+        """Adds (epoch, label, score) observations. Returns how many were bucketed."""
+        ticker = ticker.upper()
+        with self._lock:
+            buffer = self._buffer(ticker)
+            if buffer is None:
+                return 0
+            added = sum(buffer.add(epoch, label, score) for epoch, label, score in posts)
+            if added and self.persist_dir:
+                self._dirty.add(ticker)
+            due = bool(self._dirty) and time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+        return added
+
+    def get_buckets(self, ticker: str) -> np.ndarray:
+        """Raw populated buckets (BUCKET_DTYPE) in chronological order."""
+        with self._lock:
+            buffer = self._buffer(ticker.upper(), create=False)
+            return buffer.buckets().copy() if buffer is not None else np.zeros(0, dtype=BUCKET_DTYPE)
+
+    def get_series(self, ticker: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Returns chronological buckets (counts by label, mean score, volume, net polarity)
+        plus a momentum figure: recent-half net polarity minus prior-half net polarity.
+        """
+        ticker = ticker.upper()
+        with self._lock:
+            buffer = self._buffer(ticker, create=False)
+            rows = buffer.buckets(limit).copy() if buffer is not None else np.zeros(0, dtype=BUCKET_DTYPE)
+
+        volume = rows["positive"] + rows["negative"] + rows["neutral"]
+        safe_volume = np.maximum(volume, 1)
+        mean_score = rows["score_sum"] / safe_volume
+        polarity = (rows["positive"] - rows["negative"]) / safe_volume
+
+        half = len(rows) // 2
+        momentum = 0.0
+        if half:
+            recent = (rows["positive"][-half:] - rows["negative"][-half:]).sum() / max(volume[-half:].sum(), 1)
+            prior = (rows["positive"][:-half] - rows["negative"][:-half]).sum() / max(volume[:-half].sum(), 1)
+            momentum = float(recent - prior)
+
+        return {
+            "ticker": ticker,
+            "interval_seconds": self.interval,
+            "momentum": round(momentum, 4),
+            "buckets": [
+                {
+                    "start": int(rows["start"][i]),
+                    "positive": int(rows["positive"][i]),
+                    "negative": int(rows["negative"][i]),
+                    "neutral": int(rows["neutral"][i]),
+                    "volume": int(volume[i]),
+                    "mean_score": round(float(mean_score[i]), 4),
+                    "net_polarity": round(float(polarity[i]), 4)
+                }
+                for i in range(len(rows))
+            ]
+        }
+
+sentiment_series_service = SentimentSeriesService()
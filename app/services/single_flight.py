@@ -0,0 +1,83 @@
+import functools
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """One in-flight computation; followers wait on `event` and share its outcome."""
+    __slots__ = ("event", "value", "error", "followers")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+def make_key(operation: str, args: tuple, kwargs: Dict[str, Any]) -> Hashable:
+    """(operation, arguments) key; falls back to repr() for unhashable arguments."""
+    key = (operation, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+        return key
+    except TypeError:
+        return (operation, repr(args), repr(sorted(kwargs.items())))
+
+
+class SingleFlight:
+    """
+    Request coalescing: while a call for a key is running, identical calls wait
+    for it and receive the same result (or exception) instead of running again.
+    Nothing is cached once the call finishes.
+    Results are shared between callers and should be treated as read-only.
+    """
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn(*args, **kwargs)
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            if call.followers:
+                logger.debug(f"Coalesced {call.followers} duplicate call(s) for {key!r:.120}")
+            call.event.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def coalesce(self, operation: str) -> Callable:
+        """Decorator: concurrent calls with identical arguments share one execution."""
+        def decorator(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                return self.do(make_key(operation, args, kwargs), fn, *args, **kwargs)
+            return wrapper
+        return decorator
+
+single_flight = SingleFlight()
@@ -1,20 +1,159 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import base64
+import bisect
+import heapq
+import itertools
+import json
 import logging
-from datetime import datetime
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
 import random
 import requests
 import re
-import xml.etree.ElementTree as ET
 from app.services.nlp_service import nlp_service
+from app.services.feed_parser import iter_atom_entries
+from app.services.trending_service import trending_service
+from app.services.sentiment_series_service import sentiment_series_service
+from app.services.ttl_cache import TTLCache
+from app.services.single_flight import single_flight
+from app.services.tracing import traced
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class SocialService:
+def _to_epoch(value: Any) -> int:
+    """
+    Normalizes a post timestamp to integer epoch seconds (UTC).
+    Handles Atom `updated` (+00:00 offsets), Stocktwits `created_at` (Z suffix) and raw epochs.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        text = str(value).strip().replace("Z", "+00:00")
+        parsed = datetime.fromisoformat(text)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp())
+    except ValueError:
+        logger.warning(f"Unparseable social timestamp: {value}")
+        return 0
+
+def _epoch_to_iso(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat()
+
+
+class SocialPostRecord:
+    """Compact, scored social post. Timestamps are stored as epoch seconds."""
+    __slots__ = ("id", "author", "handle", "content", "epoch", "sentiment_label", "sentiment_score", "source")
+
+    def __init__(self, id: str, author: str, handle: str, content: str, epoch: int,
+                 sentiment_label: str, sentiment_score: float, source: str):
+        self.id = id
+        self.author = author
+        self.handle = handle
+        self.content = content
+        self.epoch = epoch
+        self.sentiment_label = sentiment_label
+        self.sentiment_score = sentiment_score
+        self.source = source
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "author": self.author,
+            "handle": self.handle,
+            "content": self.content,
+            "timestamp": _epoch_to_iso(self.epoch),
+            "epoch": self.epoch,
+            "sentiment_score": self.sentiment_score,
+            "sentiment_label": self.sentiment_label,
+            "source": self.source
+        }
+
+
+class SourceTimeline:
+    """
+    Posts of a single (ticker, source), kept sorted newest-first, deduplicated by id
+    and bounded to `max_size` records (oldest are evicted first).
+    """
+    __slots__ = ("records", "_neg_epochs", "_ids", "max_size")
+
+    def __init__(self, max_size: int):
+        self.records: List[SocialPostRecord] = []
+        self._neg_epochs: List[int] = [] # ascending, parallel to records
+        self._ids = set()
+        self.max_size = max_size
+
+    def __contains__(self, post_id: str) -> bool:
+        return post_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, record: SocialPostRecord) -> bool:
+        if record.id in self._ids:
+            return False
+        pos = bisect.bisect_right(self._neg_epochs, -record.epoch)
+        self._neg_epochs.insert(pos, -record.epoch)
+        self.records.insert(pos, record)
+        self._ids.add(record.id)
+        while len(self.records) > self.max_size:
+            self._neg_epochs.pop()
+            self._ids.discard(self.records.pop().id)
+        return True
+
+
+class SocialCursorStore:
+    """
+    Remembers the newest post (id + timestamp) seen per (ticker, source),
+    so that each poll only has to process items newer than the cursor.
+    """
     def __init__(self):
+        self._cursors: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, ticker: str, source: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._cursors.get((ticker.upper(), source))
+            return dict(cursor) if cursor else None
+
+    def advance(self, ticker: str, source: str, post_id: str, timestamp: Any) -> None:
+        """Moves the cursor forward; older positions never overwrite newer ones."""
+        key = (ticker.upper(), source)
+        with self._lock:
+            current = self._cursors.get(key)
+            if current and timestamp < current["timestamp"]:
+                return
+            self._cursors[key] = {"id": post_id, "timestamp": timestamp}
+
+    def reset(self, ticker: Optional[str] = None) -> None:
+        with self._lock:
+            if ticker is None:
+                self._cursors.clear()
+            else:
+                for key in [k for k in self._cursors if k[0] == ticker.upper()]:
+                    del self._cursors[key]
+
+
+class SocialService:
+    def __init__(self, max_window: int = 200, max_posts_per_source: int = 10, max_tickers: int = 1024):
         # We can still have a fallback mode
         self.use_live_data = True 
+        # Incremental polling state: cursors + bounded, pre-sorted timeline per source
+        self.cursor_store = SocialCursorStore()
+        self.max_window = max_window
+        self.max_posts_per_source = max_posts_per_source
+        # ticker -> source -> timeline; least recently used tickers are evicted with their cursors
+        self.max_tickers = max_tickers
+        self._timelines: "OrderedDict[str, Dict[str, SourceTimeline]]" = OrderedDict()
+        self._window_lock = threading.Lock()
+        # Short-TTL per-ticker feed snapshots for the paginated endpoint and memos
+        self.feed_cache = TTLCache(ttl=float(os.getenv("SOCIAL_FEED_TTL_SECONDS", "60")))
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "application/json, text/plain, */*",
@@ -26,66 +165,135 @@ class SocialService:
             "Sec-Fetch-Site": "same-site"
         }
 
+    def _remember(self, ticker: str, source: str, records: List[SocialPostRecord]) -> None:
+        """
+        Adds freshly scored posts to the (ticker, source) timeline.
+        The timeline is deduplicated by post id and bounded to `max_window` entries;
+        at most `max_tickers` tickers are kept.
+        """
+        ticker = ticker.upper()
+        evicted = []
+        with self._window_lock:
+            sources = self._timelines.setdefault(ticker, {})
+            self._timelines.move_to_end(ticker)
+            timeline = sources.get(source)
+            if timeline is None:
+                timeline = sources[source] = SourceTimeline(self.max_window)
+            added = [record for record in records if timeline.add(record)]
+            while len(self._timelines) > self.max_tickers:
+                evicted.append(self._timelines.popitem(last=False)[0])
+        for old in evicted:
+            self.cursor_store.reset(old)
+
+        # Each post is counted once, when it is first stored
+        trending_service.ingest_many(((r.content, r.epoch) for r in added), hint=ticker)
+        sentiment_series_service.record_many(ticker, ((r.epoch, r.sentiment_label, r.sentiment_score) for r in added))
+
+    def _is_known(self, ticker: str, source: str, post_id: str) -> bool:
+        with self._window_lock:
+            timeline = self._timelines.get(ticker.upper(), {}).get(source)
+            return timeline is not None and post_id in timeline
+
+    def _merged_timeline(self, ticker: str, limit: Optional[int] = None) -> List[SocialPostRecord]:
+        """
+        K-way merges the pre-sorted source timelines of a ticker (newest first),
+        stopping after `limit` records.
+        """
+        with self._window_lock:
+            sources = self._timelines.get(ticker.upper())
+            if sources is None:
+                return []
+            self._timelines.move_to_end(ticker.upper())
+            timelines = [tl.records for tl in sources.values()]
+            merged = heapq.merge(*timelines, key=lambda r: r.epoch, reverse=True)
+            return list(itertools.islice(merged, limit))
+
+    @traced("social.reddit")
     def _fetch_reddit_rss(self, ticker: str) -> List[Dict[str, Any]]:
         """
         Fetches RSS feed from Reddit (WallStreetBets and Stocks) for a given ticker.
+        Only entries newer than the per-subreddit cursor (by id or timestamp) are
+        scored and returned.
         """
         posts = []
         # Searching across related subreddits
         subreddits = ["wallstreetbets", "stocks", "investing"]
         
         for sub in subreddits:
+            source = f"r/{sub}"
+            cursor = self.cursor_store.get(ticker, source)
             try:
                 # Reddit RSS search URL
+                # Not anchored with `before=`: if the cursor post is deleted Reddit returns
+                # an empty listing forever. The newest-first scan below stops at the cursor.
                 url = f"https://www.reddit.com/r/{sub}/search.rss?q={ticker}&sort=new&restrict_sr=on"
                 headers = self.headers
                 
-                response = requests.get(url, headers=headers, timeout=10)
+                response = requests.get(url, headers=headers, timeout=10, stream=True)
                 if response.status_code != 200:
                     logger.warning(f"Failed to fetch Reddit RSS for r/{sub}: {response.status_code}")
+                    response.close()
                     continue
 
-                # Parse XML
-                root = ET.fromstring(response.content)
-                # RSS namespaces
-                ns = {'atom': 'http://www.w3.org/2005/Atom'}
-                
-                for entry in root.findall('atom:entry', ns):
-                    title = entry.find('atom:title', ns).text
-                    author_elem = entry.find('atom:author/atom:name', ns)
-                    author = author_elem.text if author_elem is not None else "u/unknown"
-                    
-                    # Sentiment Analysis
-                    sentiment = nlp_service.analyze_sentiment(title)
-                    
-                    posts.append({
-                        "id": entry.find('atom:id', ns).text.split('/')[-1],
-                        "author": author,
-                        "handle": author, # No real handle in RSS, using username
-                        "content": title,
-                        "timestamp": entry.find('atom:updated', ns).text,
-                        "sentiment_score": sentiment["sentiment"]["score"],
-                        "sentiment_label": sentiment["sentiment"]["label"],
-                        "source": f"r/{sub}"
-                    })
-                    
-                    if len(posts) >= 10: break # Limit per search
+                # Stream-parse the Atom feed; reading stops once the per-source limit is hit
+                response.raw.decode_content = True
+                new_posts = []
+                try:
+                    for entry in iter_atom_entries(response.raw, limit=self.max_posts_per_source):
+                        post_id = (entry["id"] or "").split('/')[-1]
+                        epoch = _to_epoch(entry["updated"])
+                        # Feed is sorted by 'new': stop at the first already-seen entry
+                        if cursor and (post_id == cursor["id"] or epoch < cursor["timestamp"]):
+                            break
+                        title = entry["title"]
+                        if not post_id or not title or self._is_known(ticker, source, post_id):
+                            continue
+
+                        author = entry["author"] or "u/unknown"
+                        
+                        # Sentiment Analysis
+                        sentiment = nlp_service.analyze_sentiment(title)
+                        
+                        new_posts.append(SocialPostRecord(
+                            id=post_id,
+                            author=author,
+                            handle=author, # No real handle in RSS, using username
+                            content=title,
+                            epoch=epoch,
+                            sentiment_score=sentiment["sentiment"]["score"],
+                            sentiment_label=sentiment["sentiment"]["label"],
+                            source=source
+                        ))
+                finally:
+                    response.close()
+
+                if new_posts:
+                    newest = max(new_posts, key=lambda r: r.epoch)
+                    self.cursor_store.advance(ticker, source, newest.id, newest.epoch)
+                    self._remember(ticker, source, new_posts)
+                posts.extend(new_posts)
 
             except Exception as e:
                 logger.error(f"Error fetching Reddit RSS for r/{sub}: {e}")
                 
-        return sorted(posts, key=lambda x: x['timestamp'], reverse=True)
+        posts.sort(key=lambda r: r.epoch, reverse=True)
+        return [r.to_dict() for r in posts]
 
+    @traced("social.stocktwits")
     def _fetch_stocktwits(self, ticker: str) -> List[Dict[str, Any]]:
         """
         Fetches public streams from Stocktwits for a given ticker.
+        Uses the `since` parameter so only messages newer than the cursor are returned.
         """
         posts = []
+        source = "Stocktwits"
+        cursor = self.cursor_store.get(ticker, source)
         try:
             url = f"https://api.stocktwits.com/api/2/streams/symbol/{ticker}.json"
             headers = self.headers
+            params = {"since": cursor["id"]} if cursor else None
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = requests.get(url, headers=headers, params=params, timeout=10)
             if response.status_code != 200:
                 logger.warning(f"Failed to fetch Stocktwits for ${ticker}: {response.status_code}")
                 return []
@@ -94,26 +302,38 @@ class SocialService:
             messages = data.get("messages", [])
             
             for msg in messages:
+                post_id = str(msg.get("id"))
+                # Guard against APIs ignoring `since`: skip anything at or behind the cursor
+                if cursor and _is_not_newer(post_id, cursor["id"]):
+                    continue
+                if self._is_known(ticker, source, post_id):
+                    continue
+
                 content = msg.get("body", "")
                 user = msg.get("user", {})
                 
                 # Sentiment Analysis
                 sentiment = nlp_service.analyze_sentiment(content)
                 
-                posts.append({
-                    "id": str(msg.get("id")),
-                    "author": user.get("username", "unknown"),
-                    "handle": f"@{user.get('username', 'unknown')}",
-                    "content": content,
-                    "timestamp": msg.get("created_at"),
-                    "sentiment_score": sentiment["sentiment"]["score"],
-                    "sentiment_label": sentiment["sentiment"]["label"],
-                    "source": "Stocktwits"
-                })
+                posts.append(SocialPostRecord(
+                    id=post_id,
+                    author=user.get("username", "unknown"),
+                    handle=f"@{user.get('username', 'unknown')}",
+                    content=content,
+                    epoch=_to_epoch(msg.get("created_at")),
+                    sentiment_score=sentiment["sentiment"]["score"],
+                    sentiment_label=sentiment["sentiment"]["label"],
+                    source=source
+                ))
+
+            if posts:
+                newest = max(posts, key=lambda r: _numeric_id(r.id))
+                self.cursor_store.advance(ticker, source, newest.id, newest.epoch)
+                self._remember(ticker, source, posts)
         except Exception as e:
             logger.error(f"Error fetching Stocktwits for ${ticker}: {e}")
             
-        return posts
+        return [r.to_dict() for r in posts]
 
     def _get_mock_tweets(self) -> List[Dict[str, Any]]:
         """Fallback mock data."""
@@ -129,6 +349,43 @@ class SocialService:
             }
         ]
 
+    def _feed_snapshot(self, ticker: str) -> List[Dict[str, Any]]:
+        """Polls all sources incrementally and returns the full merged timeline."""
+        self._fetch_reddit_rss(ticker)
+        self._fetch_stocktwits(ticker)
+        return [r.to_dict() for r in self._merged_timeline(ticker)]
+
+    def get_feed_page(self, ticker: str, limit: int = 5, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Returns one page of the social timeline for a ticker, served from a short-TTL
+        per-ticker snapshot. Concurrent callers share a single upstream poll.
+        Pass the returned `next_cursor` to fetch the following (older) page.
+        """
+        ticker = ticker.upper()
+        if not self.use_live_data:
+            return self.get_social_feed(limit=limit)
+
+        snapshot = self.feed_cache.get_or_load(ticker, lambda: self._feed_snapshot(ticker))
+        start = _page_start(snapshot, cursor) if cursor else 0
+        page = snapshot[start:start + limit]
+        has_more = start + limit < len(snapshot)
+
+        if not snapshot:
+            return {
+                "source": "Aggregated (Empty Result)",
+                "data": self._get_mock_tweets()[:limit],
+                "summary": f"No recent social activity found for ${ticker}. Using fallback signals.",
+                "next_cursor": None
+            }
+
+        return {
+            "source": "Aggregated (Reddit + Stocktwits)",
+            "data": page,
+            "summary": f"Analyzed {len(page)} recent signals for ${ticker} from Reddit and Stocktwits.",
+            "next_cursor": _encode_cursor(page[-1]) if page and has_more else None
+        }
+
+    @single_flight.coalesce("social.get_social_feed")
     def get_social_feed(self, ticker: Optional[str] = None, limit: int = 5) -> Dict[str, Any]:
         """
         Get latest social context for a ticker from multiple sources.
@@ -136,13 +393,13 @@ class SocialService:
         if self.use_live_data and ticker:
             logger.info(f"Fetching live social data for {ticker}...")
             
+            # Incremental poll: only items newer than the cursors are fetched and scored
             reddit_posts = self._fetch_reddit_rss(ticker)
             st_posts = self._fetch_stocktwits(ticker)
+            logger.info(f"Scored {len(reddit_posts) + len(st_posts)} new social posts for {ticker}.")
             
-            all_posts = reddit_posts + st_posts
-            
-            # Sort by timestamp (both are ISO or similar string-sortable formats)
-            all_posts = sorted(all_posts, key=lambda x: str(x['timestamp']), reverse=True)
+            # Serve from the already-scored timelines, merged newest-first by epoch
+            all_posts = [r.to_dict() for r in self._merged_timeline(ticker, limit)]
             
             if not all_posts:
                 return {
@@ -163,4 +420,37 @@ class SocialService:
                 "summary": "Mock signals active."
             }
 
+def _encode_cursor(post: Dict[str, Any]) -> str:
+    raw = json.dumps([post["epoch"], post["source"], post["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def _page_start(snapshot: List[Dict[str, Any]], cursor: str) -> int:
+    """
+    Index of the first post after the cursor position. If the cursor post was
+    evicted since, resume at the first post older than it.
+    """
+    try:
+        epoch, source, post_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if isinstance(epoch, bool) or not isinstance(epoch, (int, float)) \
+            or not isinstance(source, str) or not isinstance(post_id, str):
+        raise ValueError("Invalid cursor")
+    for i, post in enumerate(snapshot):
+        if post["id"] == post_id and post["source"] == source:
+            return i + 1
+        if post["epoch"] < epoch:
+            return i
+    return len(snapshot)
+
+def _numeric_id(post_id: str) -> int:
+    try:
+        return int(post_id)
+    except (TypeError, ValueError):
+        return -1
+
+def _is_not_newer(post_id: str, cursor_id: str) -> bool:
+    """Stocktwits ids are monotonically increasing integers."""
+    return _numeric_id(post_id) <= _numeric_id(cursor_id)
+
 social_service = SocialService()
@@ -0,0 +1,221 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# JSONB columns of the memos table
+MEMO_JSON_COLUMNS = ("market_data", "social_context", "news_context")
+MEMO_COLUMNS = ("ticker", "generated_at") + MEMO_JSON_COLUMNS + ("recommendation", "analysis_summary")
+# Lightweight projection for listing memo history (no JSONB payloads)
+MEMO_SUMMARY_COLUMNS = ("id", "ticker", "generated_at", "recommendation", "analysis_summary")
+PORTFOLIO_COLUMNS = ("ticker", "entry_price", "entry_date", "recommendation")
+
+
+class StorageBackend(ABC):
+    """
+    Persistence for the `memos` and `portfolio` tables.
+    Rows are plain dicts shaped like the Supabase tables; errors are raised to the caller.
+    """
+    name = "base"
+
+    @abstractmethod
+    def insert_memos(self, rows: List[Dict[str, Any]]) -> None:
+        ...
+
+    @abstractmethod
+    def list_memos(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent memos first."""
+        ...
+
+    @abstractmethod
+    def list_memo_summaries(self, limit: int, after: Optional[Tuple[str, int]] = None,
+                            ticker: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Summary columns of memos ordered by (generated_at, id) descending, starting
+        strictly after the `after` (generated_at, id) keyset position.
+        """
+        ...
+
+    @abstractmethod
+    def get_memo(self, memo_id: int) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def upsert_portfolio(self, rows: List[Dict[str, Any]]) -> None:
+        """Inserts positions, replacing existing ones with the same ticker."""
+        ...
+
+    @abstractmethod
+    def list_portfolio(self) -> List[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def delete_portfolio(self, tickers: List[str]) -> None:
+        ...
+
+
+class SupabaseBackend(StorageBackend):
+    """Hosted Postgres through the Supabase client."""
+    name = "supabase"
+
+    def __init__(self, client):
+        self.client = client
+
+    def insert_memos(self, rows: List[Dict[str, Any]]) -> None:
+        self.client.table("memos").insert(rows[0] if len(rows) == 1 else rows).execute()
+
+    def list_memos(self, limit: int = 20) -> List[Dict[str, Any]]:
+        return self.client.table("memos").select("*").order("generated_at", desc=True).limit(limit).execute().data
+
+    def list_memo_summaries(self, limit: int, after: Optional[Tuple[str, int]] = None,
+                            ticker: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = self.client.table("memos").select(",".join(MEMO_SUMMARY_COLUMNS))
+        if ticker:
+            query = query.eq("ticker", ticker)
+        if after:
+            generated_at, memo_id = after
+            query = query.or_(f'generated_at.lt."{generated_at}",'
+                              f'and(generated_at.eq."{generated_at}",id.lt.{int(memo_id)})')
+        return query.order("generated_at", desc=True).order("id", desc=True).limit(limit).execute().data
+
+    def get_memo(self, memo_id: int) -> Optional[Dict[str, Any]]:
+        rows = self.client.table("memos").select("*").eq("id", memo_id).limit(1).execute().data
+        return rows[0] if rows else None
+
+    def upsert_portfolio(self, rows: List[Dict[str, Any]]) -> None:
+        self.client.table("portfolio").upsert(rows[0] if len(rows) == 1 else rows, on_conflict="ticker").execute()
+
+    def list_portfolio(self) -> List[Dict[str, Any]]:
+        return self.client.table("portfolio").select("*").execute().data
+
+    def delete_portfolio(self, tickers: List[str]) -> None:
+        query = self.client.table("portfolio").delete()
+        query = query.eq("ticker", tickers[0]) if len(tickers) == 1 else query.in_("ticker", tickers)
+        query.execute()
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Embedded SQLite database with the same tables, for offline use, tests and
+    benchmarks. JSONB columns are stored as JSON text. One connection is shared
+    across threads behind a lock; file databases use WAL so readers are not
+    blocked by the write-behind flusher.
+    """
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS memos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ticker TEXT NOT NULL,
+            generated_at TEXT NOT NULL,
+            market_data TEXT,
+            social_context TEXT,
+            news_context TEXT,
+            recommendation TEXT,
+            analysis_summary TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_memos_generated_at ON memos (generated_at DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_memos_ticker_generated_at ON memos (ticker, generated_at DESC, id DESC);
+        CREATE TABLE IF NOT EXISTS portfolio (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ticker TEXT NOT NULL UNIQUE,
+            entry_price REAL NOT NULL,
+            entry_date TEXT NOT NULL,
+            recommendation TEXT
+        );
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._migrate()
+            self._conn.executescript(self.SCHEMA)
+
+    def _migrate(self) -> None:
+        """Adds the `id` key to portfolio tables created without one."""
+        columns = [row["name"] for row in self._conn.execute("PRAGMA table_info(portfolio)")]
+        if columns and "id" not in columns:
+            self._conn.execute("ALTER TABLE portfolio RENAME TO portfolio_old")
+            self._conn.executescript(self.SCHEMA)
+            self._conn.execute(f"INSERT INTO portfolio ({', '.join(PORTFOLIO_COLUMNS)}) "
+                               f"SELECT {', '.join(PORTFOLIO_COLUMNS)} FROM portfolio_old")
+            self._conn.execute("DROP TABLE portfolio_old")
+
+    def _query(self, sql: str, params=()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    def _write_many(self, sql: str, params: List[tuple]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(sql, params)
+
+    @staticmethod
+    def _decode_memo(row: Dict[str, Any]) -> Dict[str, Any]:
+        for column in MEMO_JSON_COLUMNS:
+            if row.get(column) is not None:
+                row[column] = json.loads(row[column])
+        return row
+
+    def insert_memos(self, rows: List[Dict[str, Any]]) -> None:
+        params = [
+            tuple(json.dumps(row.get(c)) if c in MEMO_JSON_COLUMNS and row.get(c) is not None else row.get(c)
+                  for c in MEMO_COLUMNS)
+            for row in rows
+        ]
+        self._write_many(
+            f"INSERT INTO memos ({', '.join(MEMO_COLUMNS)}) VALUES ({', '.join('?' * len(MEMO_COLUMNS))})", params
+        )
+
+    def list_memos(self, limit: int = 20) -> List[Dict[str, Any]]:
+        rows = self._query("SELECT * FROM memos ORDER BY generated_at DESC, id DESC LIMIT ?", (limit,))
+        return [self._decode_memo(row) for row in rows]
+
+    def list_memo_summaries(self, limit: int, after: Optional[Tuple[str, int]] = None,
+                            ticker: Optional[str] = None) -> List[Dict[str, Any]]:
+        clauses, params = [], []
+        if ticker:
+            clauses.append("ticker = ?")
+            params.append(ticker)
+        if after:
+            # Row-value comparison is served by the (generated_at, id) indexes
+            clauses.append("(generated_at, id) < (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        return self._query(
+            f"SELECT {', '.join(MEMO_SUMMARY_COLUMNS)} FROM memos {where}"
+            f"ORDER BY generated_at DESC, id DESC LIMIT ?", (*params, limit)
+        )
+
+    def get_memo(self, memo_id: int) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT * FROM memos WHERE id = ?", (memo_id,))
+        return self._decode_memo(rows[0]) if rows else None
+
+    def upsert_portfolio(self, rows: List[Dict[str, Any]]) -> None:
+        updates = ", ".join(f"{c} = excluded.{c}" for c in PORTFOLIO_COLUMNS[1:])
+        self._write_many(
+            f"INSERT INTO portfolio ({', '.join(PORTFOLIO_COLUMNS)}) VALUES (?, ?, ?, ?) "
+            f"ON CONFLICT(ticker) DO UPDATE SET {updates}",
+            [tuple(row.get(c) for c in PORTFOLIO_COLUMNS) for row in rows]
+        )
+
+    def list_portfolio(self) -> List[Dict[str, Any]]:
+        return self._query("SELECT * FROM portfolio ORDER BY id")
+
+    def delete_portfolio(self, tickers: List[str]) -> None:
+        self._write_many("DELETE FROM portfolio WHERE ticker = ?", [(t,) for t in tickers])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,109 @@
+import json
+import time
+import logging
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Trace:
+    """Spans (monotonic, in ms) collected for one unit of work, e.g. one memo build."""
+    def __init__(self, name: str, **fields):
+        self.name = name
+        self.fields = fields
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Dict[str, Any]) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def timings(self) -> Dict[str, float]:
+        """Total milliseconds per span name (repeated calls are summed), plus "total"."""
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for s in self.spans:
+                totals[s["name"]] = round(totals.get(s["name"], 0.0) + s["duration_ms"], 3)
+        totals["total"] = round(self.elapsed_ms(), 3)
+        return totals
+
+    def finish(self) -> None:
+        """Emits the trace as one structured (JSON) log line."""
+        with self._lock:
+            spans = list(self.spans)
+        logger.info(json.dumps({"event": "trace", "trace": self.name, **self.fields,
+                                "total_ms": round(self.elapsed_ms(), 3), "spans": spans}))
+
+
+_current: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def start_trace(name: str, **fields) -> Iterator[Trace]:
+    """Collects every span opened in this context (and in work run via `run_in_trace`)."""
+    trace = Trace(name, **fields)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+        trace.finish()
+
+
+@contextmanager
+def span(name: str, **fields) -> Iterator[None]:
+    """Times a block; recorded on the active trace, if any, and logged at DEBUG."""
+    trace = _current.get()
+    started = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        record = {"name": name, **fields,
+                  "start_ms": round((started - trace.started) * 1000, 3) if trace else 0.0,
+                  "duration_ms": round((time.perf_counter() - started) * 1000, 3)}
+        if error:
+            record["error"] = error
+        if trace is not None:
+            trace.add(record)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps({"event": "span", "trace": trace.name if trace else None, **record}))
+
+
+def traced(name: str) -> Callable:
+    """Decorator form of `span`."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def run_in_trace(trace: Optional[Trace], fn: Callable, *args, **kwargs) -> Any:
+    """
+    Runs fn with `trace` active. Pool threads do not inherit the caller's
+    context, so work fanned out to them is submitted as
+    pool.submit(run_in_trace, trace, fn, x).
+    """
+    token = _current.set(trace)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _current.reset(token)
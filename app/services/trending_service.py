@@ -0,0 +1,167 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# $TSLA, $brk (no digits: "$100" is a price, not a ticker)
+CASHTAG_RE = re.compile(r"\$([A-Za-z]{1,5})(?![A-Za-z0-9])")
+
+
+def extract_tickers(text: str, hint: Optional[str] = None) -> List[str]:
+    """
+    Extracts the distinct tickers mentioned in a post.
+    Cashtags always count; `hint` (the ticker the post was fetched for) also counts
+    when it appears as a bare upper-case word, e.g. "TSLA earnings".
+    """
+    if not text:
+        return []
+    tickers = {m.upper() for m in CASHTAG_RE.findall(text)}
+    if hint and re.search(rf"(?<![A-Za-z$]){re.escape(hint.upper())}(?![A-Za-z])", text):
+        tickers.add(hint.upper())
+    return sorted(tickers)
+
+
+class CountMinSketch:
+    """
+    Fixed-size approximate counter. Estimates never undercount; overcount is
+    bounded by ~ e/width * total with probability 1 - exp(-depth).
+    """
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self._rows = np.arange(depth)
+
+    def _indexes(self, key: str) -> np.ndarray:
+        digest = hashlib.blake2b(key.encode(), digest_size=8 * self.depth).digest()
+        return np.frombuffer(digest, dtype=np.uint64) % np.uint64(self.width)
+
+    def add(self, key: str, count: int = 1) -> None:
+        self.table[self._rows, self._indexes(key)] += count
+
+    def estimate(self, key: str) -> int:
+        return int(self.table[self._rows, self._indexes(key)].min())
+
+    def clear(self) -> None:
+        self.table.fill(0)
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitters summary: tracks at most `capacity` keys.
+    Any key whose true count exceeds total/capacity is guaranteed to be present.
+    """
+    def __init__(self, capacity: int = 50):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+
+    def add(self, key: str, count: int = 1) -> None:
+        if key in self.counts:
+            self.counts[key] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = count
+        else:
+            victim = min(self.counts, key=self.counts.get)
+            floor = self.counts.pop(victim)
+            self.counts[key] = floor + count
+
+    def keys(self) -> Iterable[str]:
+        return self.counts.keys()
+
+    def clear(self) -> None:
+        self.counts.clear()
+
+
+class TrendingService:
+    """
+    Detects cashtags that are spiking across the social feeds.
+
+    Mentions are counted in a ring of time buckets; each bucket holds a count-min
+    sketch plus a Space-Saving top-K summary, so memory is fixed at
+    n_buckets * (depth * width + top_k) no matter how many symbols show up.
+    """
+    def __init__(self, bucket_seconds: int = 300, n_buckets: int = 24, recent_buckets: int = 3,
+                 width: int = 2048, depth: int = 4, top_k: int = 50):
+        if recent_buckets >= n_buckets:
+            raise ValueError("recent_buckets must be smaller than n_buckets")
+        self.bucket_seconds = bucket_seconds
+        self.n_buckets = n_buckets
+        self.recent_buckets = recent_buckets
+        self._sketches = [CountMinSketch(width, depth) for _ in range(n_buckets)]
+        self._heavy = [SpaceSaving(top_k) for _ in range(n_buckets)]
+        self._bucket_ids = np.full(n_buckets, -1, dtype=np.int64)
+        self._lock = threading.Lock()
+
+    def _slot(self, bucket: int) -> Optional[int]:
+        """Returns the ring slot for `bucket`, recycling it if it holds an older bucket."""
+        slot = bucket % self.n_buckets
+        current = self._bucket_ids[slot]
+        if current == bucket:
+            return slot
+        if current > bucket:
+            return None # Too old: the slot already belongs to a newer bucket
+        self._sketches[slot].clear()
+        self._heavy[slot].clear()
+        self._bucket_ids[slot] = bucket
+        return slot
+
+    def ingest(self, text: str, epoch: Optional[int] = None, hint: Optional[str] = None) -> List[str]:
+        """Counts the tickers mentioned in one post. Returns the tickers found."""
+        tickers = extract_tickers(text, hint)
+        if not tickers:
+            return []
+        bucket = int(epoch if epoch else time.time()) // self.bucket_seconds
+        with self._lock:
+            slot = self._slot(bucket)
+            if slot is None:
+                return []
+            for ticker in tickers:
+                self._sketches[slot].add(ticker)
+                self._heavy[slot].add(ticker)
+        return tickers
+
+    def ingest_many(self, posts: Iterable[Tuple[str, Optional[int]]], hint: Optional[str] = None) -> None:
+        for text, epoch in posts:
+            self.ingest(text, epoch, hint)
+
+    def get_trending(self, limit: int = 10, min_mentions: int = 2, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Ranks candidate tickers by spike score: recent mentions versus the
+        expected count from the older buckets of the window.
+        """
+        now_bucket = int(now if now is not None else time.time()) // self.bucket_seconds
+        with self._lock:
+            age = now_bucket - self._bucket_ids
+            valid = (self._bucket_ids >= 0) & (age >= 0) & (age < self.n_buckets)
+            recent_slots = np.flatnonzero(valid & (age < self.recent_buckets))
+            baseline_slots = np.flatnonzero(valid & (age >= self.recent_buckets))
+
+            candidates = set()
+            for slot in recent_slots:
+                candidates.update(self._heavy[slot].keys())
+
+            results = []
+            baseline_span = self.n_buckets - self.recent_buckets
+            for ticker in candidates:
+                recent = sum(self._sketches[s].estimate(ticker) for s in recent_slots)
+                if recent < min_mentions:
+                    continue
+                older = sum(self._sketches[s].estimate(ticker) for s in baseline_slots)
+                expected = older / baseline_span * self.recent_buckets
+                results.append({
+                    "ticker": ticker,
+                    "mentions": recent,
+                    "baseline": round(expected, 2),
+                    "spike_score": round((recent + 1) / (expected + 1), 2)
+                })
+
+        results.sort(key=lambda r: (r["spike_score"], r["mentions"]), reverse=True)
+        return results[:limit]
+
+trending_service = TrendingService()
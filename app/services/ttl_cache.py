@@ -0,0 +1,69 @@
+import time
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+from app.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Small thread-safe TTL cache with LRU eviction.
+
+    `get_or_load` shares one in-flight load between concurrent callers asking for
+    the same missing key, so a burst of identical requests triggers one upstream fetch.
+    """
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+
+    def _fresh(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            return self._fresh(key)[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        # Re-check: a previous leader may have stored the value just before we joined
+        with self._lock:
+            hit, value = self._fresh(key)
+        if hit:
+            return value
+        value = loader()
+        self.set(key, value)
+        return value
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            hit, value = self._fresh(key)
+        if hit:
+            return value
+        return self._flight.do(key, self._load, key, loader)
@@ -0,0 +1,110 @@
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    """
+    Buffers writes and hands them to `sink` in batches from a background thread.
+
+    A batch is flushed when `batch_size` items are pending or, at the latest,
+    `interval` seconds after the worker last woke up. `sink(batch)` must return
+    True on success; failed batches go back to the head of the queue and are
+    retried with exponential backoff, then dropped after `max_retries`.
+    After `shutdown()`, `put` writes through to the sink synchronously.
+    """
+    def __init__(self, sink: Callable[[List[Any]], bool], batch_size: int = 50, interval: float = 2.0,
+                 max_retries: int = 3, retry_backoff: float = 0.5, max_backlog: int = 10000,
+                 name: str = "write-behind"):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_backlog = max_backlog
+        self.name = name
+        self.dropped = 0
+        self._items: deque = deque()
+        self._failures = 0
+        self._stopped = False
+        self._thread = None
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+
+    def put(self, item: Any) -> None:
+        with self._cond:
+            if len(self._items) >= self.max_backlog:
+                self._items.popleft()
+                self.dropped += 1
+                logger.warning(f"{self.name}: backlog full, dropping oldest pending write.")
+            self._items.append(item)
+            stopped = self._stopped
+            if self._thread is None and not stopped:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            if len(self._items) >= self.batch_size:
+                self._cond.notify()
+        if stopped:
+            # No worker will pick it up any more (e.g. a request finishing during shutdown)
+            self.flush()
+
+    def backlog_size(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+    def _flush_once(self) -> bool:
+        """Writes one batch. Returns False if it failed and was requeued."""
+        with self._flush_lock:
+            with self._cond:
+                batch = [self._items.popleft() for _ in range(min(self.batch_size, len(self._items)))]
+            if not batch:
+                return True
+
+            try:
+                ok = bool(self.sink(batch))
+            except Exception as e:
+                logger.error(f"{self.name}: flush of {len(batch)} items failed: {e}")
+                ok = False
+
+            if ok:
+                self._failures = 0
+                return True
+
+            self._failures += 1
+            if self._failures > self.max_retries:
+                logger.error(f"{self.name}: dropping {len(batch)} items after {self.max_retries} retries.")
+                self.dropped += len(batch)
+                self._failures = 0
+                return True
+            with self._cond:
+                self._items.extendleft(reversed(batch))
+            return False
+
+    def flush(self) -> None:
+        """Writes everything pending, retrying failed batches with backoff."""
+        while self.backlog_size():
+            if not self._flush_once():
+                with self._cond:
+                    self._cond.wait(timeout=self.retry_backoff * 2 ** (self._failures - 1))
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._stopped and len(self._items) < self.batch_size:
+                    self._cond.wait(timeout=self.interval)
+                if self._stopped:
+                    return
+            self.flush()
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Stops the worker and drains the backlog synchronously."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self.flush()
@@ -0,0 +1,77 @@
+"""
+Microbenchmark: whole-document Atom parsing vs. streaming parsing with early exit.
+
+Usage:
+    python benchmarks/bench_feed_parser.py                 # synthetic feeds
+    python benchmarks/bench_feed_parser.py feed1.rss ...   # saved Reddit search feeds
+"""
+import io
+import os
+import sys
+import timeit
+import xml.etree.ElementTree as ET
+
+sys.path.append(os.getcwd())
+
+from app.services.feed_parser import iter_atom_entries
+
+LIMIT = 10
+NS = {'atom': 'http://www.w3.org/2005/Atom'}
+
+
+def synthetic_feed(n_entries: int) -> bytes:
+    entry = """<entry>
+      <author><name>/u/user{i}</name><uri>https://www.reddit.com/user/user{i}</uri></author>
+      <category term="stocks" label="r/stocks"/>
+      <content type="html">{body}</content>
+      <id>t3_{i}</id>
+      <link href="https://www.reddit.com/r/stocks/comments/{i}/post/"/>
+      <updated>2026-01-01T10:00:00+00:00</updated>
+      <published>2026-01-01T10:00:00+00:00</published>
+      <title>TSLA discussion thread {i}</title>
+    </entry>"""
+    body = "&lt;p&gt;" + "Lorem ipsum dolor sit amet, TSLA earnings. " * 40 + "&lt;/p&gt;"
+    entries = "".join(entry.format(i=i, body=body) for i in range(n_entries))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom"><title>search</title>'
+        f"{entries}</feed>"
+    ).encode()
+
+
+def parse_full(data: bytes):
+    """Previous implementation: build the whole tree, then find() per entry."""
+    root = ET.fromstring(data)
+    posts = []
+    for entry in root.findall('atom:entry', NS):
+        author_elem = entry.find('atom:author/atom:name', NS)
+        posts.append((
+            entry.find('atom:id', NS).text,
+            entry.find('atom:title', NS).text,
+            author_elem.text if author_elem is not None else None,
+            entry.find('atom:updated', NS).text,
+        ))
+        if len(posts) >= LIMIT:
+            break
+    return posts
+
+
+def parse_streaming(data: bytes):
+    return list(iter_atom_entries(io.BytesIO(data), limit=LIMIT))
+
+
+def bench(label: str, data: bytes, number: int = 20):
+    full = min(timeit.repeat(lambda: parse_full(data), number=number, repeat=3)) / number
+    stream = min(timeit.repeat(lambda: parse_streaming(data), number=number, repeat=3)) / number
+    print(f"{label:<28} {len(data) / 1024:>9.0f} KiB  full={full * 1000:8.2f} ms  "
+          f"streaming={stream * 1000:7.2f} ms  speedup={full / stream:6.1f}x")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            with open(path, "rb") as f:
+                bench(os.path.basename(path), f.read())
+    else:
+        for n in (25, 100, 1000, 5000):
+            bench(f"synthetic ({n} entries)", synthetic_feed(n))
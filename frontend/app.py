@@ -1,5 +1,6 @@
 import streamlit as st
 import requests
+import json
 import pandas as pd
 import plotly.express as px
 from datetime import datetime
@@ -131,14 +132,31 @@ def create_sparkline(val1, val2, label):
 st.title(f"Market Analytics: {ticker_input}")
 
 if analyze_btn or (ticker_input and "data" not in st.session_state):
-    with st.spinner(f"Aggregating cross-service signals for {ticker_input}..."):
+    # Sections are streamed as they complete, so partial results show up immediately
+    with st.status(f"Aggregating cross-service signals for {ticker_input}...", expanded=True) as status:
         try:
-            response = requests.get(f"{API_BASE_URL}/api/memo/{ticker_input}")
-            if response.status_code == 200:
-                st.session_state.data = response.json()
-            else:
-                st.error(f"Error: {response.status_code}")
+            with requests.get(f"{API_BASE_URL}/api/memo/{ticker_input}/stream", stream=True) as response:
+                if response.status_code != 200:
+                    st.error(f"Error: {response.status_code}")
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    section, payload = event.get("section"), event.get("data")
+                    if section == "market":
+                        st.write(f"📊 {payload.get('company_name')}: ${payload.get('price')} ({payload.get('change_percent')}%), RSI {payload.get('indicators', {}).get('rsi')}")
+                    elif section == "news":
+                        st.write(f"📰 News: {payload.get('overall_sentiment', 'neutral').upper()} across {len(payload.get('items', []))} headlines")
+                    elif section == "social":
+                        st.write(f"💬 Social: {payload.get('summary')}")
+                    elif section == "memo":
+                        st.session_state.data = payload
+                        status.update(label=f"Memo ready: {payload.get('recommendation')}", state="complete", expanded=False)
+                    elif section == "error":
+                        status.update(label="Memo failed", state="error")
+                        st.error(f"Error: {event.get('status')} {event.get('detail')}")
         except Exception as e:
+            status.update(label="Memo failed", state="error")
             st.error(f"Link failed: {str(e)}")
 
 if "data" in st.session_state:
@@ -244,8 +262,11 @@ if "data" in st.session_state:
                 </div>
                 """, unsafe_allow_html=True)
                 
+                # Pre-computed by the backend enrichment worker when available
+                if item.get("full_summary"):
+                    st.info(f"**AI Summary:**\n\n{item.get('full_summary')}")
                 # Checkbox-style button for summary to avoid UI clutter
-                if st.button(f"🔍 Summarize Full Article", key=f"sum_{item.get('link')[:50]}"):
+                elif st.button(f"🔍 Summarize Full Article", key=f"sum_{item.get('link')[:50]}"):
                     with st.spinner("Extracting & analyzing full article..."):
                         try:
                             s_res = requests.post(
@@ -0,0 +1,13 @@
+import numpy as np
+import pandas as pd
+
+
+def ohlcv(close, start="2024-01-01", freq="B", spread=0.0, volume=1000):
+    """
+    Daily bars in the market data provider's format (UTC index) for a close path.
+    Open equals the close; High/Low are the close +/- `spread`.
+    """
+    close = np.asarray(close, dtype=float)
+    idx = pd.date_range(start, periods=len(close), freq=freq, tz="UTC")
+    return pd.DataFrame({"Open": close, "High": close + spread, "Low": close - spread,
+                         "Close": close, "Volume": volume}, index=idx)
@@ -0,0 +1,92 @@
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from app.services.backtest_service import BacktestService
+from app.services.market_data_provider import FileProvider
+from app.services.market_service import MarketService
+from app.services.memo_service import _generate_recommendation
+from helpers import ohlcv
+
+
+class TestBacktestService(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        rng = np.random.default_rng(3)
+        for i, ticker in enumerate(["AAA", "BBB", "CCC"]):
+            close = 100 * np.exp(np.cumsum(rng.normal(0, 0.03, 300)))
+            FileProvider.write_snapshot(self.root, ticker, ohlcv(close))
+        self.market = MarketService(provider=FileProvider(self.root))
+        patcher = patch('app.services.backtest_service.market_service', self.market)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.empty = pd.DataFrame()
+        self.service = BacktestService()
+
+    def test_signals_match_memo_recommendation(self):
+        close = self.market.get_price_matrix(["AAA", "BBB", "CCC"], period="max")
+        signal = self.service.signals(close, self.service.compute_features(close))
+
+        labels = {1: "BUY", -1: "SELL", 0: "HOLD"}
+        for day in (50, 120, 299):
+            for j, ticker in enumerate(close.columns):
+                market = self.market.build_market_data(ticker, ohlcv(close[ticker].to_numpy()[:day + 1]), info={})
+                # Memo indicators are rounded to 2 decimals; skip boundary cases
+                if abs(market["indicators"]["rsi"] - 30) < 0.01 or abs(market["indicators"]["rsi"] - 70) < 0.01:
+                    continue
+                expected = _generate_recommendation(market, {"items": []}, {"data": []})
+                self.assertEqual(labels[signal[day, j]], expected, (ticker, day))
+
+    def test_metrics_offline(self):
+        result = self.service.run(["AAA", "BBB", "CCC", "MISSING"], period="max", news=self.empty, social=self.empty)
+
+        self.assertEqual(result["tickers"], ["AAA", "BBB", "CCC"])
+        self.assertEqual(result["days"], 300)
+        self.assertEqual(sum(result["signals"].values()), 900)
+        self.assertGreater(result["signals"]["BUY"], 0)
+        self.assertTrue(0 <= result["hit_rate"] <= 1)
+        self.assertTrue(-1 <= result["max_drawdown"] <= 0)
+        self.assertGreater(result["trades"], 0)
+        self.assertGreaterEqual(result["turnover"], 0)
+
+    def test_evaluate_known_path(self):
+        idx = pd.date_range("2024-01-01", periods=4, freq="D", tz="UTC")
+        close = pd.DataFrame({"A": [100.0, 110.0, 99.0, 99.0]}, index=idx)
+        signal = np.array([[1], [1], [0], [0]])
+        result = self.service.evaluate(close, signal, horizon=1)
+
+        # Long over day 1 (+10%) and day 2 (-10%)
+        self.assertAlmostEqual(result["total_return"], 1.1 * 0.9 - 1)
+        self.assertAlmostEqual(result["max_drawdown"], -0.1)
+        self.assertEqual((result["hit_rate"], result["trades"]), (0.5, 2))
+
+    def test_sentiment_events_feed_news_rule(self):
+        close = self.market.get_price_matrix(["AAA"], period="max")
+        day = close.index[200]
+        news = pd.DataFrame({"ticker": ["AAA", "AAA"], "epoch": [int(day.timestamp()) + 3600] * 2,
+                             "label": ["positive", "positive"], "score": [0.9, 0.8]})
+        features = self.service.compute_features(close, news, self.empty)
+
+        self.assertEqual(features["news_count"][200, 0], 2)
+        self.assertAlmostEqual(features["news_avg_score"][200, 0], 0.85)
+        self.assertEqual(features["news_count"].sum(), 2)
+
+    def test_social_momentum_is_day_over_day_polarity(self):
+        close = self.market.get_price_matrix(["AAA"], period="max")
+        epochs = [int(close.index[i].timestamp()) + 3600 for i in (100, 101)]
+        # Day 100: 1 negative of 2 posts; day 101: 3 positive of 4
+        social = pd.DataFrame({"ticker": ["AAA", "AAA"], "epoch": epochs,
+                               "positive": [0, 3], "negative": [1, 0], "neutral": [1, 1]})
+        momentum = self.service.compute_features(close, self.empty, social)["social_momentum"][:, 0]
+
+        self.assertAlmostEqual(momentum[100], -0.5)
+        self.assertAlmostEqual(momentum[101], 0.75 + 0.5)
+        self.assertAlmostEqual(momentum[102], -0.75)
+        self.assertEqual(momentum[0], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import numpy as np
+import pandas as pd
+from app.services.batch_memo_service import BatchMemoService
+from app.services.market_service import market_service
+from helpers import ohlcv
+
+SOCIAL = {"source": "Reddit", "data": [], "summary": "No posts"}
+
+
+def _history(n=60):
+    return ohlcv(100.0 + np.arange(n), freq="D")
+
+
+def _news(title):
+    return {"title": title, "link": f"https://x.com/{title}", "publisher": "X", "timestamp": 0,
+            "sentiment": {"label": "positive", "score": 0.9}, "summary": title}
+
+
+class TestBatchMemoService(unittest.TestCase):
+    def setUp(self):
+        self.provider = MagicMock()
+        self.provider.get_history_batch.side_effect = lambda tickers, period: {
+            t: (_history() if t != "BAD" else pd.DataFrame()) for t in tickers
+        }
+        self.provider.get_info.return_value = {"longName": "Co", "sector": "Tech"}
+
+        patches = [
+            patch('app.services.batch_memo_service.market_service.provider', self.provider),
+            patch('app.services.batch_memo_service.news_service.get_news_batch',
+                  side_effect=lambda tickers, count: {t: [_news(t)] for t in tickers}),
+            patch('app.services.batch_memo_service.social_service.get_feed_page', return_value=SOCIAL),
+            patch('app.services.batch_memo_service.news_enrichment_service.attach',
+                  side_effect=lambda ticker, items: items),
+            patch('app.services.batch_memo_service.memo_cache_service'),
+        ]
+        mocks = [p.start() for p in patches]
+        for p in patches:
+            self.addCleanup(p.stop)
+        self.news_batch = mocks[1]
+        self.cache = mocks[4]
+        market_service.info_cache.invalidate()
+        self.addCleanup(market_service.info_cache.invalidate)
+        save = patch('app.services.batch_memo_service.database_service.save_memos', return_value=True)
+        self.save_memos = save.start()
+        self.addCleanup(save.stop)
+
+    def test_shares_upstream_calls_and_persists_in_bulk(self):
+        service = BatchMemoService(chunk_size=2, persist_batch_size=2)
+        results = list(service.run(["aapl", "MSFT", "AAPL", "TSLA"], concurrency=4))
+
+        self.assertEqual(sorted(r["ticker"] for r in results), ["AAPL", "MSFT", "TSLA"])
+        self.assertTrue(all(r["status"] == "ok" for r in results))
+        # One bulk history download and one news batch per chunk, never per ticker
+        self.assertEqual(self.provider.get_history_batch.call_count, 2)
+        self.assertEqual(self.news_batch.call_count, 2)
+        self.provider.get_history.assert_not_called()
+        # Persisted as a batch of two plus the remainder
+        self.assertEqual([len(c.args[0]) for c in self.save_memos.call_args_list], [2, 1])
+        self.assertEqual(self.cache.put.call_count, 3)
+
+        memo = next(r["memo"] for r in results if r["ticker"] == "MSFT")
+        self.assertEqual(memo.market_data.price, 159.0)
+        self.assertEqual(memo.news_context.items[0].title, "MSFT")
+
+    def test_fundamentals_come_from_info_cache(self):
+        service = BatchMemoService()
+        list(service.run(["AAPL", "MSFT"], persist=False))
+        list(service.run(["AAPL", "MSFT"], persist=False))
+        self.assertEqual(self.provider.get_info.call_count, 2)
+
+    def test_failed_ticker_reported_without_stopping_the_job(self):
+        service = BatchMemoService()
+        results = {r["ticker"]: r for r in service.run(["AAPL", "BAD"], persist=False)}
+
+        self.assertEqual(results["AAPL"]["status"], "ok")
+        self.assertEqual(results["BAD"]["status"], "error")
+        self.assertIn("not found", results["BAD"]["detail"])
+        self.save_memos.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from app.services.correlation_service import CorrelationService
+
+
+def _prices(n_days=120, seed=2):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2024-01-01", periods=n_days, freq="B", tz="UTC")
+    market = rng.normal(0, 0.01, n_days)
+    frame = {
+        "AAA": market + rng.normal(0, 0.002, n_days),
+        "BBB": market + rng.normal(0, 0.002, n_days),
+        "CCC": rng.normal(0, 0.01, n_days),
+    }
+    prices = pd.DataFrame({t: 100 * np.exp(np.cumsum(r)) for t, r in frame.items()}, index=idx)
+    prices["NEW"] = np.nan
+    prices.iloc[-30:, prices.columns.get_loc("NEW")] = 10.0
+    return prices
+
+
+class TestCorrelationService(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('app.services.correlation_service.market_service')
+        self.market = patcher.start()
+        self.addCleanup(patcher.stop)
+        prices = _prices()
+        self.market.get_price_matrix.side_effect = lambda tickers, period: prices[[t for t in tickers if t in prices]]
+        self.service = CorrelationService()
+
+    def test_sample_matrices(self):
+        result = self.service.compute(["ccc", "AAA", "BBB", "NEW"], shrinkage=False, annualize=False)
+
+        self.assertEqual((result["tickers"], result["missing"]), (["AAA", "BBB", "CCC"], ["NEW"]))
+        corr, cov = np.array(result["correlation"]), np.array(result["covariance"])
+        returns = np.log(_prices()[["AAA", "BBB", "CCC"]]).diff().dropna()
+        np.testing.assert_allclose(corr, returns.corr().to_numpy(), atol=1e-4)
+        np.testing.assert_allclose(cov, returns.cov().to_numpy(), atol=1e-8)
+        self.assertGreater(corr[0, 1], 0.9)
+        self.assertLess(abs(corr[0, 2]), 0.3)
+        self.assertIsNone(result["shrinkage"])
+
+    def test_ledoit_wolf_shrinks_toward_target(self):
+        sample = self.service.compute(["AAA", "BBB", "CCC"], shrinkage=False)
+        shrunk = self.service.compute(["AAA", "BBB", "CCC"])
+
+        self.assertTrue(0 < shrunk["shrinkage"] <= 1)
+        self.assertLess(abs(shrunk["correlation"][0][1]), abs(sample["correlation"][0][1]))
+        np.testing.assert_allclose(np.diag(shrunk["correlation"]), 1.0)
+
+    def test_defaults_to_portfolio_tickers(self):
+        with patch('app.services.correlation_service.database_service') as db:
+            db.get_portfolio.return_value = [{"ticker": "AAA"}, {"ticker": "BBB"}]
+            result = self.service.compute_for(None)
+        self.market.get_price_matrix.assert_called_with(["AAA", "BBB"], period="1y")
+        self.assertEqual(result["tickers"], ["AAA", "BBB"])
+
+    def test_not_enough_history(self):
+        self.assertIn("error", self.service.compute(["AAA", "NEW"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
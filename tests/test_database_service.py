@@ -10,6 +10,7 @@ import unittest
 from unittest.mock import MagicMock, patch, PropertyMock
 from datetime import datetime
 from app.services.database_service import DatabaseService
+from app.services.storage_backend import SupabaseBackend
 from app.schemas import InvestmentMemo, PortfolioItem, MarketData, SocialContext, NewsContext
 
 
@@ -49,6 +50,7 @@ class TestDatabaseServiceInit(unittest.TestCase):
                 'real-key'
             )
             self.assertIsNotNone(service.client)
+            self.assertIsInstance(service.backend, SupabaseBackend)
 
     @patch.dict('os.environ', {
         'SUPABASE_URL': 'https://real-project.supabase.co',
@@ -70,6 +72,7 @@ class TestDatabaseServiceMemos(unittest.TestCase):
         self.mock_client = MagicMock()
         self.service = DatabaseService.__new__(DatabaseService)
         self.service.client = self.mock_client
+        self.service._backend = SupabaseBackend(self.mock_client)
         self.service.url = "https://test.supabase.co"
         self.service.key = "test-key"
 
@@ -109,6 +112,7 @@ class TestDatabaseServiceMemos(unittest.TestCase):
     def test_save_memo_no_client(self):
         """Test save_memo returns False when client is None."""
         self.service.client = None
+        self.service._backend = None
         result = self.service.save_memo(self.sample_memo)
         self.assertFalse(result)
 
@@ -139,6 +143,7 @@ class TestDatabaseServiceMemos(unittest.TestCase):
     def test_get_all_memos_no_client(self):
         """Test get_all_memos returns empty list when no client."""
         self.service.client = None
+        self.service._backend = None
         result = self.service.get_all_memos()
         self.assertEqual(result, [])
 
@@ -149,6 +154,41 @@ class TestDatabaseServiceMemos(unittest.TestCase):
         self.assertEqual(result, [])
 
 
+    def test_get_memo_history_keyset_query(self):
+        """Test memo history selects summary columns and filters past the cursor."""
+        mock_table = MagicMock()
+        self.mock_client.table.return_value = mock_table
+        for method in ("select", "eq", "or_", "order", "limit"):
+            getattr(mock_table, method).return_value = mock_table
+        mock_table.execute.return_value = MagicMock(data=[
+            {"id": 9, "ticker": "AAPL", "generated_at": "2026-01-02T10:00:00"},
+            {"id": 7, "ticker": "AAPL", "generated_at": "2026-01-01T10:00:00"},
+        ])
+
+        first = self.service.get_memo_history(limit=1, ticker="aapl")
+        self.assertEqual([m["id"] for m in first["data"]], [9])
+        self.assertNotIn("*", mock_table.select.call_args[0][0])
+        mock_table.eq.assert_called_once_with("ticker", "AAPL")
+        mock_table.limit.assert_called_once_with(2)
+
+        self.service.get_memo_history(limit=1, cursor=first["next_cursor"])
+        mock_table.or_.assert_called_once_with(
+            'generated_at.lt."2026-01-02T10:00:00",and(generated_at.eq."2026-01-02T10:00:00",id.lt.9)'
+        )
+
+    def test_get_memo_by_id_not_found(self):
+        """Test get_memo_by_id returns None for unknown ids or without a client."""
+        mock_table = MagicMock()
+        self.mock_client.table.return_value = mock_table
+        for method in ("select", "eq", "limit"):
+            getattr(mock_table, method).return_value = mock_table
+        mock_table.execute.return_value = MagicMock(data=[])
+        self.assertIsNone(self.service.get_memo_by_id(1))
+        self.service.client = None
+        self.service._backend = None
+        self.assertIsNone(self.service.get_memo_by_id(1))
+
+
 class TestDatabaseServicePortfolio(unittest.TestCase):
     """Test portfolio-related database operations."""
 
@@ -157,6 +197,7 @@ class TestDatabaseServicePortfolio(unittest.TestCase):
         self.mock_client = MagicMock()
         self.service = DatabaseService.__new__(DatabaseService)
         self.service.client = self.mock_client
+        self.service._backend = SupabaseBackend(self.mock_client)
         self.service.url = "https://test.supabase.co"
         self.service.key = "test-key"
 
@@ -205,6 +246,7 @@ class TestDatabaseServicePortfolio(unittest.TestCase):
     def test_save_to_portfolio_no_client(self):
         """Test save_to_portfolio returns False when no client."""
         self.service.client = None
+        self.service._backend = None
         result = self.service.save_to_portfolio(self.sample_item)
         self.assertFalse(result)
 
@@ -233,6 +275,7 @@ class TestDatabaseServicePortfolio(unittest.TestCase):
     def test_get_portfolio_no_client(self):
         """Test get_portfolio returns empty list when no client."""
         self.service.client = None
+        self.service._backend = None
         result = self.service.get_portfolio()
         self.assertEqual(result, [])
 
@@ -259,6 +302,7 @@ class TestDatabaseServicePortfolio(unittest.TestCase):
     def test_remove_from_portfolio_no_client(self):
         """Test remove_from_portfolio returns False when no client."""
         self.service.client = None
+        self.service._backend = None
         result = self.service.remove_from_portfolio("AAPL")
         self.assertFalse(result)
 
@@ -0,0 +1,65 @@
+import io
+import unittest
+from app.services.feed_parser import iter_atom_entries
+
+
+def _feed(n):
+    entries = "".join(
+        f"""<entry>
+              <author><name>/u/user{i}</name><uri>https://www.reddit.com/user/user{i}</uri></author>
+              <content type="html">&lt;p&gt;{'body ' * 50}&lt;/p&gt;</content>
+              <id>t3_{i}</id>
+              <link href="https://www.reddit.com/r/stocks/comments/{i}/"/>
+              <updated>2026-01-01T10:{i % 60:02d}:00+00:00</updated>
+              <title>Post {i}</title>
+            </entry>"""
+        for i in range(n)
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <id>/r/stocks/search.rss</id><title>search results</title><updated>2026-01-02T00:00:00+00:00</updated>
+  {entries}
+</feed>""".encode()
+
+
+class CountingStream(io.BytesIO):
+    """Tracks how many bytes the parser actually pulled from the stream."""
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+class TestFeedParser(unittest.TestCase):
+    def test_extracts_entry_fields_only(self):
+        entries = list(iter_atom_entries(io.BytesIO(_feed(2))))
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(entries[0], {
+            "id": "t3_0",
+            "title": "Post 0",
+            "author": "/u/user0",
+            "updated": "2026-01-01T10:00:00+00:00",
+        })
+
+    def test_feed_level_fields_are_ignored(self):
+        entries = list(iter_atom_entries(io.BytesIO(_feed(1))))
+        self.assertNotEqual(entries[0]["id"], "/r/stocks/search.rss")
+
+    def test_stops_reading_after_limit(self):
+        data = _feed(2000)
+        stream = CountingStream(data)
+        entries = list(iter_atom_entries(stream, limit=10))
+        self.assertEqual(len(entries), 10)
+        self.assertLess(stream.bytes_read, len(data) // 10)
+
+    def test_zero_limit_reads_nothing(self):
+        stream = CountingStream(_feed(5))
+        self.assertEqual(list(iter_atom_entries(stream, limit=0)), [])
+        self.assertEqual(stream.bytes_read, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from app.services.market_data_provider import FileProvider, YFinanceProvider, get_default_provider
+from app.services.market_service import MarketService
+from app.services.news_service import NewsService
+from helpers import ohlcv
+
+
+def _history(n=260):
+    return ohlcv(100.0 + np.cumsum(np.sin(np.arange(n) / 5.0)), start="2025-01-01", spread=1.0)
+
+
+class TestFileProvider(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        FileProvider.write_snapshot(
+            self.root, "aapl", _history(),
+            info={"longName": "Apple Inc", "sector": "Technology"},
+            news=[{"title": "Apple beats", "link": "https://example.com/a", "providerPublishTime": 1}]
+        )
+        self.provider = FileProvider(self.root)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_history_round_trip_and_period(self):
+        full = self.provider.get_history("AAPL", period="max")
+        self.assertEqual(len(full), 260)
+        self.assertIsInstance(full.index, pd.DatetimeIndex)
+        month = self.provider.get_history("AAPL", period="1mo")
+        self.assertTrue(15 <= len(month) <= 23)
+        self.assertEqual(month.index[-1], full.index[-1])
+
+    def test_missing_ticker(self):
+        self.assertTrue(self.provider.get_history("NOPE").empty)
+        self.assertEqual(self.provider.get_info("NOPE"), {})
+        self.assertEqual(self.provider.get_news("NOPE"), [])
+
+    def test_quotes(self):
+        quotes = self.provider.get_quotes(["AAPL", "NOPE"])
+        self.assertEqual(list(quotes), ["AAPL"])
+        self.assertAlmostEqual(quotes["AAPL"], self.provider.get_history("AAPL", "max")["Close"].iloc[-1])
+
+    def test_services_run_offline(self):
+        market = MarketService(provider=self.provider).get_ticker_data("AAPL")
+        self.assertEqual(market["company_name"], "Apple Inc")
+        self.assertNotEqual(market["indicators"]["sma_200"], 0)
+
+        with patch('app.services.news_service.nlp_service') as mock_nlp:
+            mock_nlp.analyze_sentiment.return_value = {"sentiment": {"label": "positive", "score": 0.9}}
+            news = NewsService(provider=self.provider).get_ticker_news("AAPL")
+        self.assertEqual(news[0]["title"], "Apple beats")
+
+    @patch.dict('os.environ', {'MARKET_DATA_PROVIDER': 'file', 'MARKET_DATA_DIR': '/tmp/snapshots'})
+    def test_env_selection(self):
+        provider = get_default_provider()
+        self.assertIsInstance(provider, FileProvider)
+        self.assertEqual(provider.root, '/tmp/snapshots')
+
+
+class TestYFinanceProvider(unittest.TestCase):
+    @patch('app.services.market_data_provider.yf.download')
+    def test_history_batch_uses_one_download(self, mock_download):
+        frames = {t: _history(5) for t in ("AAPL", "MSFT")}
+        mock_download.return_value = pd.concat(frames, axis=1)
+
+        quotes = YFinanceProvider().get_quotes(["aapl", "MSFT"])
+
+        mock_download.assert_called_once()
+        self.assertEqual(set(quotes), {"AAPL", "MSFT"})
+
+if __name__ == "__main__":
+    unittest.main()
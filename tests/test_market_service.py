@@ -1,3 +1,4 @@
+import threading
 import unittest
 from unittest.mock import MagicMock, patch
 import pandas as pd
@@ -52,5 +53,30 @@ class TestMarketService(unittest.TestCase):
         result = self.service.get_ticker_data("INVALID")
         self.assertIn("error", result)
 
+    def test_get_quotes_bulk_and_cached(self):
+        """Test that missing quotes are fetched in one request and then served from cache."""
+        provider = MagicMock()
+        provider.get_quotes.side_effect = lambda tickers: {t: 10.0 for t in tickers if t != "NONE"}
+        service = MarketService(provider=provider)
+
+        self.assertEqual(service.get_quotes(["aapl", "MSFT", "NONE"]), {"AAPL": 10.0, "MSFT": 10.0})
+        provider.get_quotes.assert_called_once_with(["AAPL", "MSFT", "NONE"])
+
+        self.assertEqual(service.get_quotes(["AAPL", "TSLA"]), {"AAPL": 10.0, "TSLA": 10.0})
+        provider.get_quotes.assert_called_with(["TSLA"])
+
+    def test_get_sectors_does_not_wait_for_uncached_info(self):
+        """Test that uncached sectors report Unknown and are filled in the background."""
+        release = threading.Event()
+        provider = MagicMock()
+        provider.get_info.side_effect = lambda t: release.wait(2) and {"sector": "Tech"}
+        service = MarketService(provider=provider)
+
+        self.assertEqual(service.get_sectors(["aapl", "MSFT"]), {"AAPL": "Unknown", "MSFT": "Unknown"})
+        release.set()
+        service._info_pool.shutdown(wait=True)
+        self.assertEqual(service.get_sectors(["AAPL", "MSFT"]), {"AAPL": "Tech", "MSFT": "Tech"})
+        self.assertEqual(provider.get_info.call_count, 2)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,106 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from app.schemas import InvestmentMemo
+from app.services.memo_cache_service import MemoCacheService
+
+
+def _memo(ticker, version):
+    return InvestmentMemo(ticker=ticker, generated_at=str(version), analysis_summary=f"v{version}")
+
+
+class FakeBuilder:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self, ticker):
+        with self.lock:
+            self.calls += 1
+            version = self.calls
+        time.sleep(self.delay)
+        return _memo(ticker, version)
+
+
+class TestMemoCacheService(unittest.TestCase):
+    def setUp(self):
+        self.clock = [1000.0]
+        patcher = patch('app.services.memo_cache_service.time.monotonic', side_effect=lambda: self.clock[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.builder = FakeBuilder()
+        self.cache = MemoCacheService(self.builder, ttl=60, max_stale=600)
+
+    def _wait_for_refresh(self):
+        for _ in range(200):
+            if self.cache.stats()["refreshing"] == 0:
+                return
+            time.sleep(0.005)
+
+    def test_miss_then_fresh_hit(self):
+        memo, age, status = self.cache.get("tsla")
+        self.assertEqual((memo.analysis_summary, status), ("v1", "miss"))
+        self.clock[0] += 30
+        memo, age, status = self.cache.get("TSLA")
+        self.assertEqual((memo.analysis_summary, status, age), ("v1", "fresh", 30))
+        self.assertEqual(self.builder.calls, 1)
+
+    def test_stale_served_immediately_and_refreshed(self):
+        self.cache.get("AAPL")
+        self.clock[0] += 120
+        memo, age, status = self.cache.get("AAPL")
+        self.assertEqual((memo.analysis_summary, status), ("v1", "stale"))
+        self._wait_for_refresh()
+        memo, age, status = self.cache.get("AAPL")
+        self.assertEqual((memo.analysis_summary, status), ("v2", "fresh"))
+        self.assertEqual(self.builder.calls, 2)
+
+    def test_expired_entry_rebuilds_inline(self):
+        self.cache.get("MSFT")
+        self.clock[0] += 601
+        memo, _, status = self.cache.get("MSFT")
+        self.assertEqual((memo.analysis_summary, status), ("v2", "miss"))
+
+    def test_peek_never_builds(self):
+        self.assertIsNone(self.cache.peek("tsla"))
+        self.cache.put("tsla", _memo("TSLA", 0))
+        self.clock[0] += 120
+        memo, age, status = self.cache.peek("TSLA")
+        self.assertEqual((memo.analysis_summary, age, status), ("v0", 120, "stale"))
+        self._wait_for_refresh()
+        self.assertEqual(self.builder.calls, 1)
+        self.clock[0] += 1000
+        self.assertIsNone(self.cache.peek("TSLA"))
+
+    def test_refresh_failure_keeps_stale_entry(self):
+        self.cache.get("GME")
+        self.cache.builder = lambda t: (_ for _ in ()).throw(RuntimeError("upstream down"))
+        self.clock[0] += 120
+        self.cache.get("GME")
+        self._wait_for_refresh()
+        memo, _, status = self.cache.get("GME")
+        self.assertEqual((memo.analysis_summary, status), ("v1", "stale"))
+
+    def test_warm_hit_is_fast(self):
+        self.cache.get("NVDA")
+        start = time.perf_counter()
+        for _ in range(100):
+            self.cache.get("NVDA")
+        self.assertLess((time.perf_counter() - start) / 100, 0.01)
+
+
+class TestMemoCacheConcurrency(unittest.TestCase):
+    def test_concurrent_misses_share_one_build(self):
+        builder = FakeBuilder(delay=0.05)
+        cache = MemoCacheService(builder, ttl=60, max_stale=600)
+        threads = [threading.Thread(target=cache.get, args=("TSLA",)) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(builder.calls, 1)
+
+if __name__ == "__main__":
+    unittest.main()
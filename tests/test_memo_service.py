@@ -0,0 +1,152 @@
+import threading
+import unittest
+from unittest.mock import patch
+import numpy as np
+from app.services.memo_service import MemoService, TickerNotFoundError
+from app.services.market_service import market_service
+from helpers import ohlcv
+
+MARKET = {"ticker": "AAPL", "price": 150.0, "change_percent": 1.0, "volume": 100,
+          "indicators": {"rsi": 25.0, "sma_50": 0, "sma_200": 0, "macd": 0},
+          "company_name": "Apple", "sector": "Tech", "summary": ""}
+NEWS = {"items": [], "overall_sentiment": "neutral", "average_score": 0.5}
+SOCIAL = {"source": "Reddit", "data": [], "summary": "Quiet"}
+
+
+def _post(post_id):
+    return {"id": post_id, "author": "a", "handle": "a", "content": "AAPL", "timestamp": "2026-01-01 10:00",
+            "sentiment_label": "neutral", "sentiment_score": 0.5, "source": "Stocktwits"}
+
+
+class TestMemoSections(unittest.TestCase):
+    def setUp(self):
+        self.service = MemoService(max_workers=4)
+        self.release = threading.Event()
+
+        def slow_news(ticker):
+            self.release.wait(2)
+            return NEWS
+
+        patches = [
+            patch.object(self.service, 'fetch_market', return_value=MARKET),
+            patch.object(self.service, 'fetch_social', return_value=SOCIAL),
+            patch.object(self.service, 'fetch_news', side_effect=slow_news),
+            patch.object(self.service, 'persist'),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_sections_stream_before_slowest_completes(self):
+        stream = self.service.iter_sections("AAPL")
+        first = {next(stream)[0], next(stream)[0]}
+        # market and social are emitted while news is still pending
+        self.assertEqual(first, {"market", "social"})
+
+        self.release.set()
+        self.assertEqual(next(stream)[0], "news")
+        name, memo = next(stream)
+        self.assertEqual((name, memo.recommendation), ("memo", "BUY"))
+        self.assertIn("memo.assemble", memo.timings)
+        self.service.persist.assert_called_once_with(memo)
+
+    def test_build_memo_returns_final_memo(self):
+        self.release.set()
+        memo = self.service.build_memo("AAPL", persist=False)
+        self.assertEqual(memo.ticker, "AAPL")
+        self.service.persist.assert_not_called()
+
+    def test_missing_ticker_raises_from_stream(self):
+        self.release.set()
+        self.service.fetch_market.side_effect = TickerNotFoundError("Ticker ZZZZ not found")
+        with self.assertRaises(TickerNotFoundError):
+            list(self.service.iter_sections("ZZZZ"))
+
+
+def _history(last_close):
+    close = np.linspace(100, 120, 60)
+    close[-1] = last_close
+    return ohlcv(close, freq="D")
+
+
+RAW_NEWS = [{"uuid": "n1", "title": "Apple beats", "link": "https://x.com/1", "providerPublishTime": 1}]
+SCORED_NEWS = [{"title": "Apple beats", "link": "https://x.com/1", "publisher": "X", "timestamp": 1,
+                "sentiment": {"label": "positive", "score": 0.9}, "summary": "Apple beats"}]
+
+
+class TestIncrementalRegeneration(unittest.TestCase):
+    def setUp(self):
+        self.service = MemoService(max_workers=4)
+        self.history = _history(120.0)
+        self.raw_news = list(RAW_NEWS)
+        self.social = {**SOCIAL, "data": [_post("100")]}
+
+        targets = {
+            "history": patch('app.services.memo_service.market_service.get_history', side_effect=lambda t: self.history),
+            "info": patch('app.services.market_service.market_service.provider'),
+            "raw_news": patch('app.services.memo_service.news_service.fetch_raw_news', side_effect=lambda t: self.raw_news),
+            "score": patch('app.services.memo_service.news_service.score_news', return_value=SCORED_NEWS),
+            "social": patch('app.services.memo_service.social_service.get_feed_page', side_effect=lambda **kw: self.social),
+            "attach": patch('app.services.memo_service.news_enrichment_service.attach', side_effect=lambda t, items: items),
+            "rec": patch('app.services.memo_service._generate_recommendation', return_value="HOLD"),
+        }
+        self.mocks = {}
+        for name, p in targets.items():
+            self.mocks[name] = p.start()
+            self.addCleanup(p.stop)
+        self.mocks["info"].get_info.return_value = {"longName": "Apple", "sector": "Tech"}
+        market_service.info_cache.invalidate()
+        self.addCleanup(market_service.info_cache.invalidate)
+
+    def test_unchanged_inputs_reuse_every_section(self):
+        first = self.service.build_memo("AAPL", persist=False)
+        second = self.service.build_memo("AAPL", persist=False)
+
+        self.assertEqual(second.market_data, first.market_data)
+        self.assertEqual(self.mocks["info"].get_info.call_count, 1)
+        self.assertEqual(self.mocks["score"].call_count, 1)
+        self.assertEqual(self.mocks["rec"].call_count, 1)
+
+    def test_price_move_recomputes_market_and_recommendation_only(self):
+        self.service.build_memo("AAPL", persist=False)
+        self.history = _history(125.0)
+        memo = self.service.build_memo("AAPL", persist=False)
+
+        self.assertEqual(memo.market_data.price, 125.0)
+        self.assertEqual(memo.market_data.company_name, "Apple")
+        # Fundamentals come from the info cache, headlines are not rescored
+        self.assertEqual(self.mocks["info"].get_info.call_count, 1)
+        self.assertEqual(self.mocks["score"].call_count, 1)
+        self.assertEqual(self.mocks["rec"].call_count, 2)
+
+    def test_new_headlines_and_posts_are_recomputed(self):
+        self.service.build_memo("AAPL", persist=False)
+        self.raw_news = [{"uuid": "n2", "title": "New"}] + RAW_NEWS
+        self.social = {**SOCIAL, "data": [_post("101")]}
+        memo = self.service.build_memo("AAPL", persist=False)
+
+        self.assertEqual(memo.social_context.data[0].id, "101")
+
+        self.assertEqual(self.mocks["score"].call_count, 2)
+        self.assertEqual(self.mocks["rec"].call_count, 2)
+
+    def test_expired_fundamentals_are_refreshed(self):
+        self.service.build_memo("AAPL", persist=False)
+        self.history = _history(125.0)
+        self.mocks["info"].get_info.return_value = {"longName": "Apple Inc.", "sector": "Tech"}
+        with patch.object(market_service.info_cache, "ttl", -1):
+            memo = self.service.build_memo("AAPL", persist=False)
+
+        self.assertEqual(memo.market_data.company_name, "Apple Inc.")
+        self.assertEqual(self.mocks["info"].get_info.call_count, 2)
+
+    def test_forget_forces_full_rebuild(self):
+        self.service.build_memo("AAPL", persist=False)
+        self.service.forget("aapl")
+        self.service.build_memo("AAPL", persist=False)
+        self.assertEqual(self.mocks["score"].call_count, 2)
+        self.assertEqual(self.mocks["rec"].call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
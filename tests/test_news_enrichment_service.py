@@ -0,0 +1,69 @@
+import time
+import threading
+import unittest
+from unittest.mock import patch
+from app.services.news_enrichment_service import NewsEnrichmentService
+
+
+class TestNewsEnrichmentService(unittest.TestCase):
+    def setUp(self):
+        self.service = NewsEnrichmentService(workers=1)
+        self.items = [
+            {"title": "A", "link": "https://example.com/a"},
+            {"title": "B", "link": "https://example.com/b"},
+        ]
+
+    def tearDown(self):
+        self.service.shutdown()
+
+    def test_untracked_ticker_is_ignored(self):
+        self.assertEqual(self.service.enqueue("AAPL", self.items), 0)
+
+    @patch('app.services.news_enrichment_service.nlp_service')
+    @patch('app.services.news_enrichment_service.news_scraper_service')
+    def test_background_summaries_are_attached_later(self, mock_scraper, mock_nlp):
+        # Hold the worker until the first attach has returned
+        release = threading.Event()
+        mock_scraper.scrape_article.side_effect = lambda url: release.wait(2) and f"Full text of {url}"
+        mock_nlp.summarize.side_effect = lambda text: f"Summary: {text}"
+
+        first = self.service.attach("aapl", self.items)
+        self.assertIsNone(first[0]["full_summary"])
+        self.assertNotIn("full_summary", self.items[0])
+
+        release.set()
+        self.service.wait_idle()
+        second = self.service.attach("AAPL", self.items)
+        self.assertEqual(second[0]["full_summary"], "Summary: Full text of https://example.com/a")
+        self.assertEqual(mock_scraper.scrape_article.call_count, 2)
+
+    @patch('app.services.news_enrichment_service.nlp_service')
+    @patch('app.services.news_enrichment_service.news_scraper_service')
+    def test_failed_scrape_is_not_retried(self, mock_scraper, mock_nlp):
+        mock_scraper.scrape_article.return_value = None
+        self.service.track("TSLA")
+        self.service.enqueue("TSLA", self.items[:1])
+        self.service.wait_idle()
+        self.assertEqual(self.service.enqueue("TSLA", self.items[:1]), 0)
+        mock_nlp.summarize.assert_not_called()
+
+    def test_tracked_tickers_are_bounded(self):
+        service = NewsEnrichmentService(workers=1, max_tracked=2, track_ttl=60)
+        for ticker in ("AAPL", "MSFT", "TSLA"):
+            service.track(ticker)
+        self.assertFalse(service.is_tracked("AAPL"))
+        self.assertTrue(service.is_tracked("TSLA"))
+
+        service.track_ttl = 0
+        time.sleep(0.01)
+        self.assertFalse(service.is_tracked("TSLA"))
+        self.assertEqual(len(service._tracked), 1)
+
+    def test_enqueue_after_shutdown_is_noop(self):
+        self.service.track("AAPL")
+        self.service.shutdown()
+        self.assertEqual(self.service.enqueue("AAPL", self.items), 0)
+        self.assertEqual(self.service._threads, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from app.services.news_sentiment_index_service import NewsSentimentIndexService, signed_polarity
+
+NOW = 1_700_000_000
+HOUR = 3600
+
+
+def _item(title, label, score, hours_ago):
+    return {
+        "title": title,
+        "link": f"https://example.com/{title}",
+        "timestamp": NOW - int(hours_ago * HOUR),
+        "sentiment": {"label": label, "score": score},
+    }
+
+
+class TestNewsSentimentIndex(unittest.TestCase):
+    def setUp(self):
+        self.service = NewsSentimentIndexService(windows={"1d": (24 * HOUR, 6 * HOUR), "7d": (7 * 24 * HOUR, 48 * HOUR)})
+
+    def test_signed_polarity(self):
+        self.assertEqual(signed_polarity({"label": "positive", "score": 0.9}), 0.9)
+        self.assertEqual(signed_polarity({"label": "negative", "score": 0.8}), -0.8)
+        self.assertEqual(signed_polarity({"label": "neutral", "score": 0.99}), 0.0)
+
+    def test_recent_headlines_dominate(self):
+        self.service.record("AAPL", [
+            _item("old-bad", "negative", 0.9, hours_ago=48),
+            _item("new-good", "positive", 0.9, hours_ago=1),
+        ])
+        result = self.service.compute(["AAPL"], now=NOW)["AAPL"]
+        # Only the fresh headline is inside the 1d window
+        self.assertEqual(result["1d"], {"index": 0.9, "count": 1})
+        # 7d sees both, but the newer one carries more weight
+        self.assertEqual(result["7d"]["count"], 2)
+        self.assertGreater(result["7d"]["index"], 0)
+
+    def test_half_life_weighting(self):
+        self.service.record("MSFT", [
+            _item("a", "positive", 1.0, hours_ago=0),
+            _item("b", "negative", 1.0, hours_ago=6),  # one half-life old in the 1d window
+        ])
+        index = self.service.compute(["MSFT"], now=NOW)["MSFT"]["1d"]["index"]
+        self.assertAlmostEqual(index, (1.0 - 0.5) / 1.5, places=4)
+
+    def test_many_tickers_and_dedup(self):
+        self.service.record("A", [_item("x", "positive", 0.7, 1)])
+        self.service.record("A", [_item("x", "positive", 0.7, 1)])
+        self.service.record("B", [_item("x", "negative", 0.7, 1)])
+        result = self.service.compute(now=NOW)
+        self.assertEqual(result["A"]["1d"]["count"], 1)
+        self.assertEqual(result["B"]["1d"]["index"], -0.7)
+        self.assertEqual(self.service.compute(["UNKNOWN"], now=NOW)["UNKNOWN"]["1d"], {"index": 0.0, "count": 0})
+
+    def test_old_headlines_are_compacted(self):
+        self.service.record("A", [_item("ancient", "positive", 0.9, hours_ago=24 * 30)])
+        self.service.compute(now=NOW)
+        self.assertEqual(len(self.service._time_col), 0)
+
+    def test_tickers_without_headlines_release_their_ids(self):
+        self.service.record("EMPTY", [])
+        self.assertEqual(self.service._tickers, [])
+
+        self.service.record("OLD", [_item("ancient", "positive", 0.9, hours_ago=24 * 30)])
+        self.service.record("NEW", [_item("fresh", "negative", 0.8, hours_ago=1)])
+        result = self.service.compute(now=NOW)
+
+        self.assertEqual(self.service._tickers, ["NEW"])
+        self.assertEqual(self.service._ticker_ids, {"NEW": 0})
+        self.assertEqual(result["NEW"]["1d"]["index"], -0.8)
+        self.assertEqual(list(self.service.export()["ticker"]), ["NEW"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from unittest.mock import MagicMock, patch
-from app.services.news_service import NewsService
+from app.services.news_service import NewsService, _canonical_link
 
 class TestNewsService(unittest.TestCase):
     def setUp(self):
@@ -40,5 +40,55 @@ class TestNewsService(unittest.TestCase):
         result = self.service.get_ticker_news("INVALID")
         self.assertEqual(len(result), 0)
 
+
+class TestCanonicalLink(unittest.TestCase):
+    def test_tracking_params_dropped_identifying_params_kept(self):
+        self.assertEqual(_canonical_link("HTTPS://News.Example.com/story/?utm_source=x&p=456&guccounter=1#top"),
+                         "https://news.example.com/story?p=456")
+        self.assertEqual(_canonical_link("https://x.com/a?b=2&a=1"), _canonical_link("https://x.com/a/?a=1&b=2"))
+        self.assertNotEqual(_canonical_link("https://x.com/article?id=123"), _canonical_link("https://x.com/article?id=124"))
+
+
+class TestNewsBatch(unittest.TestCase):
+    def setUp(self):
+        self.service = NewsService()
+
+    @patch('yfinance.Ticker')
+    @patch('app.services.news_service.nlp_service')
+    def test_batch_dedupes_and_scores_once(self, mock_nlp, mock_ticker):
+        """The same story under several tickers is scored once and mapped to each."""
+        shared = {"uuid": "u-1", "title": "Chipmakers rally", "link": "https://news.example.com/a?utm=x", "providerPublishTime": 10}
+        same_link = {"title": "Chipmakers rally", "link": "HTTPS://NEWS.EXAMPLE.COM/a/", "providerPublishTime": 10}
+        only_nvda = {"uuid": "u-2", "title": "NVDA guidance", "link": "https://news.example.com/b", "providerPublishTime": 20}
+        news = {"NVDA": [shared, only_nvda], "AMD": [dict(shared)], "INTC": [same_link]}
+        mock_ticker.side_effect = lambda t: MagicMock(news=news[t])
+        mock_nlp.analyze_sentiment_batch.side_effect = lambda texts: [
+            {"sentiment": {"label": "positive", "score": 0.8}} for _ in texts
+        ]
+
+        result = self.service.get_news_batch(["nvda", "AMD", "INTC"])
+
+        mock_nlp.analyze_sentiment_batch.assert_called_once()
+        self.assertEqual(mock_nlp.analyze_sentiment_batch.call_args[0][0], ["Chipmakers rally", "NVDA guidance"])
+        self.assertEqual([n["title"] for n in result["NVDA"]], ["Chipmakers rally", "NVDA guidance"])
+        self.assertEqual(result["AMD"][0]["sentiment"]["label"], "positive")
+        self.assertEqual(len(result["INTC"]), 1)
+        # Per-ticker items are independent copies
+        self.assertIsNot(result["NVDA"][0], result["AMD"][0])
+
+    @patch('yfinance.Ticker')
+    @patch('app.services.news_service.nlp_service')
+    def test_batch_tolerates_failing_ticker(self, mock_nlp, mock_ticker):
+        def ticker(t):
+            if t == "BAD":
+                raise Exception("boom")
+            return MagicMock(news=[{"title": "Ok", "link": "https://x.com/1"}])
+        mock_ticker.side_effect = ticker
+        mock_nlp.analyze_sentiment_batch.return_value = [{"sentiment": {"label": "neutral", "score": 0.5}}]
+
+        result = self.service.get_news_batch(["AAPL", "BAD"])
+        self.assertEqual(len(result["AAPL"]), 1)
+        self.assertEqual(result["BAD"], [])
+
 if __name__ == "__main__":
     unittest.main()
@@ -42,6 +42,20 @@ class TestNLPService(unittest.TestCase):
         self.assertTrue(result["is_mock"])
         self.assertEqual(result["sentiment"]["label"], "positive")
 
+    def test_analyze_sentiment_batch_single_call(self):
+        """Batch analysis runs the model once and keeps input order, skipping empty texts."""
+        mock_classifier = MagicMock()
+        mock_classifier.return_value = [{'label': 'positive', 'score': 0.9}, {'label': 'negative', 'score': 0.8}]
+        self.service.classifier = mock_classifier
+        self.service.mock_mode = False
+
+        results = self.service.analyze_sentiment_batch(["Up big", "", "Down bad"])
+        mock_classifier.assert_called_once()
+        self.assertEqual(mock_classifier.call_args[0][0], ["Up big", "Down bad"])
+        self.assertEqual(results[0]["sentiment"]["label"], "positive")
+        self.assertIn("error", results[1])
+        self.assertEqual(results[2]["sentiment"]["label"], "negative")
+
     def test_summarize_edge_cases(self):
         """Test summarization with very short text."""
         short_text = "Too short."
@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from app.services.portfolio_analytics_service import PortfolioAnalyticsService, period_for
+
+
+def _matrix():
+    idx = pd.date_range("2024-01-01", periods=5, freq="D", tz="UTC")
+    return pd.DataFrame({
+        "AAA": [100.0, 110.0, 99.0, 99.0, 108.9],
+        "BBB": [50.0, 50.0, 50.0, 55.0, 55.0],
+    }, index=idx)
+
+
+class TestPortfolioAnalyticsService(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('app.services.portfolio_analytics_service.market_service')
+        self.market = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.market.get_price_matrix.return_value = _matrix()
+        self.market.get_sectors.return_value = {"AAA": "Tech", "BBB": "Energy"}
+        self.service = PortfolioAnalyticsService()
+
+    def test_single_position_curve_and_drawdown(self):
+        rows = [{"ticker": "aaa", "entry_price": 100.0, "entry_date": "2024-01-01", "recommendation": "BUY"}]
+        result = self.service.analyze(rows)
+
+        equity = [p["equity"] for p in result["equity_curve"]]
+        np.testing.assert_allclose(equity, [1.0, 1.1, 0.99, 0.99, 1.089])
+        self.assertAlmostEqual(result["max_drawdown"], -0.1)
+        self.assertAlmostEqual(result["total_return"], 0.089)
+        self.assertEqual(result["sector_exposure"], {"Tech": 1.0})
+
+    def test_staggered_entries_are_time_weighted(self):
+        rows = [
+            {"ticker": "AAA", "entry_price": 100.0, "entry_date": "2024-01-01"},
+            {"ticker": "BBB", "entry_price": 50.0, "entry_date": "2024-01-03"},
+            {"ticker": "ZZZ", "entry_price": 10.0, "entry_date": "2024-01-01"},
+        ]
+        result = self.service.analyze(rows, include_curve=False)
+
+        self.assertEqual(result["missing"], ["ZZZ"])
+        self.assertEqual((result["positions"], result["invested"]), (2, 2))
+        # Day 3: AAA (value 1.1) -10%, BBB enters at its close (capital 1.0, flat);
+        # day 4: AAA (value 0.99) flat, BBB (value 1.0) +10%; day 5: AAA +10%, BBB (value 1.1) flat
+        expected = 1.1 * (1 - 0.11 / 2.1) * (1 + 0.1 / 1.99) * (1 + 0.099 / 2.09) - 1
+        self.assertAlmostEqual(result["total_return"], expected, places=6)
+        self.assertAlmostEqual(result["market_value"], 1.089 + 1.1)
+        self.assertAlmostEqual(result["sector_exposure"]["Energy"], round(1.1 / 2.189, 4))
+        self.assertNotIn("equity_curve", result)
+        self.assertGreater(result["volatility"], 0)
+
+    def test_entry_move_counts_towards_return(self):
+        rows = [
+            {"ticker": "AAA", "entry_price": 90.0, "entry_date": "2024-01-01"},
+            {"ticker": "BBB", "entry_price": 40.0, "entry_date": "2024-01-01"},
+        ]
+        result = self.service.analyze(rows)
+
+        # Same entry day: time-weighted return equals market value over cost
+        self.assertAlmostEqual(result["equity_curve"][0]["equity"], (100 / 90 + 50 / 40) / 2, places=6)
+        self.assertAlmostEqual(result["total_return"], result["market_value"] / 2 - 1, places=6)
+        self.assertAlmostEqual(result["market_value"], 108.9 / 90 + 55 / 40, places=4)
+
+    def test_sharpe_and_sortino_signs(self):
+        rows = [{"ticker": "AAA", "entry_price": 100.0, "entry_date": "2024-01-01"}]
+        result = self.service.analyze(rows, risk_free_rate=0.0)
+        self.assertGreater(result["sharpe"], 0)
+        self.assertGreater(result["sortino"], result["sharpe"])
+
+    def test_entries_after_last_bar(self):
+        rows = [{"ticker": "AAA", "entry_price": 100.0, "entry_date": "2024-01-08"}]
+        result = self.service.analyze(rows)
+
+        self.assertNotIn("error", result)
+        self.assertEqual((result["positions"], result["invested"]), (1, 0))
+        self.assertEqual((result["total_return"], result["equity_curve"]), (0.0, []))
+
+    def test_empty_portfolio(self):
+        self.assertIn("error", self.service.analyze([]))
+
+    def test_period_covers_earliest_entry(self):
+        now = pd.Timestamp("2026-01-01", tz="UTC")
+        self.assertEqual(period_for(pd.Timestamp("2025-12-01", tz="UTC"), now), "3mo")
+        self.assertEqual(period_for(pd.Timestamp("2025-03-01", tz="UTC"), now), "1y")
+        self.assertEqual(period_for(pd.Timestamp("2000-01-01", tz="UTC"), now), "max")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,7 +20,7 @@ class TestPortfolioLogic(unittest.IsolatedAsyncioTestCase):
         ]
         
         # Mock Market response (Current Price = 220, so +10% gain)
-        mock_market.get_ticker_data.return_value = {"price": 220.0}
+        mock_market.get_quotes.return_value = {"TSLA": 220.0}
         
         # Call the endpoint function directly
         result = await get_portfolio()
@@ -30,6 +30,25 @@ class TestPortfolioLogic(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result[0].p_l_percent, 10.0)
         self.assertEqual(result[0].current_price, 220.0)
 
+    @patch('app.api.endpoints.portfolio.database_service')
+    @patch('app.api.endpoints.portfolio.market_service')
+    async def test_portfolio_quotes_fetched_in_one_call(self, mock_market, mock_db):
+        """Test that all positions are priced by one bulk quote request."""
+        mock_db.get_portfolio.return_value = [
+            {"ticker": "aapl", "entry_price": 100.0, "entry_date": "2023-01-01", "recommendation": "BUY"},
+            {"ticker": "MSFT", "entry_price": 300.0, "entry_date": "2023-01-01", "recommendation": "HOLD"},
+            {"ticker": "GONE", "entry_price": 50.0, "entry_date": "2023-01-01", "recommendation": "SELL"}
+        ]
+        mock_market.get_quotes.return_value = {"AAPL": 95.0, "MSFT": 330.0}
+
+        result = await get_portfolio()
+
+        mock_market.get_quotes.assert_called_once_with(["AAPL", "MSFT", "GONE"])
+        mock_market.get_ticker_data.assert_not_called()
+        self.assertEqual([r.p_l_percent for r in result], [-5.0, 10.0, 0.0])
+        # No quote: valued at entry price
+        self.assertEqual(result[2].current_price, 50.0)
+
 if __name__ == "__main__":
     # Note: Running async tests in unittest requires a runner or manual loop
     # For simplicity in this environment, we'll use a synchronous-style check 
@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from app.services.risk_service import RiskService
+
+
+def _prices(n_days=250, seed=1):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2024-01-01", periods=n_days, freq="B", tz="UTC")
+    common = rng.normal(0, 0.01, n_days)
+    aaa = 100 * np.exp(np.cumsum(common + rng.normal(0, 0.005, n_days)))
+    bbb = 50 * np.exp(np.cumsum(common + rng.normal(0, 0.005, n_days)))
+    young = np.full(n_days, np.nan)
+    young[-10:] = 20.0
+    return pd.DataFrame({"AAA": aaa, "BBB": bbb, "NEW": young}, index=idx)
+
+
+class TestRiskService(unittest.TestCase):
+    def setUp(self):
+        self.service = RiskService(batch_size=1000)
+
+    def test_single_asset_matches_normal_quantile(self):
+        losses = self.service.simulate_losses(np.zeros(1), np.array([[0.0001]]), np.ones(1),
+                                              horizon_days=4, paths=200000, seed=0)
+        var, cvar = self.service.var_cvar(losses, 0.95)
+
+        # sigma * sqrt(h) = 2%: VaR ~ 1.645 sigma, CVaR ~ 2.063 sigma (log-normal, so slightly less)
+        self.assertAlmostEqual(var, 0.0326, delta=0.001)
+        self.assertAlmostEqual(cvar, 0.0408, delta=0.001)
+
+    def test_seeded_and_independent_of_batch_size(self):
+        cov = np.array([[0.0004, 0.0003], [0.0003, 0.0004]])
+        args = (np.zeros(2), cov, np.array([1.0, 2.0]), 1, 5000, 7)
+        batched = self.service.simulate_losses(*args)
+        single = RiskService(batch_size=100000).simulate_losses(*args)
+        np.testing.assert_allclose(batched, single)
+        self.assertFalse(np.allclose(batched, self.service.simulate_losses(*args[:-1], 8)))
+
+    def test_cholesky_handles_singular_covariance(self):
+        cov = np.array([[1.0, 1.0], [1.0, 1.0]]) * 1e-4
+        factor = self.service.cholesky(cov)
+        np.testing.assert_allclose(factor @ factor.T, cov, atol=1e-9)
+
+    def test_portfolio_var(self):
+        rows = [
+            {"ticker": "AAA", "entry_price": 100.0, "entry_date": "2024-01-01"},
+            {"ticker": "aaa", "entry_price": 100.0, "entry_date": "2024-06-01"},
+            {"ticker": "BBB", "entry_price": 50.0, "entry_date": "2024-01-01"},
+            {"ticker": "NEW", "entry_price": 20.0, "entry_date": "2024-12-01"},
+        ]
+        with patch('app.services.risk_service.market_service') as market:
+            market.get_price_matrix.return_value = _prices()
+            result = self.service.portfolio_var(rows, horizon_days=5, confidence=0.99, paths=20000)
+            again = self.service.portfolio_var(rows, horizon_days=5, confidence=0.99, paths=20000)
+
+        self.assertEqual(result, again)
+        self.assertEqual((result["positions"], result["tickers"], result["missing"]), (3, 2, ["NEW"]))
+        self.assertGreater(result["cvar"], result["var"])
+        self.assertGreater(result["var"], 0)
+        self.assertAlmostEqual(result["var_pct"], result["var"] / result["market_value"], places=4)
+
+    def test_empty_portfolio(self):
+        self.assertIn("error", self.service.portfolio_var([]))
+
+
+if __name__ == '__main__':
+    unittest.main()
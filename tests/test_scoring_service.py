@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+from app.schemas import ScoringConfig, ScoringFeatures
+from app.services.memo_service import _generate_recommendation
+from app.services.scoring_service import ScoringService, features_from_sections
+
+
+def _random_sections(rng):
+    labels = ["positive", "negative", "neutral"]
+    rsi = float(rng.choice([rng.uniform(0, 100), 30.0, 70.0, 29.99, 70.01]))
+    news = [{"sentiment": {"label": str(rng.choice(labels)), "score": float(rng.choice([rng.uniform(0.3, 1), 0.6]))}}
+            for _ in range(rng.integers(0, 6))]
+    posts = [{"sentiment_label": str(rng.choice(labels))} for _ in range(rng.integers(0, 6))]
+    return {"indicators": {"rsi": rsi, "macd": float(rng.normal())}}, {"items": news}, {"data": posts}
+
+
+class TestScoringService(unittest.TestCase):
+    def setUp(self):
+        self.service = ScoringService()
+
+    def test_default_config_matches_generate_recommendation(self):
+        rng = np.random.default_rng(7)
+        sections = [_random_sections(rng) for _ in range(2000)]
+        rows = [{"ticker": f"T{i}", **features_from_sections(*s)} for i, s in enumerate(sections)]
+
+        result = self.service.score(self.service.to_columns(rows))
+        expected = [_generate_recommendation(*s) for s in sections]
+        self.assertEqual(list(result["recommendation"]), expected)
+        self.assertEqual(set(expected), {"BUY", "SELL", "HOLD"})
+
+    def test_breakdown_and_input_order(self):
+        rows = [
+            ScoringFeatures(ticker="OVERSOLD", rsi=25, news_count=2, news_positive=2, news_avg_score=0.9),
+            ScoringFeatures(ticker="OVERBOUGHT", rsi=80, social_negative=3),
+            {"ticker": "FLAT"},
+        ]
+        scored = self.service.score_rows(rows)
+
+        self.assertEqual([r["ticker"] for r in scored], ["OVERSOLD", "OVERBOUGHT", "FLAT"])
+        self.assertEqual([r["recommendation"] for r in scored], ["BUY", "SELL", "HOLD"])
+        self.assertEqual(scored[0]["breakdown"]["rsi"], 1.5)
+        self.assertEqual(scored[0]["breakdown"]["news"], 1.0)
+        self.assertEqual(scored[1]["score"], -2.0)
+
+    def test_custom_config_changes_weights_and_thresholds(self):
+        rows = [ScoringFeatures(ticker="A", rsi=35, macd=1.2)]
+        config = ScoringConfig(rsi_oversold=40, rsi_weight=0.5, macd_weight=0.5)
+        scored = self.service.score_rows(rows, config)[0]
+
+        self.assertEqual((scored["recommendation"], scored["score"]), ("BUY", 1.0))
+        self.assertEqual(scored["breakdown"]["macd"], 0.5)
+        self.assertEqual(self.service.score_rows(rows)[0]["recommendation"], "HOLD")
+
+    def test_social_momentum_feature(self):
+        row = features_from_sections({"indicators": {"rsi": 50}}, {"items": []}, {"data": []}, social_momentum=0.8)
+        scored = self.service.score_rows([{"ticker": "A", **row}], ScoringConfig(social_momentum_weight=1.5))[0]
+
+        self.assertAlmostEqual(scored["breakdown"]["social_momentum"], 1.2)
+        self.assertEqual(scored["recommendation"], "BUY")
+        self.assertEqual(self.service.score_rows([{"ticker": "A", **row}])[0]["recommendation"], "HOLD")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from app.services.sentiment_series_service import SentimentSeriesService
+
+HOUR = 3600
+T0 = 1_700_000_000 // HOUR * HOUR
+
+
+class TestSentimentSeriesService(unittest.TestCase):
+    def setUp(self):
+        self.service = SentimentSeriesService(interval=HOUR, capacity=4, persist_dir="")
+
+    def test_buckets_aggregate_counts_and_mean(self):
+        self.service.record_many("tsla", [
+            (T0 + 10, "positive", 0.9),
+            (T0 + 20, "negative", 0.7),
+            (T0 + 30, "positive", 0.8),
+            (T0 + HOUR, "neutral", 0.5),
+        ])
+        series = self.service.get_series("TSLA")
+        self.assertEqual(len(series["buckets"]), 2)
+        first = series["buckets"][0]
+        self.assertEqual(first["start"], T0)
+        self.assertEqual((first["positive"], first["negative"], first["neutral"]), (2, 1, 0))
+        self.assertEqual(first["volume"], 3)
+        self.assertAlmostEqual(first["mean_score"], 0.8, places=4)
+
+    def test_ring_buffer_keeps_latest_buckets(self):
+        posts = [(T0 + i * HOUR, "positive", 1.0) for i in range(6)]
+        self.service.record_many("AAPL", posts)
+        starts = [b["start"] for b in self.service.get_series("AAPL")["buckets"]]
+        self.assertEqual(starts, [T0 + i * HOUR for i in range(2, 6)])
+        # Data older than the retained window is dropped
+        self.assertEqual(self.service.record_many("AAPL", [(T0, "negative", 1.0)]), 0)
+
+    def test_momentum_sign(self):
+        self.service.record_many("GME", [
+            (T0, "negative", 0.9), (T0 + HOUR, "negative", 0.9),
+            (T0 + 2 * HOUR, "positive", 0.9), (T0 + 3 * HOUR, "positive", 0.9),
+        ])
+        self.assertGreater(self.service.get_series("GME")["momentum"], 0)
+
+    def test_persistence_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = SentimentSeriesService(interval=HOUR, capacity=4, persist_dir=tmp)
+            writer.record_many("MSFT", [(T0, "positive", 0.6)])
+            # Written on flush, not on every record
+            self.assertFalse(os.path.exists(os.path.join(tmp, "MSFT.npy")))
+            self.assertEqual(writer.flush(), 1)
+            self.assertTrue(os.path.exists(os.path.join(tmp, "MSFT.npy")))
+            self.assertEqual(writer.flush(), 0)
+
+            reader = SentimentSeriesService(interval=HOUR, capacity=4, persist_dir=tmp)
+            buckets = reader.get_series("MSFT")["buckets"]
+            self.assertEqual(len(buckets), 1)
+            self.assertEqual(buckets[0]["positive"], 1)
+
+    def test_flush_interval_and_eviction_persist(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            service = SentimentSeriesService(interval=HOUR, capacity=4, persist_dir=tmp,
+                                             max_tickers=1, flush_interval=0)
+            service.record_many("MSFT", [(T0, "positive", 0.6)])
+            self.assertTrue(os.path.exists(os.path.join(tmp, "MSFT.npy")))
+
+            service.flush_interval = 3600
+            service.record_many("MSFT", [(T0, "negative", 0.6)])
+            service.record_many("AAPL", [(T0, "positive", 0.6)])
+            self.assertEqual(list(service._buffers), ["AAPL"])
+            # The evicted buffer was written and reloads with both observations
+            self.assertEqual(service.get_series("MSFT")["buckets"][0]["volume"], 2)
+
+    def test_unknown_and_invalid_tickers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            service = SentimentSeriesService(interval=HOUR, capacity=4, persist_dir=tmp, flush_interval=0)
+            self.assertEqual(service.get_series("NOPE")["buckets"], [])
+            self.assertEqual(len(service.get_buckets("NOPE")), 0)
+            self.assertEqual(service._buffers, {})
+
+            self.assertIsNone(service._path("../../ETC"))
+            self.assertEqual(service.record_many("../x", [(T0, "positive", 0.6)]), 0)
+            self.assertEqual(service.get_series("../x")["buckets"], [])
+            self.assertEqual(os.listdir(tmp), [])
+
+if __name__ == "__main__":
+    unittest.main()
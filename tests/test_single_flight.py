@@ -0,0 +1,89 @@
+import threading
+import time
+import unittest
+from app.services.single_flight import SingleFlight, make_key
+
+
+class TestSingleFlight(unittest.TestCase):
+    def _run_concurrently(self, n, target):
+        threads = [threading.Thread(target=target) for _ in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def test_identical_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+        gate = threading.Event()
+
+        @flight.coalesce("market.get_ticker_data")
+        def fetch(ticker, period="1y"):
+            calls.append(ticker)
+            gate.wait(1)
+            return {"ticker": ticker}
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(fetch("TSLA"))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        while flight.in_flight() == 0:
+            time.sleep(0.001)
+        time.sleep(0.05)
+        gate.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(calls, ["TSLA"])
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_different_arguments_do_not_coalesce(self):
+        flight = SingleFlight()
+        calls = []
+
+        @flight.coalesce("op")
+        def work(x):
+            calls.append(x)
+            time.sleep(0.02)
+            return x
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sorted(calls), [0, 1, 2])
+
+    def test_errors_propagate_to_followers_and_are_not_cached(self):
+        flight = SingleFlight()
+        gate = threading.Event()
+        errors = []
+
+        def failing():
+            gate.wait(1)
+            raise RuntimeError("upstream")
+
+        def call():
+            try:
+                flight.do("k", failing)
+            except RuntimeError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        gate.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(flight.do("k", lambda: "ok"), "ok")
+
+    def test_unhashable_arguments(self):
+        key = make_key("op", ({"a": [1]},), {})
+        self.assertEqual(key, make_key("op", ({"a": [1]},), {}))
+        hash(key)
+
+if __name__ == "__main__":
+    unittest.main()
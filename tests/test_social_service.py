@@ -1,5 +1,9 @@
+import io
+import json
+import base64
 import unittest
-from app.services.social_service import social_service
+from unittest.mock import MagicMock, patch
+from app.services.social_service import social_service, SocialService, SocialPostRecord, _to_epoch
 from app.services.nlp_service import nlp_service
 
 class TestSocialService(unittest.TestCase):
@@ -24,5 +28,180 @@ class TestSocialService(unittest.TestCase):
         else:
             print("\nSocial Service in Mock Mode or Fallback")
 
+
+def _stocktwits_response(messages):
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"messages": messages}
+    return response
+
+def _st_message(msg_id, body, created_at):
+    return {"id": msg_id, "body": body, "created_at": created_at, "user": {"username": "trader"}}
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <id>t3_bbb</id><title>TSLA to the moon</title>
+    <author><name>/u/alice</name></author><updated>2026-01-02T10:00:00+00:00</updated>
+  </entry>
+  <entry>
+    <id>t3_aaa</id><title>TSLA earnings risk</title>
+    <author><name>/u/bob</name></author><updated>2026-01-01T10:00:00+00:00</updated>
+  </entry>
+</feed>"""
+
+
+class TestSocialIncrementalPolling(unittest.TestCase):
+    """Cursor-based polling only scores posts newer than the last poll."""
+
+    def setUp(self):
+        self.service = SocialService(max_window=3)
+
+    @patch('app.services.social_service.nlp_service')
+    @patch('app.services.social_service.requests.get')
+    def test_stocktwits_uses_since_cursor(self, mock_get, mock_nlp):
+        mock_nlp.analyze_sentiment.return_value = {"sentiment": {"label": "neutral", "score": 0.5}}
+        mock_get.return_value = _stocktwits_response([
+            _st_message(11, "second", "2026-01-01T10:01:00Z"),
+            _st_message(10, "first", "2026-01-01T10:00:00Z"),
+        ])
+        first = self.service._fetch_stocktwits("TSLA")
+        self.assertEqual(len(first), 2)
+        self.assertIsNone(mock_get.call_args.kwargs["params"])
+        self.assertEqual(self.service.cursor_store.get("TSLA", "Stocktwits")["id"], "11")
+
+        # Second poll: API returns one new message plus an overlapping one
+        mock_get.return_value = _stocktwits_response([
+            _st_message(12, "third", "2026-01-01T10:02:00Z"),
+            _st_message(11, "second", "2026-01-01T10:01:00Z"),
+        ])
+        mock_nlp.analyze_sentiment.reset_mock()
+        second = self.service._fetch_stocktwits("TSLA")
+
+        self.assertEqual(mock_get.call_args.kwargs["params"], {"since": "11"})
+        self.assertEqual([p["id"] for p in second], ["12"])
+        self.assertEqual(mock_nlp.analyze_sentiment.call_count, 1)
+
+    @patch('app.services.social_service.nlp_service')
+    @patch('app.services.social_service.requests.get')
+    def test_reddit_stops_at_cursor(self, mock_get, mock_nlp):
+        mock_nlp.analyze_sentiment.return_value = {"sentiment": {"label": "positive", "score": 0.9}}
+        mock_get.side_effect = lambda *args, **kwargs: MagicMock(status_code=200, raw=io.BytesIO(ATOM_FEED))
+
+        first = self.service._fetch_reddit_rss("TSLA")
+        self.assertEqual(len(first), 6)  # 2 entries x 3 subreddits
+
+        mock_nlp.analyze_sentiment.reset_mock()
+        second = self.service._fetch_reddit_rss("TSLA")
+        self.assertEqual(second, [])
+        mock_nlp.analyze_sentiment.assert_not_called()
+        self.assertNotIn("before=", mock_get.call_args.args[0])
+
+    @patch('app.services.social_service.nlp_service')
+    @patch('app.services.social_service.requests.get')
+    def test_reddit_cursor_post_deleted(self, mock_get, mock_nlp):
+        mock_nlp.analyze_sentiment.return_value = {"sentiment": {"label": "positive", "score": 0.9}}
+        mock_get.side_effect = lambda *args, **kwargs: MagicMock(status_code=200, raw=io.BytesIO(ATOM_FEED))
+        # The cursor post was deleted: newer entries are still found, older ones stop the scan
+        for sub in ("wallstreetbets", "stocks", "investing"):
+            self.service.cursor_store.advance("TSLA", f"r/{sub}", "t3_deleted", _to_epoch("2026-01-01T12:00:00+00:00"))
+
+        posts = self.service._fetch_reddit_rss("TSLA")
+        self.assertEqual([p["id"] for p in posts], ["t3_bbb"] * 3)
+
+    def test_window_is_bounded_and_deduplicated(self):
+        records = [_record(str(i), i, "Stocktwits") for i in range(5)]
+        self.service._remember("TSLA", "Stocktwits", records)
+        self.service._remember("TSLA", "Stocktwits", records[-1:])
+        window = self.service._merged_timeline("TSLA")
+        self.assertEqual([r.id for r in window], ["4", "3", "2"])
+
+
+def _record(post_id, epoch, source):
+    return SocialPostRecord(post_id, "a", "@a", "text", epoch, "neutral", 0.5, source)
+
+
+class TestSocialTimelineMerge(unittest.TestCase):
+    """Timestamps are normalized to epochs and sources are k-way merged."""
+
+    def test_to_epoch_normalizes_formats(self):
+        self.assertEqual(_to_epoch("2026-01-01T10:00:00Z"), _to_epoch("2026-01-01T10:00:00+00:00"))
+        self.assertEqual(_to_epoch("2026-01-01T12:00:00+02:00"), _to_epoch("2026-01-01T10:00:00Z"))
+        self.assertEqual(_to_epoch(1700000000), 1700000000)
+        self.assertEqual(_to_epoch("garbage"), 0)
+
+    def test_merge_interleaves_sources_and_stops_at_limit(self):
+        service = SocialService()
+        service._remember("AAPL", "r/stocks", [_record("r1", 100, "r/stocks"), _record("r2", 300, "r/stocks")])
+        service._remember("AAPL", "Stocktwits", [_record("s1", 200, "Stocktwits"), _record("s2", 400, "Stocktwits")])
+        service._remember("MSFT", "Stocktwits", [_record("m1", 999, "Stocktwits")])
+
+        merged = service._merged_timeline("AAPL", limit=3)
+        self.assertEqual([r.id for r in merged], ["s2", "r2", "s1"])
+
+    def test_tickers_are_bounded_with_their_cursors(self):
+        service = SocialService(max_tickers=2)
+        for ticker in ("AAPL", "MSFT"):
+            service.cursor_store.advance(ticker, "Stocktwits", "1", 100)
+            service._remember(ticker, "Stocktwits", [_record("1", 100, "Stocktwits")])
+        service._merged_timeline("AAPL")  # AAPL becomes the most recently used
+        service._remember("TSLA", "Stocktwits", [_record("2", 200, "Stocktwits")])
+
+        self.assertEqual(list(service._timelines), ["AAPL", "TSLA"])
+        self.assertEqual(service._merged_timeline("MSFT"), [])
+        self.assertIsNone(service.cursor_store.get("MSFT", "Stocktwits"))
+        self.assertIsNotNone(service.cursor_store.get("AAPL", "Stocktwits"))
+
+    @patch('app.services.social_service.nlp_service')
+    @patch('app.services.social_service.requests.get')
+    def test_feed_orders_mixed_timestamp_formats(self, mock_get, mock_nlp):
+        """A Stocktwits 'Z' timestamp must sort correctly against Atom '+00:00' offsets."""
+        mock_nlp.analyze_sentiment.return_value = {"sentiment": {"label": "neutral", "score": 0.5}}
+        service = SocialService()
+        service._remember("TSLA", "r/stocks", [_record("r1", _to_epoch("2026-01-01T11:00:00+01:00"), "r/stocks")])
+        service._remember("TSLA", "Stocktwits", [_record("s1", _to_epoch("2026-01-01T10:30:00Z"), "Stocktwits")])
+        mock_get.return_value = MagicMock(status_code=500)
+
+        feed = service.get_social_feed(ticker="TSLA", limit=5)
+        self.assertEqual([p["id"] for p in feed["data"]], ["s1", "r1"])
+
+class TestSocialFeedPaging(unittest.TestCase):
+    """Paginated feed is served from a per-ticker TTL snapshot."""
+
+    def setUp(self):
+        self.service = SocialService()
+        self.service._remember("TSLA", "Stocktwits", [_record(f"s{i}", 100 + i, "Stocktwits") for i in range(5)])
+        self.service._remember("TSLA", "r/stocks", [_record(f"r{i}", 200 + i, "r/stocks") for i in range(3)])
+
+    @patch.object(SocialService, '_fetch_stocktwits', return_value=[])
+    @patch.object(SocialService, '_fetch_reddit_rss', return_value=[])
+    def test_cursor_pages_through_timeline(self, mock_reddit, mock_st):
+        seen = []
+        cursor = None
+        while True:
+            page = self.service.get_feed_page("tsla", limit=3, cursor=cursor)
+            seen.extend(p["id"] for p in page["data"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, ["r2", "r1", "r0", "s4", "s3", "s2", "s1", "s0"])
+        # All pages came from a single cached poll
+        self.assertEqual(mock_reddit.call_count, 1)
+        self.assertEqual(mock_st.call_count, 1)
+
+    @patch.object(SocialService, '_fetch_stocktwits', return_value=[])
+    @patch.object(SocialService, '_fetch_reddit_rss', return_value=[])
+    def test_invalid_cursor(self, mock_reddit, mock_st):
+        with self.assertRaises(ValueError):
+            self.service.get_feed_page("TSLA", cursor="not-a-cursor")
+
+    @patch.object(SocialService, '_fetch_stocktwits', return_value=[])
+    @patch.object(SocialService, '_fetch_reddit_rss', return_value=[])
+    def test_wrongly_shaped_cursor(self, mock_reddit, mock_st):
+        self.service._remember("TSLA", "Stocktwits", [_record("s0", 100, "Stocktwits")])
+        for value in ({"epoch": 1}, [1, "Stocktwits"], ["100", "Stocktwits", "s0"], [100, "Stocktwits", 5]):
+            cursor = base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                self.service.get_feed_page("TSLA", cursor=cursor)
+
 if __name__ == "__main__":
     unittest.main()
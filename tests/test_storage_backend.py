@@ -0,0 +1,165 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from app.api.endpoints.portfolio import get_portfolio
+from app.schemas import InvestmentMemo, MarketData, PortfolioItem
+from app.services.database_service import DatabaseService
+from app.services.storage_backend import SQLiteBackend
+
+
+def _memo(ticker, generated_at):
+    return InvestmentMemo(
+        ticker=ticker,
+        generated_at=generated_at,
+        market_data=MarketData(ticker=ticker, price=10.0, change_percent=1.0, volume=100,
+                               indicators={"rsi": 55.0}, company_name=ticker, sector="Tech", summary="-"),
+        social_context=None,
+        news_context=None,
+        recommendation="HOLD",
+        analysis_summary=f"{ticker} summary"
+    )
+
+
+class TestSQLiteBackend(unittest.TestCase):
+    def setUp(self):
+        self.backend = SQLiteBackend(":memory:")
+        self.addCleanup(self.backend.close)
+
+    def test_indexes_exist(self):
+        indexes = {row["name"] for row in self.backend._query("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertIn("idx_memos_generated_at", indexes)
+        self.assertIn("idx_memos_ticker_generated_at", indexes)
+        plan = self.backend._query("EXPLAIN QUERY PLAN SELECT * FROM memos WHERE ticker = ? "
+                                   "ORDER BY generated_at DESC", ("AAPL",))
+        self.assertIn("idx_memos_ticker_generated_at", plan[0]["detail"])
+
+    def test_memos_round_trip_json_newest_first(self):
+        self.backend.insert_memos([
+            {"ticker": "AAPL", "generated_at": "2026-01-01T10:00:00", "market_data": {"price": 1.5},
+             "social_context": None, "news_context": {"items": []}, "recommendation": "BUY",
+             "analysis_summary": "a"},
+            {"ticker": "MSFT", "generated_at": "2026-01-02T10:00:00", "market_data": {"price": 2.0},
+             "recommendation": "SELL", "analysis_summary": "b"},
+        ])
+        rows = self.backend.list_memos(limit=10)
+
+        self.assertEqual([r["ticker"] for r in rows], ["MSFT", "AAPL"])
+        self.assertEqual(rows[1]["market_data"], {"price": 1.5})
+        self.assertEqual(rows[1]["news_context"], {"items": []})
+        self.assertIsNone(rows[1]["social_context"])
+        self.assertEqual(len(self.backend.list_memos(limit=1)), 1)
+
+    def test_memo_summaries_keyset_pages(self):
+        # Two memos share a timestamp so the id breaks the tie
+        stamps = ["2026-01-01T10:00:00", "2026-01-02T10:00:00", "2026-01-02T10:00:00", "2026-01-03T10:00:00"]
+        self.backend.insert_memos([{"ticker": "AAPL" if i % 2 else "MSFT", "generated_at": g,
+                                    "market_data": {"big": "x" * 100}, "analysis_summary": str(i)}
+                                   for i, g in enumerate(stamps)])
+
+        first = self.backend.list_memo_summaries(2)
+        second = self.backend.list_memo_summaries(2, after=(first[-1]["generated_at"], first[-1]["id"]))
+        self.assertEqual([r["id"] for r in first + second], [4, 3, 2, 1])
+        self.assertEqual(set(first[0]), {"id", "ticker", "generated_at", "recommendation", "analysis_summary"})
+
+        aapl = self.backend.list_memo_summaries(10, after=("2026-01-03T10:00:00", 4), ticker="AAPL")
+        self.assertEqual([r["id"] for r in aapl], [2])
+        self.assertEqual(self.backend.get_memo(2)["market_data"], {"big": "x" * 100})
+        self.assertIsNone(self.backend.get_memo(99))
+
+    def test_portfolio_upsert_and_bulk_delete(self):
+        self.backend.upsert_portfolio([
+            {"ticker": "AAPL", "entry_price": 100.0, "entry_date": "2026-01-01", "recommendation": "BUY"},
+            {"ticker": "MSFT", "entry_price": 300.0, "entry_date": "2026-01-01", "recommendation": "HOLD"},
+            {"ticker": "TSLA", "entry_price": 200.0, "entry_date": "2026-01-01", "recommendation": "SELL"},
+        ])
+        self.backend.upsert_portfolio([{"ticker": "AAPL", "entry_price": 120.0, "entry_date": "2026-02-01",
+                                        "recommendation": "HOLD"}])
+        self.backend.delete_portfolio(["MSFT", "TSLA"])
+
+        # Upserts keep the position's id
+        self.assertEqual(self.backend.list_portfolio(), [
+            {"id": 1, "ticker": "AAPL", "entry_price": 120.0, "entry_date": "2026-02-01", "recommendation": "HOLD"}
+        ])
+
+    def test_portfolio_without_id_is_migrated(self):
+        path = os.path.join(tempfile.mkdtemp(), "old.db")
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE portfolio (ticker TEXT PRIMARY KEY, entry_price REAL NOT NULL, "
+                         "entry_date TEXT NOT NULL, recommendation TEXT)")
+            conn.execute("INSERT INTO portfolio VALUES ('AAPL', 100.0, '2026-01-01', 'BUY')")
+        conn.close()
+
+        backend = SQLiteBackend(path)
+        self.addCleanup(backend.close)
+        self.assertEqual(backend.list_portfolio()[0]["id"], 1)
+        backend.upsert_portfolio([{"ticker": "MSFT", "entry_price": 1.0, "entry_date": "2026-01-01"}])
+        self.assertEqual([r["id"] for r in backend.list_portfolio()], [1, 2])
+
+
+class TestDatabaseServiceSQLite(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        env = {"DATABASE_BACKEND": "sqlite", "SQLITE_DB_PATH": os.path.join(self.root, "db", "test.db")}
+        with patch.dict('os.environ', env), patch('app.services.database_service.create_client') as create:
+            self.service = DatabaseService()
+            create.assert_not_called()
+        self.addCleanup(self.service.shutdown)
+
+    def test_memos_and_portfolio_persist_offline(self):
+        self.assertIsNone(self.service.client)
+        self.assertTrue(self.service.save_memo(_memo("AAPL", "2026-01-01T10:00:00")))
+        self.assertTrue(self.service.save_memos([_memo("MSFT", "2026-01-02T10:00:00"),
+                                                 _memo("TSLA", "2026-01-03T10:00:00")]))
+        self.assertTrue(self.service.enqueue_memo(_memo("NVDA", "2026-01-04T10:00:00")))
+        self.service.memo_queue.flush()
+
+        memos = self.service.get_all_memos(limit=3)
+        self.assertEqual([m["ticker"] for m in memos], ["NVDA", "TSLA", "MSFT"])
+        self.assertEqual(memos[0]["market_data"]["indicators"], {"rsi": 55.0})
+
+        page = self.service.get_memo_history(limit=2)
+        older = self.service.get_memo_history(limit=2, cursor=page["next_cursor"])
+        self.assertEqual([m["ticker"] for m in page["data"] + older["data"]], ["NVDA", "TSLA", "MSFT", "AAPL"])
+        self.assertIsNone(older["next_cursor"])
+        self.assertEqual(self.service.get_memo_history(ticker="msft")["data"][0]["ticker"], "MSFT")
+        memo = self.service.get_memo_by_id(page["data"][0]["id"])
+        self.assertEqual(memo["market_data"]["ticker"], "NVDA")
+        with self.assertRaises(ValueError):
+            self.service.get_memo_history(cursor="not-a-cursor")
+
+        items = [PortfolioItem(ticker=t, entry_price=10.0, entry_date="2026-01-01", recommendation="BUY")
+                 for t in ("aapl", "msft", "tsla")]
+        self.assertTrue(self.service.save_portfolio_items(items))
+        self.assertTrue(self.service.remove_portfolio_items(["msft", "tsla"]))
+        self.assertEqual([row["ticker"] for row in self.service.get_portfolio()], ["AAPL"])
+        self.assertTrue(self.service.remove_from_portfolio("aapl"))
+        self.assertEqual(self.service.get_portfolio(), [])
+
+
+class TestPortfolioEndpointSQLite(unittest.IsolatedAsyncioTestCase):
+    async def test_positions_have_ids(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        with patch.dict('os.environ', {"DATABASE_BACKEND": "sqlite", "SQLITE_DB_PATH": os.path.join(root, "t.db")}):
+            service = DatabaseService()
+        self.addCleanup(service.shutdown)
+        service.save_portfolio_items([
+            PortfolioItem(ticker="AAPL", entry_price=100.0, entry_date="2026-01-01", recommendation="BUY"),
+            PortfolioItem(ticker="MSFT", entry_price=200.0, entry_date="2026-01-01", recommendation="HOLD"),
+        ])
+
+        with patch('app.api.endpoints.portfolio.database_service', service), \
+             patch('app.api.endpoints.portfolio.market_service') as market:
+            market.get_quotes.return_value = {"AAPL": 110.0, "MSFT": 200.0}
+            items = await get_portfolio()
+
+        self.assertEqual([(i.id, i.ticker, i.p_l_percent) for i in items], [("1", "AAPL", 10.0), ("2", "MSFT", 0.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
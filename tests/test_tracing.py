@@ -0,0 +1,61 @@
+import json
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from app.services.tracing import start_trace, span, traced, run_in_trace, current_trace
+
+
+@traced("work.sleep")
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+class TestTracing(unittest.TestCase):
+    def test_spans_recorded_on_active_trace(self):
+        with start_trace("memo", ticker="AAPL") as trace:
+            with span("market.history"):
+                time.sleep(0.01)
+            _sleep(0.001)
+            _sleep(0.001)
+
+        timings = trace.timings()
+        self.assertEqual(set(timings), {"market.history", "work.sleep", "total"})
+        self.assertGreaterEqual(timings["market.history"], 10)
+        self.assertEqual(len(trace.spans), 3)
+        self.assertGreaterEqual(timings["total"], timings["market.history"])
+        self.assertIsNone(current_trace())
+
+    def test_run_in_trace_carries_trace_into_pool_threads(self):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            with start_trace("memo") as trace:
+                futures = [pool.submit(run_in_trace, trace, _sleep, 0.001) for _ in range(2)]
+                [f.result() for f in futures]
+                # Pool threads do not inherit the caller's trace on their own
+                self.assertIsNone(pool.submit(current_trace).result())
+
+        self.assertEqual([s["name"] for s in trace.spans], ["work.sleep", "work.sleep"])
+
+    def test_failed_span_is_marked_and_reraised(self):
+        with start_trace("memo") as trace:
+            with self.assertRaises(ValueError):
+                with span("db.insert"):
+                    raise ValueError("boom")
+        self.assertEqual(trace.spans[0]["error"], "ValueError")
+
+    def test_span_without_trace_is_a_noop(self):
+        self.assertEqual(_sleep(0), 0)
+
+    def test_trace_emits_structured_log(self):
+        with patch('app.services.tracing.logger') as logger:
+            with start_trace("memo", ticker="TSLA"):
+                with span("social.reddit"):
+                    pass
+        payload = json.loads(logger.info.call_args[0][0])
+        self.assertEqual((payload["event"], payload["ticker"]), ("trace", "TSLA"))
+        self.assertEqual(payload["spans"][0]["name"], "social.reddit")
+
+
+if __name__ == '__main__':
+    unittest.main()
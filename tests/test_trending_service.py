@@ -0,0 +1,64 @@
+import unittest
+from app.services.trending_service import TrendingService, CountMinSketch, SpaceSaving, extract_tickers
+
+NOW = 1_700_000_000
+
+
+class TestTickerExtraction(unittest.TestCase):
+    def test_cashtags_and_hint(self):
+        self.assertEqual(extract_tickers("Loading $tsla and $NVDA, not $100"), ["NVDA", "TSLA"])
+        self.assertEqual(extract_tickers("TSLA earnings tonight", hint="tsla"), ["TSLA"])
+        self.assertEqual(extract_tickers("TSLAQ is a meme", hint="TSLA"), [])
+        self.assertEqual(extract_tickers("$AAPL $AAPL $AAPL"), ["AAPL"])
+
+
+class TestSketches(unittest.TestCase):
+    def test_count_min_never_undercounts(self):
+        sketch = CountMinSketch(width=64, depth=4)
+        for i in range(500):
+            sketch.add(f"SYM{i % 50}")
+        for i in range(50):
+            self.assertGreaterEqual(sketch.estimate(f"SYM{i}"), 10)
+
+    def test_space_saving_is_bounded_and_keeps_heavy_hitters(self):
+        summary = SpaceSaving(capacity=5)
+        for i in range(1000):
+            summary.add(f"NOISE{i}")
+            if i % 3 == 0:
+                summary.add("GME")
+        self.assertLessEqual(len(summary.counts), 5)
+        self.assertIn("GME", summary.keys())
+
+
+class TestTrendingService(unittest.TestCase):
+    def setUp(self):
+        self.service = TrendingService(bucket_seconds=60, n_buckets=10, recent_buckets=2, top_k=5)
+
+    def test_spiking_ticker_ranks_above_steady_one(self):
+        # AAPL: steady 3 mentions per bucket; GME: quiet, then 20 mentions now
+        for minutes_ago in range(10):
+            for _ in range(3):
+                self.service.ingest("$AAPL steady", NOW - minutes_ago * 60)
+        self.service.ingest("$GME old", NOW - 9 * 60)
+        for _ in range(20):
+            self.service.ingest("$GME squeeze", NOW)
+
+        trending = self.service.get_trending(now=NOW)
+        self.assertEqual(trending[0]["ticker"], "GME")
+        self.assertGreater(trending[0]["spike_score"], 5)
+        aapl = next(t for t in trending if t["ticker"] == "AAPL")
+        self.assertAlmostEqual(aapl["spike_score"], 1.0, delta=0.2)
+
+    def test_memory_is_bounded(self):
+        for i in range(5000):
+            self.service.ingest(f"${chr(65 + i % 26)}{chr(65 + (i // 26) % 26)}{chr(65 + (i // 676) % 26)}", NOW)
+        self.assertTrue(all(len(h.counts) <= 5 for h in self.service._heavy))
+        self.assertLessEqual(len(self.service.get_trending(limit=100, min_mentions=1, now=NOW)), 10)
+
+    def test_old_buckets_expire(self):
+        for _ in range(5):
+            self.service.ingest("$AMC", NOW - 3600)
+        self.assertEqual(self.service.get_trending(now=NOW), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from app.services.ttl_cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_entries_expire_after_ttl(self):
+        cache = TTLCache(ttl=10)
+        with patch('app.services.ttl_cache.time.monotonic', return_value=100.0):
+            cache.set("k", 1)
+        with patch('app.services.ttl_cache.time.monotonic', return_value=105.0):
+            self.assertEqual(cache.get("k"), 1)
+        with patch('app.services.ttl_cache.time.monotonic', return_value=111.0):
+            self.assertIsNone(cache.get("k"))
+
+    def test_lru_eviction(self):
+        cache = TTLCache(ttl=60, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+
+    def test_concurrent_loads_share_one_call(self):
+        cache = TTLCache(ttl=60)
+        calls = []
+        started = threading.Event()
+
+        def loader():
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            return "value"
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(cache.get_or_load("TSLA", loader)))
+        first.start()
+        started.wait()
+        others = [threading.Thread(target=lambda: results.append(cache.get_or_load("TSLA", loader))) for _ in range(5)]
+        for t in others:
+            t.start()
+        for t in [first] + others:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 6)
+
+    def test_failed_load_is_not_cached(self):
+        cache = TTLCache(ttl=60)
+
+        def failing():
+            raise RuntimeError("upstream down")
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_load("k", failing)
+        self.assertEqual(cache.get_or_load("k", lambda: 42), 42)
+
+if __name__ == "__main__":
+    unittest.main()
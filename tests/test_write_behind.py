@@ -0,0 +1,119 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from app.services.write_behind import WriteBehindQueue
+from app.services.database_service import DatabaseService
+from app.services.storage_backend import SupabaseBackend
+
+
+class RecordingSink:
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+        self.lock = threading.Lock()
+
+    def __call__(self, batch):
+        with self.lock:
+            if self.failures:
+                self.failures -= 1
+                return False
+            self.batches.append(list(batch))
+            return True
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class TestWriteBehindQueue(unittest.TestCase):
+    def test_flushes_on_batch_size(self):
+        sink = RecordingSink()
+        queue = WriteBehindQueue(sink, batch_size=3, interval=60)
+        self.addCleanup(queue.shutdown)
+        for i in range(3):
+            queue.put(i)
+
+        self.assertTrue(_wait_until(lambda: sink.batches))
+        self.assertEqual(sink.batches, [[0, 1, 2]])
+        self.assertEqual(queue.backlog_size(), 0)
+
+    def test_flushes_on_interval(self):
+        sink = RecordingSink()
+        queue = WriteBehindQueue(sink, batch_size=100, interval=0.05)
+        self.addCleanup(queue.shutdown)
+        queue.put("a")
+
+        self.assertTrue(_wait_until(lambda: sink.batches))
+        self.assertEqual(sink.batches, [["a"]])
+
+    def test_failed_batch_is_retried_in_order(self):
+        sink = RecordingSink(failures=2)
+        queue = WriteBehindQueue(sink, batch_size=10, interval=60, retry_backoff=0.001)
+        for i in range(4):
+            queue.put(i)
+        queue.shutdown()
+
+        self.assertEqual(sink.batches, [[0, 1, 2, 3]])
+        self.assertEqual(queue.dropped, 0)
+
+    def test_batch_dropped_after_max_retries(self):
+        sink = RecordingSink(failures=10)
+        queue = WriteBehindQueue(sink, batch_size=10, interval=60, max_retries=2, retry_backoff=0.001)
+        queue.put("x")
+        queue.shutdown()
+
+        self.assertEqual(sink.batches, [])
+        self.assertEqual((queue.dropped, queue.backlog_size()), (1, 0))
+
+    def test_put_after_shutdown_writes_through(self):
+        sink = RecordingSink()
+        queue = WriteBehindQueue(sink, batch_size=10, interval=60)
+        queue.put("a")
+        queue.shutdown()
+        queue.put("b")
+        self.assertEqual(sink.batches, [["a"], ["b"]])
+        self.assertEqual(queue.backlog_size(), 0)
+
+    def test_shutdown_drains_backlog(self):
+        sink = RecordingSink()
+        queue = WriteBehindQueue(sink, batch_size=2, interval=60)
+        for i in range(5):
+            queue.put(i)
+        queue.shutdown()
+
+        self.assertEqual(sorted(x for b in sink.batches for x in b), [0, 1, 2, 3, 4])
+        self.assertEqual(queue.backlog_size(), 0)
+
+
+class TestDatabaseServiceEnqueue(unittest.TestCase):
+    def setUp(self):
+        self.service = DatabaseService.__new__(DatabaseService)
+        self.service.client = MagicMock()
+        self.service._backend = SupabaseBackend(self.service.client)
+        self.sink = RecordingSink()
+        self.service.memo_queue = WriteBehindQueue(self.sink, batch_size=50, interval=60)
+
+    def test_enqueue_does_not_write_until_flush(self):
+        self.assertTrue(self.service.enqueue_memo("memo-1"))
+        self.assertTrue(self.service.enqueue_memo("memo-2"))
+        self.assertEqual(self.service.backlog_size(), 2)
+        self.assertEqual(self.sink.batches, [])
+
+        self.service.shutdown()
+        self.assertEqual(self.sink.batches, [["memo-1", "memo-2"]])
+
+    def test_enqueue_without_client_is_skipped(self):
+        self.service.client = None
+        self.service._backend = None
+        self.assertFalse(self.service.enqueue_memo("memo"))
+        self.assertEqual(self.service.backlog_size(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()